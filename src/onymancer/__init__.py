@@ -1,23 +1,69 @@
 """Procedural fantasy name generation library."""
 
 from .namegen import (
+    cache_clear,
+    cache_info,
+    compile,  # noqa: A004 - the public name, mirroring re.compile
     generate,
     generate_batch,
+    iter_names,
+    iter_unique,
+    language_info,
     load_language_from_json,
+    load_language_from_model,
+    name_at,
+    pattern_space_size,
+    preload,
+    save_language,
+    set_cache_maxsize,
+    set_language_budget,
     set_token,
     set_tokens,
 )
+from .markov import MarkovGenerator
+from .parallel import generate_parallel
+from .pattern import CompiledPattern
+from .pool import NamePool
+from .stats import GenerationStats
 from .pronounceability import (
+    disable_score_cache,
+    enable_score_cache,
+    score_cache_clear,
+    score_cache_info,
     score_pronounceability,
+    score_pronounceability_batch,
     is_pronounceable,
 )
 
 __all__ = [
+    "CompiledPattern",
+    "GenerationStats",
+    "MarkovGenerator",
+    "NamePool",
+    "cache_clear",
+    "cache_info",
+    "compile",
     "generate",
     "generate_batch",
+    "generate_parallel",
+    "iter_names",
+    "iter_unique",
+    "language_info",
     "load_language_from_json",
+    "load_language_from_model",
+    "name_at",
+    "pattern_space_size",
+    "preload",
+    "save_language",
+    "set_cache_maxsize",
+    "set_language_budget",
     "set_token",
     "set_tokens",
+    "disable_score_cache",
+    "enable_score_cache",
+    "score_cache_clear",
+    "score_cache_info",
     "score_pronounceability",
+    "score_pronounceability_batch",
     "is_pronounceable",
 ]
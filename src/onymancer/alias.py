@@ -0,0 +1,133 @@
+"""Weighted token lists and alias-method sampling."""
+
+import math
+import random
+from collections.abc import Sequence
+
+
+class AliasTable:
+    """
+    Draw indices in proportion to their weights in constant time.
+
+    The table is built with Vose's alias method: every index owns a column
+    of equal height, filled with its own weight up to a threshold and with
+    the weight of a single other index (its alias) above it. A draw picks a
+    column and a height with a single random number.
+
+    Attributes:
+        thresholds (tuple[float, ...]):
+            The height below which each column draws its own index.
+        aliases (tuple[int, ...]):
+            The index drawn above the threshold of each column.
+
+    """
+
+    __slots__ = ("aliases", "thresholds")
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        """
+        Build the table of a list of weights.
+
+        Args:
+            weights:
+                The weight of each index, positive numbers.
+
+        Raises:
+            ValueError:
+                If the list is empty.
+
+        """
+        size = len(weights)
+        if not size:
+            raise ValueError("Cannot build an alias table without weights.")
+        total = math.fsum(weights)
+        scaled = [weight * size / total for weight in weights]
+        thresholds = [1.0] * size
+        aliases = list(range(size))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            thresholds[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # Whatever is left is full up to rounding errors.
+        self.thresholds = tuple(thresholds)
+        self.aliases = tuple(aliases)
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+    def draw(self, rng: random.Random | None = None) -> int:
+        """
+        Draw an index.
+
+        Args:
+            rng (random.Random | None):
+                The random generator to draw from. If None, the global
+                `random` module is used.
+
+        Returns:
+            int:
+                An index, drawn in proportion to its weight.
+
+        """
+        value = (rng or random).random() * len(self.thresholds)
+        column = int(value)
+        if value - column < self.thresholds[column]:
+            return column
+        return self.aliases[column]
+
+
+def split_weights(
+    entries: Sequence,
+) -> tuple[tuple[str, ...], tuple[float, ...] | None]:
+    """
+    Split a token list into its tokens and their weights.
+
+    Token lists hold plain tokens, drawn with weight 1, and `[token, weight]`
+    pairs.
+
+    Args:
+        entries:
+            The entries of the token list.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[float, ...] | None]:
+            The tokens, and their weights or None if no entry is weighted.
+
+    Raises:
+        ValueError:
+            If an entry is neither a token nor a pair with a positive finite
+            weight.
+
+    """
+    tokens: list[str] = []
+    weights: list[float] = []
+    weighted = False
+    for entry in entries:
+        if isinstance(entry, str):
+            tokens.append(entry)
+            weights.append(1.0)
+            continue
+        if (
+            not isinstance(entry, (list, tuple))
+            or len(entry) != 2
+            or not isinstance(entry[0], str)
+            or isinstance(entry[1], bool)
+            or not isinstance(entry[1], (int, float))
+            or not 0.0 < entry[1] < math.inf
+        ):
+            raise ValueError(
+                f"Invalid token entry {entry!r}, expected a string or a "
+                "[token, weight] pair with a positive weight."
+            )
+        tokens.append(entry[0])
+        weights.append(float(entry[1]))
+        weighted = True
+    return tuple(tokens), tuple(weights) if weighted else None
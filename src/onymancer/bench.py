@@ -0,0 +1,377 @@
+"""Benchmarks of the generation and scoring hot paths.
+
+Run with `python -m onymancer.bench` to print a JSON report, which can be
+saved with `--output` and compared across versions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+from . import namegen
+from .pronounceability import score_pronounceability
+from .registry import LanguageRegistry, token_set_size
+
+# The preset patterns of examples/generate.py, with their language.
+PRESETS: dict[str, tuple[list[str], str]] = {
+    "simple": (["s(dim)"], "default"),
+    "fantasy": (["!s!v!c"], "default"),
+    "elven": (
+        [
+            "!svs",
+            "!svlvs",
+            "!svrvs",
+            "!svsv",
+            "!sv(th)s",
+            "!svlv",
+            "!svrv",
+            "!sv(th)v",
+            "!svl(th)s",
+            "!svr(th)s",
+            "!svnv",
+            "!svmv",
+        ],
+        "elvish",
+    ),
+    "dwarven": (["!svs", "!svc", "!svrs", "!svgs", "!svks"], "dwarvish"),
+    "title": (["!t !T"], "default"),
+    "place": (["!s<v|c><ford|ham|ton|ville|burg>"], "default"),
+    "insult": (["!i !s"], "default"),
+    "mushy": (["!m !M"], "default"),
+}
+
+# The constraints benchmarked with generate_batch, applied to BATCH_PATTERN,
+# with the predicate each one checks, used to measure acceptance rates.
+BATCH_PATTERN = "!svs"
+CONSTRAINTS: dict[str, tuple[dict[str, Any], Callable[[str], bool]]] = {
+    "none": ({}, lambda _: True),
+    "min_length": ({"min_length": 7}, lambda name: len(name) >= 7),
+    "max_length": ({"max_length": 5}, lambda name: len(name) <= 5),
+    "starts_with": ({"starts_with": "B"}, lambda name: name.startswith("B")),
+    "ends_with": ({"ends_with": "n"}, lambda name: name.endswith("n")),
+    "contains": ({"contains": "th"}, lambda name: "th" in name),
+    "min_pronounceability": (
+        {"min_pronounceability": 0.8},
+        lambda name: score_pronounceability(name) >= 0.8,
+    ),
+    "unique": ({"unique": True}, lambda _: True),
+}
+
+# The numbers of extra language files the data directory is padded with when
+# timing the import, which must not grow with them.
+IMPORT_PADDING = (0, 100, 1000)
+
+
+def _best_time(function: Callable[[], Any], repeat: int) -> float:
+    """
+    Time a function several times.
+
+    Args:
+        function:
+            The function to time.
+        repeat:
+            The number of runs.
+
+    Returns:
+        float:
+            The shortest run time, in seconds.
+
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_presets(count: int, repeat: int) -> dict[str, dict[str, float]]:
+    """
+    Measure `generate` on the preset patterns.
+
+    Args:
+        count:
+            The number of names generated per run.
+        repeat:
+            The number of runs, of which the fastest is kept.
+
+    Returns:
+        dict[str, dict[str, float]]:
+            The names per second of each preset, cycling through its
+            patterns.
+
+    """
+    results = {}
+    for preset, (patterns, language) in PRESETS.items():
+        rng = random.Random(0)
+
+        def run(
+            patterns: list[str] = patterns,
+            language: str = language,
+            rng: random.Random = rng,
+        ) -> None:
+            for index in range(count):
+                namegen.generate(
+                    patterns[index % len(patterns)], language=language, rng=rng
+                )
+
+        run()
+        results[preset] = {"names_per_second": count / _best_time(run, repeat)}
+    return results
+
+
+def bench_constraints(count: int, repeat: int) -> dict[str, dict[str, float]]:
+    """
+    Measure `generate_batch` under each type of constraint.
+
+    Args:
+        count:
+            The number of names requested per run.
+        repeat:
+            The number of runs, of which the fastest is kept.
+
+    Returns:
+        dict[str, dict[str, float]]:
+            For each constraint, the names returned per second, the number
+            of names returned, and the acceptance rate, the fraction of
+            unconstrained names that meet it.
+
+    """
+    sample = namegen.generate_batch(BATCH_PATTERN, count, seed=0)
+    results = {}
+    for constraint, (options, accepts) in CONSTRAINTS.items():
+        names: list[str] = []
+
+        def run(options: dict[str, Any] = options, names: list[str] = names) -> None:
+            names[:] = namegen.generate_batch(BATCH_PATTERN, count, seed=1, **options)
+
+        elapsed = _best_time(run, repeat)
+        results[constraint] = {
+            "names_per_second": len(names) / elapsed,
+            "returned": len(names),
+            "acceptance_rate": sum(map(accepts, sample)) / len(sample),
+        }
+    return results
+
+
+def bench_scoring(count: int, repeat: int) -> dict[str, dict[str, float]]:
+    """
+    Measure `score_pronounceability` on short and long names.
+
+    Args:
+        count:
+            The number of names scored per run.
+        repeat:
+            The number of runs, of which the fastest is kept.
+
+    Returns:
+        dict[str, dict[str, float]]:
+            The names scored per second, for names of at most 5
+            characters and of at least 10.
+
+    """
+    groups = {
+        "short": namegen.generate_batch("sv", count, seed=2, max_length=5),
+        "long": namegen.generate_batch("svsvs", count, seed=3, min_length=10),
+    }
+    results = {}
+    for group, names in groups.items():
+
+        def run(names: list[str] = names) -> None:
+            for name in names:
+                score_pronounceability(name)
+
+        results[group] = {
+            "names_per_second": len(names) / _best_time(run, repeat),
+            "mean_length": statistics.fmean(map(len, names)) if names else 0.0,
+        }
+    return results
+
+
+def bench_import(
+    repeat: int, padding: Sequence[int] = IMPORT_PADDING
+) -> dict[str, Any]:
+    """
+    Measure the time taken to import the package in a new interpreter.
+
+    The package is copied to a temporary directory, whose data directory is
+    padded with copies of the default language file under new names, and
+    imported from there for each amount of padding.
+
+    Args:
+        repeat:
+            The number of interpreters started per measure, of which the
+            median is kept.
+        padding:
+            The numbers of extra language files to time the import with,
+            at least two of them.
+
+    Returns:
+        dict[str, Any]:
+            The median start time of an interpreter importing the package
+            unpadded, of one importing nothing, and their difference, in
+            seconds; the import time for each amount of padding; and the
+            slope of the import time per extra language file.
+
+    Raises:
+        ValueError:
+            If fewer than two distinct amounts of padding are given.
+
+    """
+    if len(set(padding)) < 2:
+        raise ValueError("At least two distinct amounts of padding are required.")
+
+    def start(code: str, env: dict[str, str] | None = None) -> float:
+        times = []
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True, env=env)
+            times.append(time.perf_counter() - begin)
+        return statistics.median(times)
+
+    baseline = start("pass")
+    padded = {}
+    with tempfile.TemporaryDirectory() as root:
+        package = Path(root) / __package__
+        shutil.copytree(
+            Path(__file__).parent,
+            package,
+            ignore=shutil.ignore_patterns("__pycache__"),
+        )
+        data_dir = package / "data"
+        default = (data_dir / "default.json").read_bytes()
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [root, os.environ.get("PYTHONPATH")])
+        )
+        # Check that the copy is the one imported, and compile it, untimed.
+        check = (
+            f"import sys, {__package__} as package; "
+            f"sys.exit(not package.__file__.startswith({root!r}))"
+        )
+        subprocess.run([sys.executable, "-c", check], check=True, env=env)
+        added = 0
+        for extra in sorted(padding):
+            for index in range(added, extra):
+                (data_dir / f"padding{index:06d}.json").write_bytes(default)
+            added = max(added, extra)
+            padded[extra] = start(f"import {__package__}", env)
+    slope = statistics.linear_regression(list(padded), list(padded.values())).slope
+    with_import = padded[min(padded)]
+    return {
+        "interpreter_seconds": baseline,
+        "import_seconds": with_import,
+        "import_overhead_seconds": with_import - baseline,
+        "padded_import_seconds": {str(extra): padded[extra] for extra in padded},
+        "seconds_per_language_file": slope,
+    }
+
+
+def bench_languages() -> dict[str, dict[str, int]]:
+    """
+    Measure the memory taken by each bundled language.
+
+    Returns:
+        dict[str, dict[str, int]]:
+            For each language, the memory allocated while parsing it and
+            the size estimated by the language registry, in bytes.
+
+    """
+    results = {}
+    # Fresh registries over the bundled files, apart from the one in use.
+    data_dir = namegen._data_dir  # noqa: SLF001
+    for language in LanguageRegistry(data_dir).available():
+        registry = LanguageRegistry(data_dir)
+        tracemalloc.start()
+        try:
+            tokens = registry[language]
+            allocated = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        results[language] = {
+            "allocated_bytes": allocated,
+            "estimated_bytes": token_set_size(tokens),
+        }
+    return results
+
+
+def run(count: int = 20_000, repeat: int = 3) -> dict[str, Any]:
+    """
+    Run every benchmark.
+
+    Args:
+        count:
+            The number of names generated or scored per run.
+        repeat:
+            The number of runs of each benchmark.
+
+    Returns:
+        dict[str, Any]:
+            The report, with the versions of the package and of Python and
+            the results of each benchmark.
+
+    """
+    try:
+        version = metadata.version("onymancer")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "onymancer": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "count": count,
+        "repeat": repeat,
+        "presets": bench_presets(count, repeat),
+        "constraints": bench_constraints(count, repeat),
+        "scoring": bench_scoring(count, repeat),
+        "import": bench_import(repeat),
+        "languages": bench_languages(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmarks and print or save the JSON report.
+
+    Args:
+        argv:
+            The command-line arguments, or None to use `sys.argv`.
+
+    Returns:
+        int:
+            The exit status.
+
+    """
+    parser = argparse.ArgumentParser(description="Benchmark onymancer.")
+    parser.add_argument(
+        "--count", type=int, default=20_000, help="names per run (default: 20000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="runs per benchmark (default: 3)"
+    )
+    parser.add_argument("-o", "--output", help="file to write the report to")
+    args = parser.parse_args(argv)
+    report = json.dumps(run(args.count, args.repeat), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        sys.stdout.write(report + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Attempt budgets bounding the candidates drawn by a batch."""
+
+import time
+
+# Number of consecutive candidates rejected after which a batch gives up.
+STALL_WINDOW = 1000
+
+# Number of candidates drawn between two checks of the deadline.
+_DEADLINE_INTERVAL = 64
+
+
+class AttemptBudget:
+    """
+    Decides how many candidate names a batch may draw.
+
+    Generation loops count their attempts and ask the budget whether to go
+    on each time they reach `next_check`, so the checks cost nothing in
+    between. The budget ends the loop when one of its limits is reached:
+
+    - the attempt cap, if any;
+    - the deadline, if any;
+    - a stall, when no candidate was accepted over the last `stall_window`
+      attempts. The acceptance rate estimated from those attempts is then
+      below one in `stall_window`, so the constraints are most likely
+      unsatisfiable, or the unique names are running out.
+
+    As long as candidates keep being accepted, the budget keeps growing, so
+    selective but satisfiable constraints are given the attempts they need.
+
+    Attributes:
+        max_attempts (int | None):
+            The attempt cap, or None.
+        stall_window (int | None):
+            The number of attempts without acceptance after which the batch
+            gives up, or None to never give up.
+        next_check (int | None):
+            The number of attempts at which to call `allows` next, or None
+            if the budget never ends the loop.
+        attempts (int):
+            The number of attempts at the last check.
+        accepted (int):
+            The number of accepted candidates at the last check.
+        stalled (bool):
+            Whether the budget ended the loop because of a stall.
+
+    """
+
+    def __init__(
+        self,
+        max_attempts: int | None = None,
+        timeout: float | None = None,
+        stall_window: int | None = STALL_WINDOW,
+    ) -> None:
+        """
+        Start the budget, and its clock if there is a timeout.
+
+        Args:
+            max_attempts:
+                The maximum number of candidates to draw, or None.
+            timeout:
+                The number of seconds after which to stop, or None.
+            stall_window:
+                The number of attempts without acceptance after which to
+                give up, or None to never give up.
+
+        Raises:
+            ValueError:
+                If max_attempts or timeout is negative, or stall_window is
+                not positive.
+
+        """
+        if max_attempts is not None and max_attempts < 0:
+            raise ValueError(f"max_attempts must be non-negative, got {max_attempts}")
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"timeout must be non-negative, got {timeout}")
+        if stall_window is not None and stall_window <= 0:
+            raise ValueError(f"stall_window must be positive, got {stall_window}")
+        self.max_attempts = max_attempts
+        self.stall_window = stall_window
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._progress = 0
+        self.attempts = 0
+        self.accepted = 0
+        self.stalled = False
+        # With a deadline, check it before the first attempt.
+        self.next_check = 0 if self._deadline is not None else self._next_check(0)
+
+    def _next_check(self, attempts: int) -> int | None:
+        """
+        Compute the number of attempts at which to check the budget next.
+
+        Args:
+            attempts:
+                The number of attempts so far.
+
+        Returns:
+            int | None:
+                The next checkpoint, or None if there is none.
+
+        """
+        if self._deadline is not None:
+            checkpoint = attempts + _DEADLINE_INTERVAL
+        elif self.stall_window is not None:
+            checkpoint = self._progress + self.stall_window
+        else:
+            checkpoint = None
+        if self.max_attempts is not None:
+            if checkpoint is None or checkpoint > self.max_attempts:
+                checkpoint = self.max_attempts
+        return checkpoint
+
+    def allows(self, attempts: int, accepted: int) -> bool:
+        """
+        Check whether the batch may draw more candidates.
+
+        Args:
+            attempts:
+                The number of candidates drawn so far.
+            accepted:
+                The number of candidates accepted so far.
+
+        Returns:
+            bool:
+                True if the batch may go on, with `next_check` updated, or
+                False if a limit was reached.
+
+        """
+        if accepted > self.accepted:
+            self._progress = attempts
+        self.attempts = attempts
+        self.accepted = accepted
+        if self.max_attempts is not None and attempts >= self.max_attempts:
+            return False
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return False
+        if (
+            self.stall_window is not None
+            and attempts - self._progress >= self.stall_window
+        ):
+            self.stalled = True
+            return False
+        self.next_check = self._next_check(attempts)
+        return True
+
+    @property
+    def acceptance_rate(self) -> float:
+        """
+        Fraction of the candidates accepted as of the last check.
+
+        Returns:
+            float:
+                The estimated acceptance rate, or 0.0 before any attempt.
+
+        """
+        return self.accepted / self.attempts if self.attempts else 0.0
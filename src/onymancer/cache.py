@@ -0,0 +1,231 @@
+"""Bounded, thread-safe LRU cache used by the generator."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics about an LRU cache.
+
+    Attributes:
+        hits (int):
+            Number of lookups that found an entry.
+        misses (int):
+            Number of lookups that did not find an entry.
+        evictions (int):
+            Number of entries dropped to respect the size bound.
+        maxsize (int):
+            Maximum number of entries kept.
+        currsize (int):
+            Current number of entries.
+
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of lookups that found an entry.
+
+        Returns:
+            float:
+                The hit rate, or 0.0 if the cache was never queried.
+
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    A bounded mapping that evicts the least recently used entries.
+
+    All operations are protected by a lock, so a single instance can be shared
+    between threads. The eviction callback is called after the lock is
+    released, so it may use other locks without risking a deadlock.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        on_evict: Callable[[Hashable, Any], None] | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize:
+                Maximum number of entries. A size of 0 disables caching.
+            on_evict:
+                A function called with the key and value of every entry
+                removed by the cache, whether evicted, discarded or
+                cleared, but not replaced by `put`.
+
+        Raises:
+            ValueError:
+                If maxsize is negative.
+
+        """
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative, got {maxsize}")
+        self._maxsize = maxsize
+        self._on_evict = on_evict
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key:
+                The key to look up.
+            default:
+                The value returned when the key is missing.
+
+        Returns:
+            Any:
+                The cached value, or default.
+
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used ones if needed.
+
+        Args:
+            key:
+                The key to store.
+            value:
+                The value to associate with the key.
+
+        """
+        with self._lock:
+            if self._maxsize == 0:
+                removed = [(key, value)]
+            else:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                removed = self._shrink()
+        self._notify(removed)
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the maximum number of entries.
+
+        Args:
+            maxsize:
+                The new maximum number of entries.
+
+        Raises:
+            ValueError:
+                If maxsize is negative.
+
+        """
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative, got {maxsize}")
+        with self._lock:
+            self._maxsize = maxsize
+            removed = self._shrink()
+        self._notify(removed)
+
+    def clear(self, reset_stats: bool = True) -> None:
+        """
+        Remove all entries.
+
+        Args:
+            reset_stats:
+                Whether the hit, miss and eviction counters are reset too.
+
+        """
+        with self._lock:
+            removed = list(self._data.items())
+            self._data.clear()
+            if reset_stats:
+                self._hits = self._misses = self._evictions = 0
+        self._notify(removed)
+
+    def discard(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Remove the entries whose key satisfies a predicate.
+
+        Args:
+            predicate:
+                The function selecting the keys to remove.
+
+        """
+        with self._lock:
+            removed = [
+                (key, self._data.pop(key)) for key in list(self._data) if predicate(key)
+            ]
+        self._notify(removed)
+
+    def info(self) -> CacheInfo:
+        """
+        Report the cache statistics.
+
+        Returns:
+            CacheInfo:
+                The current counters and sizes.
+
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._maxsize,
+                len(self._data),
+            )
+
+    def _shrink(self) -> list[tuple[Hashable, Any]]:
+        """
+        Evict entries until the size bound holds. The lock must be held.
+
+        Returns:
+            list[tuple[Hashable, Any]]:
+                The evicted entries.
+
+        """
+        removed = []
+        while len(self._data) > self._maxsize:
+            removed.append(self._data.popitem(last=False))
+            self._evictions += 1
+        return removed
+
+    def _notify(self, removed: list[tuple[Hashable, Any]]) -> None:
+        """
+        Call the eviction callback on removed entries. The lock must not be
+        held.
+
+        Args:
+            removed:
+                The removed entries.
+
+        """
+        if self._on_evict is not None:
+            for key, value in removed:
+                self._on_evict(key, value)
@@ -0,0 +1,143 @@
+"""Seen-sets used to keep generated names unique."""
+
+import hashlib
+import math
+
+
+class SeenSet:
+    """
+    Exact record of the names produced so far.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty record."""
+        self._items: set[str] = set()
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, item: str) -> bool:
+        """
+        Record an item.
+
+        Args:
+            item:
+                The item to record.
+
+        Returns:
+            bool:
+                True if the item was not seen before.
+
+        """
+        if item in self._items:
+            return False
+        self._items.add(item)
+        return True
+
+
+class BloomFilter:
+    """
+    Approximate record of the names produced so far.
+
+    A Bloom filter stores a fixed number of bits regardless of the length of
+    the names. It never reports a new name as seen twice, but it may report
+    a new name as already seen, with a probability bounded by the error rate
+    as long as no more than `capacity` items are added. Used for
+    deduplication, this can skip a few valid names but never lets a
+    duplicate through.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            capacity:
+                The number of items the filter is sized for.
+            error_rate:
+                The false-positive rate at full capacity, between 0 and 1.
+
+        Raises:
+            ValueError:
+                If capacity is negative or error_rate is not in (0, 1).
+
+        """
+        if capacity < 0:
+            raise ValueError(f"capacity must be non-negative, got {capacity}")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError(f"error_rate must be in (0, 1), got {error_rate}")
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[index >> 3] & (1 << (index & 7)) for index in self._indices(item)
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the bit array.
+
+        Returns:
+            int:
+                The size of the bit array in bytes.
+
+        """
+        return len(self._bits)
+
+    def add(self, item: str) -> bool:
+        """
+        Record an item.
+
+        Args:
+            item:
+                The item to record.
+
+        Returns:
+            bool:
+                True if the item was (probably) not seen before.
+
+        """
+        bits = self._bits
+        new = False
+        for index in self._indices(item):
+            mask = 1 << (index & 7)
+            if not bits[index >> 3] & mask:
+                bits[index >> 3] |= mask
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def _indices(self, item: str) -> list[int]:
+        """
+        Compute the bit positions of an item with double hashing.
+
+        Args:
+            item:
+                The item to hash.
+
+        Returns:
+            list[int]:
+                The bit positions.
+
+        """
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self._size for i in range(self._hashes)]
@@ -0,0 +1,237 @@
+"""Junction compatibility tables between the tokens of a language."""
+
+from collections.abc import Mapping, Sequence
+
+from . import pronounceability
+from .alias import AliasTable, split_weights
+
+# Consonants at both ends of a piece of text, lowercased: (leading, trailing).
+# The trailing part is None when the text only holds consonants.
+Shape = tuple[str, str | None]
+
+
+class JunctionTable:
+    """
+    Penalties of the consonant clusters formed where two tokens meet.
+
+    When a token follows another, the consonants ending the first and those
+    starting the second form a single cluster, such as "rst" + "pl". The
+    penalty of a junction only depends on the consonant ending of the text
+    before it, so for every token class the table holds one row of penalties
+    per ending, with one entry per token of the class. Rows for the endings
+    of the tokens of the language are computed when the table is built, and
+    rows for other endings, left by literals or by runs of consonant-only
+    tokens, on first use.
+
+    Each row comes with the indices of the tokens that form no penalized
+    cluster, so that a good successor is drawn with a single `choice`, or
+    with an alias table over their weights for weighted token lists.
+
+    Attributes:
+        rules (tuple[frozenset[str], ...]):
+            The snapshot of the scorer rules the table follows, taken with
+            `PronounceabilityScorer.rules_fingerprint`.
+
+    """
+
+    __slots__ = (
+        "_aliases",
+        "_consonants",
+        "_penalties",
+        "_scorer",
+        "_shapes",
+        "_successors",
+        "_tokens",
+        "_weights",
+        "rules",
+    )
+
+    def __init__(
+        self,
+        token_map: Mapping[str, Sequence[str]],
+        scorer: pronounceability.PronounceabilityScorer | None = None,
+    ) -> None:
+        """
+        Build the table of a token map.
+
+        Args:
+            token_map:
+                The token lists of the language, keyed by class. Entries are
+                tokens or [token, weight] pairs.
+            scorer:
+                The scorer whose cluster rules are applied. If None, the
+                scorer used by `score_pronounceability` is used.
+
+        """
+        if scorer is None:
+            scorer = pronounceability.get_scorer()
+        self.rules = scorer.rules_fingerprint()
+        self._scorer = scorer
+        self._consonants = scorer.CONSONANTS
+        self._tokens: dict[str, tuple[str, ...]] = {}
+        self._weights: dict[str, tuple[float, ...] | None] = {}
+        for key, entries in token_map.items():
+            self._tokens[key], self._weights[key] = split_weights(entries)
+        self._shapes: dict[str, Shape] = {}
+        self._penalties: dict[tuple[str, str], tuple[float, ...]] = {}
+        self._successors: dict[tuple[str, str], tuple[int, ...] | None] = {}
+        self._aliases: dict[tuple[str, str], AliasTable] = {}
+        endings: set[str] = set()
+        for tokens in self._tokens.values():
+            for token in tokens:
+                lead, trail = self.shape(token)
+                ending = lead if trail is None else trail
+                if ending:
+                    endings.add(ending)
+        for key in self._tokens:
+            for ending in endings:
+                self._add_row(key, ending)
+
+    def shape(self, text: str) -> Shape:
+        """
+        Find the consonants at both ends of a piece of text.
+
+        Args:
+            text:
+                The text to inspect.
+
+        Returns:
+            Shape:
+                The leading and trailing consonants, lowercased.
+
+        """
+        shape = self._shapes.get(text)
+        if shape is None:
+            lower = text.lower()
+            lead = 0
+            while lead < len(lower) and lower[lead] in self._consonants:
+                lead += 1
+            if lead == len(lower):
+                shape = (lower, None)
+            else:
+                trail = len(lower)
+                while lower[trail - 1] in self._consonants:
+                    trail -= 1
+                shape = (lower[:lead], lower[trail:])
+            self._shapes[text] = shape
+        return shape
+
+    def _penalty(self, ending: str, token: str) -> float:
+        """
+        Compute the penalty of the cluster a token forms after an ending.
+
+        Args:
+            ending:
+                The consonants at the end of the text before the token.
+            token:
+                The token.
+
+        Returns:
+            float:
+                The penalty of the cluster, 0.0 when the ending or the start
+                of the token is not a consonant. A token made only of
+                consonants is penalized once the run reaches four consonants,
+                which is penalized whatever follows, and is not penalized
+                before.
+
+        """
+        lead, trail = self.shape(token)
+        if not ending or not lead:
+            return 0.0
+        cluster = ending + lead
+        if trail is None:
+            return 0.5 if len(cluster) >= 4 else 0.0
+        if len(cluster) < 2:
+            return 0.0
+        return self._scorer.cluster_penalty(cluster)
+
+    def _add_row(self, key: str, ending: str) -> None:
+        """
+        Compute the penalties and successors of a class after an ending.
+
+        Args:
+            key:
+                The token class.
+            ending:
+                The consonants at the end of the text before the token.
+
+        """
+        penalties = tuple(self._penalty(ending, token) for token in self._tokens[key])
+        fitting = tuple(
+            index for index, penalty in enumerate(penalties) if penalty == 0.0
+        )
+        successors = fitting if 0 < len(fitting) < len(penalties) else None
+        self._penalties[key, ending] = penalties
+        self._successors[key, ending] = successors
+        weights = self._weights[key]
+        if successors is not None and weights is not None:
+            self._aliases[key, ending] = AliasTable(
+                [weights[index] for index in successors]
+            )
+
+    def penalties(self, key: str, ending: str) -> tuple[float, ...]:
+        """
+        Return the junction penalties of a class after an ending.
+
+        Args:
+            key:
+                The token class.
+            ending:
+                The consonants at the end of the text before the token.
+
+        Returns:
+            tuple[float, ...]:
+                The penalty of each token of the class, in order.
+
+        Raises:
+            KeyError:
+                If the class is not part of the table.
+
+        """
+        if (key, ending) not in self._penalties:
+            self._add_row(key, ending)
+        return self._penalties[key, ending]
+
+    def successors(self, key: str, ending: str) -> tuple[int, ...] | None:
+        """
+        Return the tokens of a class that fit after an ending.
+
+        Args:
+            key:
+                The token class.
+            ending:
+                The consonants at the end of the text before the token.
+
+        Returns:
+            tuple[int, ...] | None:
+                The indices of the tokens forming no penalized cluster, or
+                None when all of them or none of them do, and any token can
+                be drawn.
+
+        Raises:
+            KeyError:
+                If the class is not part of the table.
+
+        """
+        if (key, ending) not in self._successors:
+            self._add_row(key, ending)
+        return self._successors[key, ending]
+
+    def alias(self, key: str, ending: str) -> AliasTable:
+        """
+        Return the alias table drawing the fitting tokens of a weighted class.
+
+        Args:
+            key:
+                The token class, whose tokens are weighted.
+            ending:
+                The consonants at the end of the text before the token, for
+                which `successors` is not None.
+
+        Returns:
+            AliasTable:
+                The table drawing an index into `successors(key, ending)` in
+                proportion to the weights of the tokens.
+
+        """
+        return self._aliases[key, ending]
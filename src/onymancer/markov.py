@@ -0,0 +1,491 @@
+"""Character-level Markov chain name generator."""
+
+import random
+import warnings
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Sequence
+from typing import Any, SupportsIndex, cast
+
+from .budget import STALL_WINDOW, AttemptBudget
+from .dedup import SeenSet
+from .model import ModelFile, write_model
+from .namegen import _make_rng
+from .pronounceability import score_pronounceability
+
+# Code of the boundary symbol, which pads the start of a name and ends it.
+_BOUNDARY = 0
+
+# Tag of the Markov chain model files.
+_MODEL_KIND = b"MRKV"
+
+
+class MarkovGenerator:
+    """
+    Generate names from a Markov chain trained on example names.
+
+    The chain predicts each character from the `order` characters before it.
+    Names are padded with boundary symbols at the start, and a boundary
+    symbol ends them, so the chain also learns how names begin and end.
+
+    The transition tables are flat arrays: characters are encoded as small
+    integers, and every context seen during training is a state numbered
+    from 0. The transitions of state `s` are the entries from
+    `offsets[s]` to `offsets[s + 1]` of parallel arrays holding the next
+    character, the cumulative count used to draw it, and the first and last
+    transitions of the state reached. A step is one bisection inside that
+    range, with no dictionary lookup.
+
+    Since the tables are flat arrays of fixed-width integers, a trained
+    chain can be saved with `save` and mapped back in place with `load`.
+
+    Attributes:
+        order (int):
+            The number of characters of context.
+        alphabet (str):
+            The characters seen during training, in code order.
+
+    """
+
+    def __init__(self, names: Iterable[str], order: int = 3) -> None:
+        """
+        Train a chain on example names.
+
+        Args:
+            names:
+                The example names. Empty names are ignored.
+            order:
+                The number of characters of context, from 1 to 4.
+
+        Raises:
+            ValueError:
+                If the order is out of range or there are no example names.
+
+        """
+        if not 1 <= order <= 4:
+            raise ValueError(f"order must be between 1 and 4, got {order}")
+        names = [name for name in names if name]
+        if not names:
+            raise ValueError("Cannot train a Markov chain without example names.")
+        self.order = order
+        self._filename: str | None = None
+        self.alphabet = "".join(sorted({char for name in names for char in name}))
+        codes = {char: index + 1 for index, char in enumerate(self.alphabet)}
+        base = len(self.alphabet) + 1
+        modulus = base**order
+
+        # Count transitions between contexts, encoded as base-`base` numbers
+        # of their last `order` codes.
+        counts: dict[int, dict[int, int]] = {}
+        for name in names:
+            context = 0
+            for code in [codes[char] for char in name] + [_BOUNDARY]:
+                row = counts.get(context)
+                if row is None:
+                    row = counts[context] = {}
+                row[code] = row.get(code, 0) + 1
+                context = (context * base + code) % modulus
+
+        # Number the contexts, the empty context first, and lay out their
+        # transitions one state after the other.
+        states = {context: index for index, context in enumerate(counts)}
+        offsets = array("i", [0])
+        for row in counts.values():
+            offsets.append(offsets[-1] + len(row))
+        symbols = array("i")
+        cumulative = array("q")
+        next_first = array("i")
+        next_last = array("i")
+        for context, row in counts.items():
+            total = 0
+            for code, count in row.items():
+                total += count
+                symbols.append(code)
+                cumulative.append(total)
+                if code == _BOUNDARY:
+                    next_first.append(-1)
+                    next_last.append(-1)
+                else:
+                    state = states[(context * base + code) % modulus]
+                    next_first.append(offsets[state])
+                    next_last.append(offsets[state + 1] - 1)
+        self._set_tables(offsets, symbols, cumulative, next_first, next_last)
+
+    def _set_tables(
+        self,
+        offsets: Sequence[int],
+        symbols: Sequence[int],
+        cumulative: Sequence[int],
+        next_first: Sequence[int],
+        next_last: Sequence[int],
+    ) -> None:
+        """
+        Install the transition tables, built in memory or mapped from a file.
+
+        Args:
+            offsets:
+                The first transition of each state, and the total count of
+                transitions at the end.
+            symbols:
+                The code of the character of each transition.
+            cumulative:
+                The running total of the counts of the transitions of each
+                state, used to draw them.
+            next_first:
+                The first transition of the state reached by each
+                transition, -1 at the end of a name.
+            next_last:
+                The last transition of the state reached by each transition,
+                -1 at the end of a name.
+
+        """
+        self._offsets = offsets
+        self._symbols = symbols
+        self._cumulative = cumulative
+        self._next_first = next_first
+        self._next_last = next_last
+        self._characters = ("", *self.alphabet)
+
+    def save(self, filename: str) -> None:
+        """
+        Save the chain to a binary model file.
+
+        Args:
+            filename:
+                The path of the file to write.
+
+        """
+        write_model(
+            filename,
+            _MODEL_KIND,
+            {
+                b"ORDR": array("i", [self.order]),
+                b"ALPH": self.alphabet.encode("utf-8"),
+                b"OFFS": array("i", self._offsets),
+                b"SYMB": array("i", self._symbols),
+                b"CUMU": array("q", self._cumulative),
+                b"NXTF": array("i", self._next_first),
+                b"NXTL": array("i", self._next_last),
+            },
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "MarkovGenerator":
+        """
+        Load a chain saved with `save`.
+
+        The file is memory-mapped and the transition tables are used in
+        place, without copying or training: loading takes the same time
+        whatever the size of the chain, and processes loading the same file
+        share a single copy of the tables.
+
+        Args:
+            filename:
+                The path of the file to load.
+
+        Returns:
+            MarkovGenerator:
+                The chain.
+
+        Raises:
+            OSError:
+                If the file cannot be opened.
+            ValueError:
+                If the file is not a Markov chain model file.
+
+        """
+        model = ModelFile(filename)
+        if model.kind != _MODEL_KIND:
+            raise ValueError(f"{filename} does not hold a Markov chain.")
+        try:
+            # The instance is built here instead of by __init__, which trains.
+            generator = cls.__new__(cls)
+            generator._filename = filename  # noqa: SLF001
+            generator.order = model.section(b"ORDR")[0]
+            generator.alphabet = model.text(b"ALPH")
+            generator._set_tables(  # noqa: SLF001
+                model.section(b"OFFS"),
+                model.section(b"SYMB"),
+                model.section(b"CUMU"),
+                model.section(b"NXTF"),
+                model.section(b"NXTL"),
+            )
+        except (IndexError, KeyError, UnicodeDecodeError) as error:
+            raise ValueError(f"{filename} is corrupted.") from error
+        return generator
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> str | tuple[Any, ...]:
+        # A chain loaded from a file is pickled as its file name, so that
+        # worker processes map the file instead of copying the tables.
+        if self._filename is not None:
+            return type(self).load, (self._filename,)
+        return super().__reduce_ex__(protocol)
+
+    def __repr__(self) -> str:
+        return (
+            f"MarkovGenerator(order={self.order}, states={self.state_count}, "
+            f"transitions={self.transition_count})"
+        )
+
+    @property
+    def state_count(self) -> int:
+        """
+        Number of contexts seen during training.
+
+        Returns:
+            int:
+                The number of states of the chain.
+
+        """
+        return len(self._offsets) - 1
+
+    @property
+    def transition_count(self) -> int:
+        """
+        Number of distinct transitions seen during training.
+
+        Returns:
+            int:
+                The number of entries of the transition arrays.
+
+        """
+        return len(self._symbols)
+
+    def _start_state(self, prefix: str) -> tuple[int, int] | None:
+        """
+        Find the state reached after generating a prefix.
+
+        Args:
+            prefix:
+                The beginning of the name.
+
+        Returns:
+            tuple[int, int] | None:
+                The first and last transitions of the state, or None if the
+                chain cannot generate the prefix.
+
+        """
+        first = self._offsets[0]
+        last = self._offsets[1] - 1
+        for char in prefix:
+            code = self.alphabet.find(char) + 1
+            if not code:
+                return None
+            for index in range(first, last + 1):
+                if self._symbols[index] == code:
+                    first = self._next_first[index]
+                    last = self._next_last[index]
+                    break
+            else:
+                return None
+        return first, last
+
+    def _walk(
+        self,
+        random_float,
+        state: tuple[int, int],
+        prefix: str,
+        max_length: int | None,
+    ) -> str | None:
+        """
+        Generate the rest of a name from a state.
+
+        Args:
+            random_float:
+                The function returning a random float in [0, 1).
+            state:
+                The first and last transitions of the state to start from.
+            prefix:
+                The text already generated to reach that state.
+            max_length:
+                The length above which the name is abandoned, or None.
+
+        Returns:
+            str | None:
+                The name, or None if it grew longer than max_length.
+
+        """
+        cumulative = self._cumulative
+        next_first = self._next_first
+        next_last = self._next_last
+        symbols = self._symbols
+        characters = self._characters
+        first, last = state
+        buffer = [prefix]
+        if max_length is None:
+            while True:
+                index = bisect_right(
+                    cumulative, random_float() * cumulative[last], first, last
+                )
+                first = next_first[index]
+                if first < 0:
+                    return "".join(buffer)
+                last = next_last[index]
+                buffer.append(characters[symbols[index]])
+        remaining = max_length - len(prefix)
+        while True:
+            index = bisect_right(
+                cumulative, random_float() * cumulative[last], first, last
+            )
+            first = next_first[index]
+            if first < 0:
+                return "".join(buffer)
+            if not remaining:
+                return None
+            remaining -= 1
+            last = next_last[index]
+            buffer.append(characters[symbols[index]])
+
+    def generate(
+        self,
+        seed: int | None = None,
+        rng: random.Random | None = None,
+    ) -> str:
+        """
+        Generate a name.
+
+        Args:
+            seed (int | None):
+                The seed for random number generation.
+            rng (random.Random | None):
+                The random generator to draw from. If neither seed nor rng
+                is given, the global `random` module is used.
+
+        Returns:
+            str:
+                The generated name.
+
+        Raises:
+            ValueError:
+                If both seed and rng are given.
+
+        """
+        rng = _make_rng(seed, rng)
+        # Without a maximum length, the walk always completes the name.
+        return cast(
+            "str",
+            self._walk(
+                (rng or random).random,
+                (self._offsets[0], self._offsets[1] - 1),
+                "",
+                None,
+            ),
+        )
+
+    def generate_batch(
+        self,
+        count: int,
+        seed: int | None = None,
+        min_length: int | None = None,
+        max_length: int | None = None,
+        starts_with: str | None = None,
+        ends_with: str | None = None,
+        contains: str | None = None,
+        min_pronounceability: float | None = None,
+        rng: random.Random | None = None,
+        unique: bool = False,
+        max_attempts: int | None = None,
+        timeout: float | None = None,
+    ) -> list[str]:
+        """
+        Generate multiple names, mirroring `onymancer.generate_batch`.
+
+        Names are walked from the state reached after `starts_with`, which
+        conditions the chain on the prefix exactly, and abandoned as soon as
+        they exceed `max_length`. The other constraints are checked on the
+        finished names. Walks are drawn under the same adaptive attempt
+        budget as `onymancer.generate_batch`.
+
+        Args:
+            count:
+                Number of names to generate.
+            seed:
+                Optional seed for reproducibility. The names are drawn in
+                sequence from a private generator seeded with it.
+            min_length:
+                Minimum length constraint for generated names.
+            max_length:
+                Maximum length constraint for generated names.
+            starts_with:
+                String that generated names must start with.
+            ends_with:
+                String that generated names must end with.
+            contains:
+                String that generated names must contain.
+            min_pronounceability:
+                Minimum pronounceability score (0.0-1.0) for generated names.
+            rng:
+                The random generator to draw from. If neither seed nor rng
+                is given, the global `random` module is used.
+            unique:
+                Whether the returned names must be distinct.
+            max_attempts:
+                Maximum number of walks to draw. If None, only the adaptive
+                budget and the timeout bound them.
+            timeout:
+                Number of seconds after which to return the names accepted
+                so far. If None, there is no time limit.
+
+        Returns:
+            list[str]:
+                List of generated names that meet all specified constraints.
+                May return fewer than 'count' names if the attempt budget or
+                the timeout runs out. If the chain cannot generate the
+                prefix, or the prefix is longer than max_length, a
+                RuntimeWarning is issued and an empty list is returned.
+
+        Raises:
+            ValueError:
+                If both seed and rng are given, or if max_attempts or
+                timeout is negative.
+
+        """
+        rng = _make_rng(seed, rng)
+        budget = AttemptBudget(max_attempts, timeout, max(STALL_WINDOW, count))
+        prefix = starts_with or ""
+        state = self._start_state(prefix)
+        if state is None or (max_length is not None and len(prefix) > max_length):
+            warnings.warn(
+                f"The Markov chain cannot generate names starting with {prefix!r}"
+                " within the length constraints.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            return []
+        random_float = (rng or random).random
+        seen = SeenSet() if unique else None
+        names: list[str] = []
+        attempts = 0
+        next_check = budget.next_check
+        while len(names) < count:
+            if attempts == next_check:
+                if not budget.allows(attempts, len(names)):
+                    break
+                next_check = budget.next_check
+            attempts += 1
+            name = self._walk(random_float, state, prefix, max_length)
+            if name is None:
+                continue
+            if min_length is not None and len(name) < min_length:
+                continue
+            if ends_with is not None and not name.endswith(ends_with):
+                continue
+            if contains is not None and contains not in name:
+                continue
+            if (
+                min_pronounceability is not None
+                and score_pronounceability(name) < min_pronounceability
+            ):
+                continue
+            if seen is not None and not seen.add(name):
+                continue
+            names.append(name)
+        if budget.stalled:
+            warnings.warn(
+                f"Gave up on the Markov chain after {budget.attempts} attempts "
+                f"with {len(names)} of {count} names: none of the last "
+                f"{budget.stall_window} walks met the constraints.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        return names
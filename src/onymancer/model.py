@@ -0,0 +1,270 @@
+"""Binary model files, memory-mapped when loaded."""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping
+
+# File layout, all integers little-endian:
+#
+#   header    magic "ONYM", format version, model kind, section count
+#   sections  one entry per section: name, array typecode, offset, length
+#   data      the sections, each starting at a multiple of 8 bytes
+#
+# A section is a flat array of integers ("i", "q"), floats ("d") or bytes
+# ("B"), read in place from the mapped file.
+MAGIC = b"ONYM"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sH4sH")
+_SECTION = struct.Struct("<4sc3xQQ")
+_ALIGNMENT = 8
+_TYPECODES = {"B": 1, "i": 4, "q": 8, "d": 8}
+
+
+def _padding(size: int) -> int:
+    """
+    Count the bytes needed to align a size to the section alignment.
+
+    Args:
+        size:
+            The size to align.
+
+    Returns:
+        int:
+            The number of padding bytes.
+
+    """
+    return -size % _ALIGNMENT
+
+
+def write_model(
+    filename: str,
+    kind: bytes,
+    sections: Mapping[bytes, array | bytes],
+) -> None:
+    """
+    Write a model file.
+
+    The file is written next to the target and then renamed over it, so
+    processes that mapped the previous version keep reading it unharmed.
+
+    Args:
+        filename:
+            The path of the file to write.
+        kind:
+            The four-byte tag of the model type, checked when loading.
+        sections:
+            The sections of the model, keyed by four-byte name. Values are
+            arrays of one of the supported typecodes, or bytes.
+
+    Raises:
+        ValueError:
+            If a tag is not four bytes long or an array typecode is not
+            supported.
+
+    """
+    if len(kind) != 4:
+        raise ValueError(f"Model kinds are four bytes long, got {kind!r}")
+    entries: list[tuple[bytes, str, bytes, int]] = []
+    for name, values in sections.items():
+        if len(name) != 4:
+            raise ValueError(f"Section names are four bytes long, got {name!r}")
+        if isinstance(values, array):
+            typecode: str = values.typecode
+            if _TYPECODES.get(typecode) != values.itemsize:
+                raise ValueError(
+                    f"Unsupported array typecode {typecode!r} in section {name!r}"
+                )
+            if sys.byteorder != "little" and values.itemsize > 1:
+                values = array(values.typecode, values)
+                values.byteswap()
+            entries.append((name, typecode, values.tobytes(), len(values)))
+        else:
+            data = bytes(values)
+            entries.append((name, "B", data, len(data)))
+
+    offset = _HEADER.size + _SECTION.size * len(entries)
+    offset += _padding(offset)
+    table = [_HEADER.pack(MAGIC, VERSION, kind, len(entries))]
+    for name, typecode, data, length in entries:
+        table.append(_SECTION.pack(name, typecode.encode(), offset, length))
+        offset += len(data) + _padding(len(data))
+    # Write a new file and move it over the target rather than truncating
+    # the target, which would break the processes that have it mapped.
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temporary = tempfile.mkstemp(prefix=".onym-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"".join(table))
+            f.write(bytes(_padding(f.tell())))
+            for _, _, data, _ in entries:
+                f.write(data)
+                f.write(bytes(_padding(len(data))))
+        if os.path.exists(filename):
+            shutil.copymode(filename, temporary)
+        else:
+            os.chmod(temporary, 0o644)
+        os.replace(temporary, filename)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class ModelFile:
+    """
+    A model file mapped in memory.
+
+    Sections are returned as memoryviews over the mapping, so loading a
+    model copies nothing: the pages are read from disk on first access and
+    shared through the page cache by every process mapping the same file.
+    The mapping stays open as long as a view of one of its sections is
+    alive.
+
+    Attributes:
+        kind (bytes):
+            The four-byte tag of the model type.
+
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Map a model file and read its section table.
+
+        Args:
+            filename:
+                The path of the file to load.
+
+        Raises:
+            OSError:
+                If the file cannot be opened.
+            ValueError:
+                If the file is not a model file of a supported version, or
+                its section table is corrupted.
+
+        """
+        with open(filename, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{filename} is empty.") from None
+        self._view = memoryview(self._map)
+        if len(self._view) < _HEADER.size:
+            raise ValueError(f"{filename} is not an onymancer model file.")
+        magic, version, self.kind, count = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not an onymancer model file.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported model file version {version}.")
+        if len(self._view) < _HEADER.size + _SECTION.size * count:
+            raise ValueError(f"{filename} is truncated.")
+        self._sections: dict[bytes, tuple[str, int, int]] = {}
+        for index in range(count):
+            name, typecode, offset, length = _SECTION.unpack_from(
+                self._view, _HEADER.size + _SECTION.size * index
+            )
+            typecode = typecode.decode("ascii", "replace")
+            itemsize = _TYPECODES.get(typecode)
+            if itemsize is None or offset % _ALIGNMENT:
+                raise ValueError(f"Corrupted section {name!r} in {filename}.")
+            if offset + itemsize * length > len(self._view):
+                raise ValueError(f"{filename} is truncated.")
+            self._sections[name] = (typecode, offset, length)
+
+    def __contains__(self, name: bytes) -> bool:
+        return name in self._sections
+
+    def section(self, name: bytes) -> memoryview:
+        """
+        Return a section of the model.
+
+        Args:
+            name:
+                The four-byte name of the section.
+
+        Returns:
+            memoryview:
+                The items of the section, viewed in place with the typecode
+                they were written with. On big-endian machines the items
+                are copied and byte-swapped instead.
+
+        Raises:
+            KeyError:
+                If the model has no such section.
+
+        """
+        typecode, offset, length = self._sections[name]
+        data = self._view[offset : offset + _TYPECODES[typecode] * length]
+        if sys.byteorder != "little" and typecode != "B":
+            values = array(typecode, data.tobytes())
+            values.byteswap()
+            return memoryview(values)
+        # The typecode was checked against _TYPECODES when the file was opened.
+        return data.cast(typecode)  # type: ignore[call-overload]
+
+    def text(self, name: bytes) -> str:
+        """
+        Decode a section of UTF-8 text.
+
+        Args:
+            name:
+                The four-byte name of the section.
+
+        Returns:
+            str:
+                The decoded text.
+
+        Raises:
+            KeyError:
+                If the model has no such section.
+
+        """
+        return str(self.section(name), "utf-8")
+
+
+def pack_strings(strings: list[str]) -> tuple[array, bytes]:
+    """
+    Pack strings into a UTF-8 blob and the offsets of their bounds.
+
+    Args:
+        strings:
+            The strings to pack.
+
+    Returns:
+        tuple[array, bytes]:
+            The offsets, one more than there are strings, and the blob.
+            String `i` is the blob from `offsets[i]` to `offsets[i + 1]`.
+
+    """
+    offsets = array("q", [0])
+    encoded = []
+    for string in strings:
+        data = string.encode("utf-8")
+        encoded.append(data)
+        offsets.append(offsets[-1] + len(data))
+    return offsets, b"".join(encoded)
+
+
+def unpack_strings(offsets: memoryview, blob: memoryview) -> list[str]:
+    """
+    Decode strings packed with `pack_strings`.
+
+    Args:
+        offsets:
+            The offsets of the bounds of the strings.
+        blob:
+            The UTF-8 blob.
+
+    Returns:
+        list[str]:
+            The strings.
+
+    """
+    return [
+        str(blob[offsets[index] : offsets[index + 1]], "utf-8")
+        for index in range(len(offsets) - 1)
+    ]
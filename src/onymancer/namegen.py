@@ -2,10 +2,31 @@
 
 import json
 import random
-from dataclasses import dataclass, field
+import time
+import warnings
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import cast
 
-from .pronounceability import score_pronounceability
+from . import vectorized
+from .budget import STALL_WINDOW, AttemptBudget
+from .cache import CacheInfo, LRUCache
+from .dedup import BloomFilter, SeenSet
+from .junctions import JunctionTable
+from .pattern import CompiledPattern
+from .permutation import FeistelPermutation
+from .pronounceability import PronounceabilityScorer, score_pronounceability
+from .registry import (
+    LanguageRegistry,
+    RegistryInfo,
+    estimate_size,
+    read_token_set,
+    write_token_set,
+)
+from .sampling import ConstrainedSampler
+from .stats import GenerationStats
 
 # Global token map
 _token_map: dict[str, list[str]] = {}
@@ -13,192 +34,141 @@ _token_map: dict[str, list[str]] = {}
 # Data directory
 _data_dir = Path(__file__).parent / "data"
 
-# Load language token sets from JSON files
-_language_tokens: dict[str, dict[str, list[str]]] = {}
-for lang_file in _data_dir.glob("*.json"):
-    lang = lang_file.stem
-    with open(lang_file, encoding="utf-8") as f:
-        _language_tokens[lang] = json.load(f)
+# Language token sets, parsed from the files of the data directory on first
+# use. The junction tables and compiled patterns of a language are charged to
+# its token set, and dropped with it when it is evicted. The lambda defers the
+# lookup of _invalidate_compiled, which is defined further down.
+_language_tokens = LanguageRegistry(
+    _data_dir,
+    on_evict=lambda language: _invalidate_compiled(language),  # noqa: PLW0108
+)
 
-# Initialize with default tokens
+# Initialize with default tokens. The default patterns are compiled from
+# _token_map, which evicting the default token set would not change, so it is
+# kept in memory to hold their charges.
+_language_tokens.pin("default")
 _token_map.update(_language_tokens["default"])
 
+# Version of the token set of each language, bumped whenever it changes or
+# is evicted.
+_token_versions: dict[str, int] = {}
 
-@dataclass
-class _OptionT:
-    """
-    Struct that encapsulates all the state options.
-
-    Attributes:
-        capitalize (bool):
-            Whether to capitalize the next character.
-        emit_literal (bool):
-            Whether to emit characters as literals.
-        inside_group (bool):
-            Whether currently inside a group.
-        current_option (str):
-            The current option being built.
-        options (list[str]):
-            The list of options in the current group.
-        language (str):
-            The language token set to use.
+# Compiled patterns and their estimated size, keyed by (pattern, language,
+# token version). Removed patterns release their size from the language.
+_pattern_cache = LRUCache(
+    maxsize=256, on_evict=lambda key, entry: _release_compiled(key, entry[1])
+)
 
-    """
+# Objects referenced by the data derived from a token set without belonging
+# to it, left out of its estimated size.
+_SHARED = (JunctionTable, PronounceabilityScorer)
 
-    capitalize: bool = field(
-        default=False,
-        metadata={"description": "Whether to capitalize the next character."},
-    )
-    emit_literal: bool = field(
-        default=False,
-        metadata={"description": "Whether to emit characters as literals."},
-    )
-    inside_group: bool = field(
-        default=False, metadata={"description": "Whether currently inside a group."}
-    )
-    current_option: str = field(
-        default="", metadata={"description": "The current option being built."}
-    )
-    options: list[str] = field(
-        default_factory=list,
-        metadata={"description": "The list of options in the current group."},
-    )
-    language: str = field(
-        default="default",
-        metadata={"description": "The language token set to use."},
-    )
+# Junction tables of the languages, built when a language is loaded from a
+# file, or on the first pronounceability-steered draw otherwise.
+_language_junctions: dict[str, JunctionTable] = {}
 
 
-def _capitalize_and_clear(options: _OptionT, character: str) -> str:
+def load_language_from_json(language: str, filename: str) -> bool:
     """
-    Capitalize the given character if capitalize is True.
+    Load a custom language token set from a JSON file.
+
+    Token lists hold tokens and [token, weight] pairs, for instance
+    `{"s": [["ael", 5], ["yr", 1]]}`. Weighted tokens are drawn in proportion
+    to their weight, plain ones with weight 1.
+
+    The junction table of the language, used to avoid penalized consonant
+    clusters between tokens when junctions are pruned, is computed at load
+    time.
 
     Args:
-        options:
-            The current state options.
-        character:
-            The input character.
+        language:
+            The name of the language to load.
+        filename:
+            The path to the JSON file containing the token set.
 
     Returns:
-        str:
-            The capitalized character if capitalize is True, else the original.
+        bool:
+            True if the loading was successful, False otherwise, including
+            when a token list holds an invalid entry.
 
     """
-    if options.capitalize:
-        options.capitalize = False
-        return character.upper()
-    return character
+    try:
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            return False
+        _install_language(language, data, filename)
+    except (OSError, json.JSONDecodeError, TypeError, ValueError):
+        return False
+    return True
 
 
-def _process_token(options: _OptionT, buffer: list[str], key: str) -> bool:
+def _install_language(language: str, data: dict[str, list], filename: str) -> None:
     """
-    Process a token based on the provided key and append it to the buffer.
+    Register the token set of a language and build its junction table.
 
     Args:
-        options:
-            The current state options.
-        buffer:
-            The string buffer where the processed token will be appended.
-        key:
-            The key representing the type of token to process.
+        language:
+            The name of the language.
+        data:
+            The token lists of the language, keyed by class.
+        filename:
+            The file the token set was read from, parsed again if the token
+            set is evicted from memory.
 
-    Returns:
-        bool:
-            True on success, False otherwise.
+    Raises:
+        TypeError:
+            If a token list is not a list.
+        ValueError:
+            If a token list holds an invalid entry.
 
     """
-    if options.language == "default":
-        tokens = _token_map.get(key, [])
-    else:
-        token_map = _language_tokens.get(options.language, {})
-        tokens = token_map.get(key, [])
-    if not tokens:
-        buffer.append(_capitalize_and_clear(options, key))
-    else:
-        token = random.choice(tokens)
-        it = iter(token)
-        first_char = next(it, "")
-        buffer.append(_capitalize_and_clear(options, first_char))
-        buffer.extend(it)
-    return True
+    junctions = JunctionTable(data)
+    _invalidate_compiled(language)
+    _language_tokens.register(language, data, filename)
+    if language != "default":
+        _language_junctions[language] = junctions
+        _language_tokens.charge(language, estimate_size(junctions, _SHARED))
 
 
-def _process_character(
-    options: _OptionT,
-    buffer: list[str],
-    character: str,
-) -> bool:
+def save_language(language: str, filename: str) -> None:
     """
-    Process a character from the pattern and append it to the buffer.
+    Save the token set of a language to a binary model file.
+
+    The keys and the tokens are stored as UTF-8 blobs with the offsets of
+    their bounds, along with the weights of the tokens, so that the file is
+    read back with `load_language_from_model` without parsing.
 
     Args:
-        options:
-            The current state options.
-        buffer:
-            The string buffer where the processed character will be appended.
-        character:
-            The character to process.
+        language:
+            The name of the language to save.
+        filename:
+            The path of the file to write.
 
-    Returns:
-        bool:
-            True on success, False otherwise.
-
-    """
-    if character == "(":
-        if options.inside_group:
-            options.current_option += character
-        else:
-            options.emit_literal = True
-    elif character == ")":
-        if options.inside_group:
-            options.current_option += character
-        else:
-            options.emit_literal = False
-    elif character == "<":
-        options.inside_group = True
-        options.options.clear()
-        options.current_option = ""
-    elif character == "|":
-        options.options.append(options.current_option)
-        options.current_option = ""
-    elif character == ">":
-        options.inside_group = False
-        options.options.append(options.current_option)
-        options.current_option = ""
-        # Ensure there's at least one option in the group.
-        if not options.options:
-            return False
-        # Randomly pick an option.
-        option = random.choice(options.options)
-        # Process and append the selected option.
-        for token in option:
-            if not _process_character(options, buffer, token):
-                return False
-        # Clear options after processing the group.
-        options.options.clear()
-    elif character == "!":
-        if options.inside_group:
-            options.current_option += character
-        else:
-            options.capitalize = True
-    elif options.inside_group:
-        options.current_option += character
-    elif options.emit_literal:
-        buffer.append(_capitalize_and_clear(options, character))
-    elif not _process_token(options, buffer, character):
-        return False
-    return True
+    Raises:
+        ValueError:
+            If the language is unknown or a token list holds an invalid
+            entry.
 
+    """
+    if language != "default" and language not in _language_tokens:
+        raise ValueError(f"Unknown language {language!r}")
+    write_token_set(_resolve_tokens(language), filename)
 
-def load_language_from_json(language: str, filename: str) -> bool:
+
+def load_language_from_model(language: str, filename: str) -> bool:
     """
-    Load a custom language token set from a JSON file.
+    Load a language token set from a binary model file.
+
+    The file, written by `save_language`, is memory-mapped and its token
+    lists are decoded from flat UTF-8 blobs into new strings, which is
+    faster than parsing JSON.
 
     Args:
         language:
             The name of the language to load.
         filename:
-            The path to the JSON file containing the token set.
+            The path to the model file containing the token set.
 
     Returns:
         bool:
@@ -206,14 +176,31 @@ def load_language_from_json(language: str, filename: str) -> bool:
 
     """
     try:
-        with open(filename, encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, dict):
-            return False
-        _language_tokens[language] = data
-        return True
-    except (OSError, json.JSONDecodeError):
+        data = read_token_set(filename)
+        _install_language(language, data, filename)
+    except (OSError, TypeError, ValueError):
         return False
+    return True
+
+
+def preload(languages: Iterable[str] | None = None) -> None:
+    """
+    Parse language token sets ahead of their first use.
+
+    Languages are parsed the first time a pattern uses them. Long-running
+    processes, such as servers, can parse them at startup instead.
+
+    Args:
+        languages:
+            The languages to parse, or None for every bundled language and
+            every language loaded from a file.
+
+    Raises:
+        KeyError:
+            If one of the languages is unknown.
+
+    """
+    _language_tokens.preload(languages)
 
 
 def set_token(key: str, tokens: list[str]) -> None:
@@ -224,10 +211,13 @@ def set_token(key: str, tokens: list[str]) -> None:
         key:
             The key for which to set the token list.
         tokens:
-            The list of tokens (strings) to associate with the key.
+            The list of tokens (strings) to associate with the key. A token
+            can be given as a [token, weight] pair to draw it in proportion
+            to its weight; plain tokens have weight 1.
 
     """
     _token_map[key] = tokens
+    _invalidate_compiled("default")
 
 
 def set_tokens(tokens: dict[str, list[str]]) -> None:
@@ -237,20 +227,256 @@ def set_tokens(tokens: dict[str, list[str]]) -> None:
     Args:
         tokens:
             A map where each key is a character and the value is a list of
-            strings (tokens).
+            strings (tokens) or [token, weight] pairs.
 
     """
     _token_map.update(tokens)
+    _invalidate_compiled("default")
+
+
+def _resolve_tokens(language: str) -> dict[str, list[str]]:
+    """
+    Return the token map used by the given language.
+
+    Args:
+        language:
+            The language token set to use.
+
+    Returns:
+        dict[str, list[str]]:
+            The token map, which is empty for unknown languages.
+
+    """
+    if language == "default":
+        return _token_map
+    return _language_tokens.get(language, {})
+
+
+def compile(  # noqa: A001
+    pattern: str,
+    language: str = "default",
+) -> CompiledPattern:
+    """
+    Compile a pattern for repeated generation.
+
+    The pattern is parsed once and its token lists are resolved immediately,
+    so changes made afterwards with `set_token`, `set_tokens` or
+    `load_language_from_json` do not affect the compiled pattern.
+
+    Args:
+        pattern (str):
+            The pattern defining the structure of the name.
+        language (str):
+            The language token set to use ("default" or "elvish").
+
+    Returns:
+        CompiledPattern:
+            The compiled pattern, whose `generate()` method produces names.
+
+    """
+    version = _token_versions.get(language, 0)
+    return CompiledPattern(
+        pattern,
+        _resolve_tokens(language),
+        language,
+        junctions=partial(_language_junction_table, language, version),
+    )
+
+
+def _language_junction_table(language: str, version: int) -> JunctionTable | None:
+    """
+    Return the junction table of a language, building it if needed.
+
+    Args:
+        language:
+            The name of the language.
+        version:
+            The version of its token set the caller was compiled against.
+
+    Returns:
+        JunctionTable | None:
+            The table shared by the patterns of the language, or None if
+            the token set changed since the caller was compiled.
+
+    """
+    if _token_versions.get(language, 0) != version:
+        return None
+    junctions = _language_junctions.get(language)
+    if junctions is None:
+        built = JunctionTable(_resolve_tokens(language))
+        junctions = _language_junctions.setdefault(language, built)
+        if junctions is built:
+            _language_tokens.charge(language, estimate_size(junctions, _SHARED))
+    return junctions
+
+
+def _invalidate_compiled(language: str) -> None:
+    """
+    Discard the compiled patterns and junction table of a language after a
+    change to its token set or its eviction.
+
+    Args:
+        language:
+            The name of the language.
+
+    """
+    _pattern_cache.discard(lambda key: cast("tuple", key)[1] == language)
+    _language_junctions.pop(language, None)
+    _token_versions[language] = _token_versions.get(language, 0) + 1
+
+
+def _release_compiled(key: Hashable, size: int) -> None:
+    """
+    Release the size of a compiled pattern removed from the cache.
+
+    Args:
+        key:
+            The cache key of the pattern.
+        size:
+            The size charged for it.
+
+    """
+    _, language, version = cast("tuple[str, str, int]", key)
+    if _token_versions.get(language, 0) == version:
+        _language_tokens.charge(language, -size)
+
+
+def _get_compiled(pattern: str, language: str) -> CompiledPattern:
+    """
+    Return the compiled form of a pattern, compiling it on a cache miss.
+
+    Args:
+        pattern:
+            The pattern defining the structure of the name.
+        language:
+            The language token set to use.
+
+    Returns:
+        CompiledPattern:
+            The compiled pattern.
+
+    """
+    key = (pattern, language, _token_versions.get(language, 0))
+    entry = _pattern_cache.get(key)
+    if entry is None:
+        compiled = compile(pattern, language)
+        size = estimate_size(compiled, _SHARED)
+        _language_tokens.charge(language, size)
+        _pattern_cache.put(key, (compiled, size))
+        return compiled
+    _language_tokens.touch(language)
+    return entry[0]
+
+
+def _make_rng(
+    seed: int | None,
+    rng: random.Random | None,
+) -> random.Random | None:
+    """
+    Return the random generator for a call given its seed and rng arguments.
+
+    Args:
+        seed:
+            The seed for random number generation, if any.
+        rng:
+            The random generator supplied by the caller, if any.
+
+    Returns:
+        random.Random | None:
+            A private generator for seeded calls, the caller's generator, or
+            None to use the global `random` module.
+
+    Raises:
+        ValueError:
+            If both a seed and a random generator are given.
+
+    """
+    if seed is None:
+        return rng
+    if rng is not None:
+        raise ValueError("Specify either seed or rng, not both.")
+    return random.Random(seed)
+
+
+def cache_info() -> CacheInfo:
+    """
+    Report statistics about the compiled pattern cache.
+
+    Returns:
+        CacheInfo:
+            The hit, miss and eviction counters and the cache sizes.
+
+    """
+    return _pattern_cache.info()
+
+
+def cache_clear() -> None:
+    """
+    Empty the compiled pattern cache and reset its statistics.
+    """
+    _pattern_cache.clear()
+
+
+def set_cache_maxsize(maxsize: int) -> None:
+    """
+    Change the number of compiled patterns kept by the cache.
+
+    Args:
+        maxsize:
+            The maximum number of compiled patterns. A size of 0 disables the
+            cache.
+
+    """
+    _pattern_cache.resize(maxsize)
+
+
+def language_info() -> RegistryInfo:
+    """
+    Report statistics about the language token sets in memory.
+
+    Returns:
+        RegistryInfo:
+            The number of loaded languages, the eviction counter, and the
+            memory used and allowed.
+
+    """
+    return _language_tokens.info()
+
+
+def set_language_budget(max_bytes: int | None) -> None:
+    """
+    Bound the memory held by language token sets.
+
+    Once the estimated size of the token sets in memory, with their
+    junction tables and compiled patterns, exceeds the budget, the least
+    recently used ones are evicted along with that data and parsed again
+    from their file on their next use. Token sets set directly, without a file, are
+    never evicted.
+
+    Args:
+        max_bytes:
+            The budget in bytes, or None for no budget.
+
+    Raises:
+        ValueError:
+            If max_bytes is negative.
+
+    """
+    _language_tokens.resize(max_bytes)
 
 
 def generate(
     pattern: str,
     seed: int | None = None,
     language: str = "default",
+    rng: random.Random | None = None,
 ) -> str:
     """
     Generate a random name based on the provided pattern and seed.
 
+    Seeded calls draw from a private generator, so they do not disturb the
+    global `random` state and can safely run concurrently.
+
     Args:
         pattern (str):
             The pattern defining the structure of the name.
@@ -258,21 +484,116 @@ def generate(
             The seed for random number generation.
         language (str):
             The language token set to use ("default" or "elvish").
+        rng (random.Random | None):
+            The random generator to draw from. If neither seed nor rng is
+            given, the global `random` module is used.
 
     Returns:
         str:
             The generated name.
 
+    Raises:
+        ValueError:
+            If both seed and rng are given.
+
     """
-    # If a seed is provided, seed the random generator.
-    if seed is not None:
-        random.seed(seed)
-    options = _OptionT(language=language)
-    buffer: list[str] = []
-    for c in pattern:
-        if not _process_character(options, buffer, c):
-            return ""
-    return "".join(buffer)
+    return _get_compiled(pattern, language).generate(_make_rng(seed, rng))
+
+
+def _make_source(
+    compiled: CompiledPattern,
+    min_length: int | None,
+    max_length: int | None,
+    starts_with: str | None,
+    ends_with: str | None,
+    contains: str | None,
+) -> CompiledPattern | ConstrainedSampler | None:
+    """
+    Return the object drawing candidate names for the given constraints.
+
+    Length and character constraints are satisfied by construction rather
+    than filtered, using a ConstrainedSampler when any of them is set.
+
+    Args:
+        compiled:
+            The compiled pattern to draw from.
+        min_length:
+            Minimum length constraint, or None.
+        max_length:
+            Maximum length constraint, or None.
+        starts_with:
+            Required prefix, or None.
+        ends_with:
+            Required suffix, or None.
+        contains:
+            Required substring, or None.
+
+    Returns:
+        CompiledPattern | ConstrainedSampler | None:
+            The compiled pattern itself when there are no constraints, a
+            sampler otherwise, or None (after issuing a RuntimeWarning) if no
+            name of the pattern satisfies the constraints.
+
+    """
+    constraints = (min_length, max_length, starts_with, ends_with, contains)
+    if all(constraint is None for constraint in constraints):
+        return compiled
+    sampler = ConstrainedSampler(
+        compiled,
+        min_length=min_length,
+        max_length=max_length,
+        starts_with=starts_with,
+        ends_with=ends_with,
+        contains=contains,
+    )
+    if sampler.probability == 0.0:
+        warnings.warn(
+            f"No name of pattern {compiled.pattern!r} satisfies the length and "
+            "character constraints.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        return None
+    return sampler
+
+
+def _make_seen(
+    source: CompiledPattern | ConstrainedSampler,
+    count: int | None,
+    unique_error_rate: float | None,
+) -> SeenSet | BloomFilter:
+    """
+    Create the record used to keep names unique.
+
+    Args:
+        source:
+            The object drawing candidate names.
+        count:
+            The number of names requested, or None for an unbounded stream.
+        unique_error_rate:
+            If given, the false-positive rate of a Bloom filter used instead
+            of an exact set.
+
+    Returns:
+        SeenSet | BloomFilter:
+            The record of seen names.
+
+    Raises:
+        ValueError:
+            If more unique names are requested than the pattern can produce,
+            or if a Bloom filter is requested for an unbounded stream.
+
+    """
+    if count is not None and count > source.space_size:
+        raise ValueError(
+            f"Cannot generate {count} unique names: the pattern and constraints "
+            f"allow at most {source.space_size}."
+        )
+    if unique_error_rate is None:
+        return SeenSet()
+    if count is None:
+        raise ValueError("A Bloom filter needs a bounded number of names.")
+    return BloomFilter(count, unique_error_rate)
 
 
 def generate_batch(
@@ -286,18 +607,33 @@ def generate_batch(
     ends_with: str | None = None,
     contains: str | None = None,
     min_pronounceability: float | None = None,
+    rng: random.Random | None = None,
+    engine: str = "python",
+    unique: bool = False,
+    unique_error_rate: float | None = None,
+    stats: GenerationStats | None = None,
+    max_attempts: int | None = None,
+    timeout: float | None = None,
+    prune_junctions: bool = False,
 ) -> list[str]:
     """
     Generate multiple names using the given pattern.
 
+    Candidates are drawn until enough names are accepted or the attempt
+    budget runs out. The budget adapts to the acceptance rate: it keeps
+    growing while candidates are accepted, and the call gives up with a
+    RuntimeWarning once `count` candidates in a row, and at least 1000, are
+    rejected, as happens when the constraints cannot be met or the unique
+    names run out. `max_attempts` and `timeout` bound it further.
+
     Args:
         pattern:
             The pattern to use for generation.
         count:
             Number of names to generate.
         seed:
-            Optional seed for reproducibility. If provided, each name uses seed
-            + i.
+            Optional seed for reproducibility. The names are drawn in sequence
+            from a private generator seeded with it.
         language:
             The language token set to use ("default" or "elvish").
         min_length:
@@ -313,57 +649,521 @@ def generate_batch(
         min_pronounceability:
             Minimum pronounceability score (0.0-1.0) for generated names.
             If None, no pronounceability filtering is applied.
+        rng:
+            The random generator to draw from. If neither seed nor rng is
+            given, the global `random` module is used.
+        engine:
+            The generation engine, "python" or "numpy". The NumPy engine
+            draws whole batches at once and follows its own random stream.
+            It falls back to the Python engine when NumPy is not installed.
+        unique:
+            Whether the returned names must be distinct.
+        unique_error_rate:
+            With unique, track the names in a Bloom filter with this
+            false-positive rate instead of an exact set. This bounds memory
+            for very large counts, at the cost of occasionally skipping a
+            valid name; duplicates are still never returned.
+        stats:
+            If given, the attempts, rejections, token draws, timings and
+            name lengths of the call are added to it.
+        max_attempts:
+            Maximum number of candidate names to draw. If None, only the
+            adaptive budget and the timeout bound them.
+        timeout:
+            Number of seconds after which to return the names accepted so
+            far, for callers bound by latency. If None, there is no time
+            limit.
+        prune_junctions:
+            With min_pronounceability, draw each token among those forming
+            no penalized consonant cluster with the text before it, so fewer
+            candidates are rejected. Names with a penalized junction are
+            then never returned, even when they meet the threshold. Only the
+            Python engine prunes, and only without length or character
+            constraints.
 
     Returns:
         list[str]:
             List of generated names that meet all specified constraints.
-            May return fewer than 'count' names if constraints cannot be satisfied
-            within reasonable attempts (to prevent infinite loops).
+            May return fewer than 'count' names if the attempt budget or
+            the timeout runs out. Length and character constraints are met
+            on the first draw; if no name of the pattern satisfies them, a
+            RuntimeWarning is issued and an empty list is returned.
+
+    Raises:
+        ValueError:
+            If both seed and rng are given, if the engine is unknown, if
+            max_attempts or timeout is negative, or if more unique names
+            are requested than the pattern can produce.
 
     Note:
         If character constraints are incompatible with the pattern or token set,
-        the function may return fewer names than requested or an empty list.
-        For example, requiring names to start with 'X' when the pattern generates
-        names starting with syllables that never begin with 'X'.
-    """
-    # If a seed is provided, seed the random generator.
-    if seed is not None:
-        random.seed(seed)
-    names = []
+        the function returns an empty list. For example, requiring names to
+        start with 'X' when the pattern generates names starting with syllables
+        that never begin with 'X'.
+    """
+    if engine not in ("python", "numpy"):
+        raise ValueError(f"Unknown engine {engine!r}, expected 'python' or 'numpy'.")
+    if seed is not None and rng is not None:
+        raise ValueError("Specify either seed or rng, not both.")
+    budget = AttemptBudget(max_attempts, timeout, max(STALL_WINDOW, count))
+    compiled = _get_compiled(pattern, language)
+    source = _make_source(
+        compiled, min_length, max_length, starts_with, ends_with, contains
+    )
+    if source is None:
+        return []
+    seen = _make_seen(source, count, unique_error_rate) if unique else None
+    if engine == "numpy" and vectorized.is_available():
+        names = vectorized.generate_batch(
+            compiled,
+            count,
+            seed=seed,
+            rng=rng,
+            min_length=min_length,
+            max_length=max_length,
+            starts_with=starts_with,
+            ends_with=ends_with,
+            contains=contains,
+            min_pronounceability=min_pronounceability,
+            seen=seen,
+            stats=stats,
+            budget=budget,
+        )
+    else:
+        names = list(
+            _iter_filtered(
+                _draw_function(source, min_pronounceability, prune_junctions),
+                _make_rng(seed, rng),
+                min_pronounceability,
+                seen,
+                count,
+                budget,
+                stats,
+            )
+        )
+    if budget.stalled:
+        warnings.warn(
+            f"Gave up on pattern {compiled.pattern!r} after {budget.attempts} "
+            f"attempts with {len(names)} of {count} names: none of the last "
+            f"{budget.stall_window} candidates met the pronounceability or "
+            "uniqueness constraints.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    return names
+
+
+def iter_names(
+    pattern: str,
+    seed: int | None = None,
+    language: str = "default",
+    min_length: int | None = None,
+    max_length: int | None = None,
+    starts_with: str | None = None,
+    ends_with: str | None = None,
+    contains: str | None = None,
+    min_pronounceability: float | None = None,
+    rng: random.Random | None = None,
+    limit: int | None = None,
+    chunk_size: int | None = None,
+    max_attempts: int | None = None,
+    unique: bool = False,
+    unique_error_rate: float | None = None,
+    stats: GenerationStats | None = None,
+    prune_junctions: bool = False,
+) -> Iterator[str] | Iterator[list[str]]:
+    """
+    Lazily generate names satisfying the same constraints as generate_batch.
+
+    Names are produced on demand, so memory use does not grow with the number
+    of names pulled. For the same seed and constraints, the stream starts with
+    the names returned by `generate_batch`.
+
+    Args:
+        pattern:
+            The pattern to use for generation.
+        seed:
+            Optional seed for reproducibility.
+        language:
+            The language token set to use.
+        min_length:
+            Minimum length constraint for generated names. If None, no minimum.
+        max_length:
+            Maximum length constraint for generated names. If None, no maximum.
+        starts_with:
+            String that generated names must start with. If None, no restriction.
+        ends_with:
+            String that generated names must end with. If None, no restriction.
+        contains:
+            String that generated names must contain. If None, no restriction.
+        min_pronounceability:
+            Minimum pronounceability score (0.0-1.0) for generated names.
+            If None, no pronounceability filtering is applied.
+        rng:
+            The random generator to draw from. If neither seed nor rng is
+            given, the global `random` module is used.
+        limit:
+            Maximum number of names to produce. If None, the stream is
+            unbounded.
+        chunk_size:
+            If given, names are yielded in lists of up to this many names
+            instead of one at a time.
+        max_attempts:
+            Maximum number of candidate names to generate before stopping. If
+            None, only `limit` ends the stream, so an unsatisfiable
+            pronounceability threshold never yields.
+        unique:
+            Whether the produced names must be distinct. Memory then grows
+            with the number of names produced.
+        unique_error_rate:
+            With unique and a limit, track the names in a Bloom filter with
+            this false-positive rate instead of an exact set.
+        stats:
+            If given, the attempts, rejections, token draws, timings and
+            name lengths of the stream are added to it as names are pulled.
+        prune_junctions:
+            With min_pronounceability, avoid tokens forming a penalized
+            consonant cluster with the text before them, as for
+            `generate_batch`.
+
+    Returns:
+        Iterator[str] | Iterator[list[str]]:
+            An iterator over names, or over lists of names if chunk_size is
+            given.
+
+    Raises:
+        ValueError:
+            If both seed and rng are given, if chunk_size is not positive, or
+            if more unique names are requested than the pattern can produce.
+
+    """
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    compiled = _get_compiled(pattern, language)
+    rng = _make_rng(seed, rng)
+    source = _make_source(
+        compiled, min_length, max_length, starts_with, ends_with, contains
+    )
+    if source is None:
+        return iter(())
+    seen = _make_seen(source, limit, unique_error_rate) if unique else None
+    budget = None
+    if max_attempts is not None:
+        budget = AttemptBudget(max_attempts, stall_window=None)
+    names = _iter_filtered(
+        _draw_function(source, min_pronounceability, prune_junctions),
+        rng,
+        min_pronounceability,
+        seen,
+        limit,
+        budget,
+        stats,
+    )
+    if chunk_size is None:
+        return names
+    return _iter_chunks(names, chunk_size)
+
+
+def _draw_function(
+    source: CompiledPattern | ConstrainedSampler,
+    min_pronounceability: float | None,
+    prune_junctions: bool,
+) -> Callable[[random.Random | None], str]:
+    """
+    Return the method drawing one name from a source.
+
+    Args:
+        source:
+            The compiled pattern or sampler.
+        min_pronounceability:
+            Minimum pronounceability score, or None.
+        prune_junctions:
+            Whether compiled patterns avoid drawing tokens that form
+            penalized clusters with the text before them, when there is a
+            threshold.
+
+    Returns:
+        Callable[[random.Random | None], str]:
+            The bound draw method.
+
+    """
+    if isinstance(source, CompiledPattern):
+        if prune_junctions and min_pronounceability is not None:
+            return source.generate_pronounceable
+        return source.generate
+    return source.sample
+
+
+def _instrument(draw: Callable[..., str], stats: GenerationStats) -> tuple[
+    Callable[[random.Random | None], str],
+    Callable[[str], float],
+    Callable[[str], None],
+    Callable[[str], None],
+]:
+    """
+    Build the hooks of `_iter_filtered` that record statistics.
+
+    Args:
+        draw:
+            The function drawing candidate names, accepting the `draws`
+            keyword argument.
+        stats:
+            The statistics to update.
+
+    Returns:
+        tuple:
+            The timed draw and scoring functions, and the functions called
+            with the reason of each rejection and with each accepted name.
+
+    """
+    clock = time.perf_counter
+    draws = stats.token_draws
+
+    def timed_draw(rng: random.Random | None) -> str:
+        start = clock()
+        name = draw(rng, draws=draws)
+        stats.generation_seconds += clock() - start
+        stats.attempts += 1
+        return name
+
+    def timed_score(name: str) -> float:
+        start = clock()
+        score = score_pronounceability(name)
+        stats.scoring_seconds += clock() - start
+        return score
+
+    def reject(reason: str) -> None:
+        stats.rejections[reason] += 1
+
+    def accept(name: str) -> None:
+        stats.accepted += 1
+        stats.lengths[len(name)] += 1
+
+    return timed_draw, timed_score, reject, accept
+
+
+def _iter_filtered(
+    draw: Callable[..., str],
+    rng: random.Random | None,
+    min_pronounceability: float | None,
+    seen: SeenSet | BloomFilter | None,
+    limit: int | None,
+    budget: AttemptBudget | None,
+    stats: GenerationStats | None = None,
+) -> Iterator[str]:
+    """
+    Yield drawn names that pass the pronounceability filter.
+
+    Args:
+        draw:
+            The function drawing candidate names, accepting the `draws`
+            keyword argument when statistics are recorded.
+        rng:
+            The random generator to draw from.
+        min_pronounceability:
+            Minimum pronounceability score, or None.
+        seen:
+            The record of names already yielded when names must be unique,
+            or None.
+        limit:
+            Maximum number of names to yield, or None.
+        budget:
+            The budget bounding the number of candidates drawn, or None.
+        stats:
+            The statistics to update, or None.
+
+    Yields:
+        str:
+            The accepted names.
+
+    """
+    score: Callable[[str], float] = score_pronounceability
+    reject: Callable[[str], None] | None = None
+    accept: Callable[[str], None] | None = None
+    if stats is not None:
+        draw, score, reject, accept = _instrument(draw, stats)
+    produced = 0
     attempts = 0
-    max_attempts = count * 10  # Prevent infinite loops
-    while len(names) < count and attempts < max_attempts:
-        # We already seeded the random generator above.
-        name = generate(pattern, None, language)
-        
-        # Check constraints with fail-early pattern
-        name_len = len(name)
-        
-        # Length constraints
-        min_violated = min_length is not None and name_len < min_length
-        max_violated = max_length is not None and name_len > max_length
-        if min_violated or max_violated:
-            attempts += 1
-            continue
-        
-        # Character constraints
-        if starts_with is not None and not name.startswith(starts_with):
-            attempts += 1
-            continue
-        if ends_with is not None and not name.endswith(ends_with):
-            attempts += 1
-            continue
-        if contains is not None and contains not in name:
-            attempts += 1
+    next_check = None if budget is None else budget.next_check
+    while limit is None or produced < limit:
+        # next_check is only reached when there is a budget.
+        if attempts == next_check and budget is not None:
+            if not budget.allows(attempts, produced):
+                return
+            next_check = budget.next_check
+        name = draw(rng)
+        attempts += 1
+        if min_pronounceability is not None and score(name) < min_pronounceability:
+            if reject is not None:
+                reject("pronounceability")
             continue
-        
-        # Pronounceability constraint
-        if min_pronounceability is not None and \
-           score_pronounceability(name) < min_pronounceability:
-            attempts += 1
+        if seen is not None and not seen.add(name):
+            if reject is not None:
+                reject("duplicate")
             continue
-        
-        # All constraints passed
-        names.append(name)
-        attempts += 1
-    return names
+        if accept is not None:
+            accept(name)
+        produced += 1
+        yield name
+
+
+def _iter_chunks(names: Iterator[str], chunk_size: int) -> Iterator[list[str]]:
+    """
+    Group a stream of names into lists.
+
+    Args:
+        names:
+            The names to group.
+        chunk_size:
+            The maximum number of names per list.
+
+    Yields:
+        list[str]:
+            The next chunk of names; only the last one may be shorter.
+
+    """
+    while chunk := list(islice(names, chunk_size)):
+        yield chunk
+
+
+def pattern_space_size(
+    pattern: str,
+    language: str = "default",
+    min_length: int | None = None,
+    max_length: int | None = None,
+    starts_with: str | None = None,
+    ends_with: str | None = None,
+    contains: str | None = None,
+) -> int:
+    """
+    Count the combinations of token and group choices of a pattern.
+
+    This is an upper bound on the number of distinct names the pattern can
+    produce, since different combinations may spell the same name. With
+    length or character constraints, only the combinations satisfying them
+    are counted.
+
+    Args:
+        pattern:
+            The pattern defining the structure of the name.
+        language:
+            The language token set to use.
+        min_length:
+            Minimum length of the names, or None.
+        max_length:
+            Maximum length of the names, or None.
+        starts_with:
+            String that the names must start with, or None.
+        ends_with:
+            String that the names must end with, or None.
+        contains:
+            String that the names must contain, or None.
+
+    Returns:
+        int:
+            The size of the pattern's output space, 0 (after issuing a
+            RuntimeWarning) if no name satisfies the constraints.
+
+    """
+    source = _make_source(
+        _get_compiled(pattern, language),
+        min_length,
+        max_length,
+        starts_with,
+        ends_with,
+        contains,
+    )
+    return 0 if source is None else source.space_size
+
+
+def name_at(pattern: str, index: int, language: str = "default") -> str:
+    """
+    Return the name at a given rank of a pattern's output space.
+
+    Args:
+        pattern:
+            The pattern defining the structure of the name.
+        index:
+            The rank of the name, in range(pattern_space_size(pattern)).
+        language:
+            The language token set to use.
+
+    Returns:
+        str:
+            The name for that combination.
+
+    Raises:
+        IndexError:
+            If index is outside the output space.
+
+    """
+    return _get_compiled(pattern, language).name_at(index)
+
+
+def iter_unique(
+    pattern: str,
+    seed: int | None = None,
+    language: str = "default",
+    start: int = 0,
+    stop: int | None = None,
+) -> Iterator[str]:
+    """
+    Walk a pattern's distinct names in pseudo-random order without repeats.
+
+    The ranks of the output space are shuffled by a keyed Feistel
+    permutation, and position `i` of the stream yields the name at rank
+    `permutation(i)` only if no lower rank spells the same name, so each
+    name is yielded once, at its lowest rank. The stream needs constant
+    memory, and position `i` only depends on the seed, so disjoint
+    `start`/`stop` ranges can be generated on different nodes without
+    coordination. Since repeated spellings are skipped, a range may yield
+    fewer names than it has positions.
+
+    Args:
+        pattern:
+            The pattern defining the structure of the name.
+        seed:
+            The key of the permutation. If None, one is drawn from the global
+            `random` module.
+        language:
+            The language token set to use.
+        start:
+            The first position of the stream to produce.
+        stop:
+            The position at which to stop. If None, the whole output space is
+            walked.
+
+    Returns:
+        Iterator[str]:
+            An iterator over the distinct names.
+
+    """
+    compiled = _get_compiled(pattern, language)
+    if seed is None:
+        seed = random.getrandbits(64)
+    permutation = FeistelPermutation(compiled.space_size, seed)
+    stop = permutation.size if stop is None else min(stop, permutation.size)
+    return _iter_first_spellings(compiled, map(permutation, range(start, stop)))
+
+
+def _iter_first_spellings(
+    compiled: CompiledPattern, ranks: Iterator[int]
+) -> Iterator[str]:
+    """
+    Yield the names at the given ranks that no lower rank spells.
+
+    Args:
+        compiled:
+            The compiled pattern.
+        ranks:
+            The ranks to visit.
+
+    Yields:
+        str:
+            The name at each rank that is the lowest one spelling it.
+
+    """
+    for rank in ranks:
+        name = compiled.name_at(rank)
+        if compiled.rank_of(name) == rank:
+            yield name
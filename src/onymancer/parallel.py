@@ -0,0 +1,327 @@
+"""Multiprocess batch generation with deterministic seeding."""
+
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Any
+
+from . import namegen
+from .dedup import SeenSet
+from .stats import GenerationStats
+
+# Batches generated at most to replace the names shared between shards.
+_TOP_UP_ROUNDS = 10
+
+# Options of generate_batch that narrow the output space of the pattern.
+_SPACE_CONSTRAINTS = (
+    "min_length",
+    "max_length",
+    "starts_with",
+    "ends_with",
+    "contains",
+)
+
+
+def _derive_seed(seed: int, index: int) -> int:
+    """
+    Derive the seed of a shard from the batch seed and the shard index.
+
+    Args:
+        seed:
+            The seed of the whole batch.
+        index:
+            The index of the shard.
+
+    Returns:
+        int:
+            A 64-bit seed, independent for each shard.
+
+    """
+    digest = hashlib.blake2b(f"{seed}/{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _init_worker(
+    token_map: dict[str, list[str]],
+    language: str,
+    language_tokens: dict[str, list[str]] | None,
+) -> None:
+    """
+    Install the parent's token sets in a worker process.
+
+    Args:
+        token_map:
+            The default token map of the parent process.
+        language:
+            The language used by the batch.
+        language_tokens:
+            The token set of that language, or None for the default one.
+
+    """
+    # Workers mirror the module state of namegen in the parent process.
+    namegen._token_map.clear()  # noqa: SLF001
+    namegen._token_map.update(token_map)  # noqa: SLF001
+    if language_tokens is not None:
+        namegen._language_tokens[language] = language_tokens  # noqa: SLF001
+    namegen._invalidate_compiled("default")  # noqa: SLF001
+    namegen._invalidate_compiled(language)  # noqa: SLF001
+
+
+def _generate_shard(
+    pattern: str,
+    count: int,
+    seed: int,
+    language: str,
+    options: dict[str, Any],
+    collect_stats: bool = False,
+) -> tuple[list[str], GenerationStats | None]:
+    """
+    Generate the names of a single shard.
+
+    Args:
+        pattern:
+            The pattern to use for generation.
+        count:
+            Number of names in the shard.
+        seed:
+            The seed of the shard.
+        language:
+            The language token set to use.
+        options:
+            Constraint and engine keyword arguments for `generate_batch`.
+        collect_stats:
+            Whether to collect generation statistics for the shard.
+
+    Returns:
+        tuple[list[str], GenerationStats | None]:
+            The names of the shard, and its statistics if collected. They are
+            returned rather than filled in place since a worker process only
+            receives a copy of the caller's objects.
+
+    """
+    stats = GenerationStats() if collect_stats else None
+    names = namegen.generate_batch(
+        pattern, count, seed=seed, language=language, stats=stats, **options
+    )
+    return names, stats
+
+
+def _join(
+    shards: list[tuple[list[str], GenerationStats | None]],
+    stats: GenerationStats | None,
+) -> list[str]:
+    """
+    Concatenate the names of several shards and merge their statistics.
+
+    Args:
+        shards:
+            The names and statistics of each shard.
+        stats:
+            If given, receives the statistics of the shards.
+
+    Returns:
+        list[str]:
+            The names of all the shards, in order.
+
+    """
+    names = []
+    for shard, shard_stats in shards:
+        names.extend(shard)
+        if stats is not None and shard_stats is not None:
+            stats.merge(shard_stats)
+    return names
+
+
+def _keep_unseen(
+    names: list[str],
+    seen: SeenSet,
+    stats: GenerationStats | None,
+) -> list[str]:
+    """
+    Drop the names already produced by another shard.
+
+    Args:
+        names:
+            The names of a shard.
+        seen:
+            The names kept so far, updated with the new ones.
+        stats:
+            If given, the dropped names are moved from the accepted names
+            to the duplicate rejections.
+
+    Returns:
+        list[str]:
+            The names not seen before, in order.
+
+    """
+    kept = []
+    for name in names:
+        if seen.add(name):
+            kept.append(name)
+        elif stats is not None:
+            stats.accepted -= 1
+            stats.lengths[len(name)] -= 1
+            stats.rejections["duplicate"] += 1
+    return kept
+
+
+def _unique_space(
+    pattern: str, count: int, language: str, options: dict[str, Any]
+) -> int:
+    """
+    Count the unique names a batch can hold, checking that count fits.
+
+    Args:
+        pattern:
+            The pattern to use for generation.
+        count:
+            Number of names requested.
+        language:
+            The language token set to use.
+        options:
+            The keyword arguments given to `generate_batch`.
+
+    Returns:
+        int:
+            The size of the output space under the constraints of options,
+            0 (after issuing a RuntimeWarning) if no name satisfies them.
+
+    Raises:
+        ValueError:
+            If more unique names are requested than the pattern can produce.
+
+    """
+    space = namegen.pattern_space_size(
+        pattern,
+        language,
+        **{
+            name: value for name, value in options.items() if name in _SPACE_CONSTRAINTS
+        },
+    )
+    if 0 < space < count:
+        raise ValueError(
+            f"Cannot generate {count} unique names: the pattern and constraints "
+            f"allow at most {space}."
+        )
+    return space
+
+
+def generate_parallel(
+    pattern: str,
+    count: int,
+    seed: int | None = None,
+    language: str = "default",
+    workers: int | None = None,
+    chunk_size: int = 10_000,
+    mp_context: BaseContext | None = None,
+    **options: Any,
+) -> list[str]:
+    """
+    Generate names across several processes.
+
+    The count is split into shards of `chunk_size` names, and each shard is
+    generated with a seed derived from the batch seed and its index. The
+    result therefore only depends on the seed and the chunk size, never on
+    the number of workers. The token sets in use, including languages loaded
+    with `load_language_from_json`, are sent once to each worker.
+
+    Args:
+        pattern:
+            The pattern to use for generation.
+        count:
+            Number of names to generate.
+        seed:
+            Optional seed for reproducibility. If None, one is drawn from the
+            global `random` module.
+        language:
+            The language token set to use.
+        workers:
+            Number of worker processes. If None, the number of CPUs is used.
+            With a single worker the shards are generated in this process.
+        chunk_size:
+            Number of names generated per shard.
+        mp_context:
+            Optional multiprocessing context used to start the workers.
+        **options:
+            Constraint keyword arguments accepted by `generate_batch`, such
+            as `min_length`, `starts_with`, `min_pronounceability` or
+            `engine`. A `stats` object receives the counters of every shard.
+
+    Returns:
+        list[str]:
+            List of generated names, in shard order. Like `generate_batch`,
+            it may hold fewer than 'count' names if the constraints cannot be
+            satisfied. With `unique`, names already produced by an earlier
+            shard are dropped, and replaced by names generated afterwards in
+            this process from further derived seeds.
+
+    Raises:
+        ValueError:
+            If chunk_size or workers is not positive, or if more unique
+            names are requested than the pattern can produce.
+
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError(f"workers must be positive, got {workers}")
+    if seed is None:
+        seed = random.getrandbits(64)
+    stats: GenerationStats | None = options.pop("stats", None)
+    collect_stats = stats is not None
+    # Check that enough unique names exist before starting the workers.
+    if options.get("unique") and _unique_space(pattern, count, language, options) == 0:
+        return []
+    sizes = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    seeds = [_derive_seed(seed, index) for index in range(len(sizes))]
+    if workers == 1 or len(sizes) <= 1:
+        shards = [
+            _generate_shard(pattern, size, shard_seed, language, options, collect_stats)
+            for size, shard_seed in zip(sizes, seeds, strict=True)
+        ]
+    else:
+        language_tokens = None
+        if language != "default":
+            language_tokens = namegen._language_tokens.get(language)  # noqa: SLF001
+        token_map = dict(namegen._token_map)  # noqa: SLF001
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(sizes)),
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(token_map, language, language_tokens),
+        ) as executor:
+            shards = list(
+                executor.map(
+                    _generate_shard,
+                    [pattern] * len(sizes),
+                    sizes,
+                    seeds,
+                    [language] * len(sizes),
+                    [options] * len(sizes),
+                    [collect_stats] * len(sizes),
+                )
+            )
+    if not options.get("unique"):
+        return _join(shards, stats)
+    # Shards are unique on their own but may share names with each other.
+    seen = SeenSet()
+    names = _keep_unseen(_join(shards, stats), seen, stats)
+    index = len(sizes)
+    for _ in range(_TOP_UP_ROUNDS):
+        if len(names) == count:
+            break
+        extra = _generate_shard(
+            pattern,
+            count - len(names),
+            _derive_seed(seed, index),
+            language,
+            options,
+            collect_stats,
+        )
+        names.extend(_keep_unseen(_join([extra], stats), seen, stats))
+        index += 1
+    return names
@@ -0,0 +1,845 @@
+"""Compiled pattern representation for the name generator."""
+
+import random
+from collections import Counter
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from . import pronounceability
+from .alias import AliasTable, split_weights
+from .junctions import JunctionTable
+
+
+@dataclass(frozen=True, slots=True)
+class _Literal:
+    """
+    Node that emits a fixed piece of text.
+
+    Attributes:
+        text (str):
+            The text to emit.
+
+    """
+
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class _Token:
+    """
+    Node that emits one token drawn from a token list.
+
+    Attributes:
+        key (str):
+            The pattern character the token list was resolved from.
+        tokens (tuple[str, ...]):
+            The candidate tokens, already capitalized if requested.
+        originals (tuple[str, ...]):
+            The candidate tokens as written in the token set, keying the
+            token draw counters.
+        weights (tuple[float, ...] | None):
+            The weight of each token, or None if they are drawn uniformly.
+        alias (AliasTable | None):
+            The alias table drawing tokens by weight, or None.
+
+    """
+
+    key: str
+    tokens: tuple[str, ...]
+    originals: tuple[str, ...]
+    weights: tuple[float, ...] | None = None
+    alias: AliasTable | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _Choice:
+    """
+    Node that picks one of several branches uniformly and emits it.
+
+    Attributes:
+        branches (tuple[tuple[_Node, ...], ...]):
+            The node sequences to choose from, one per group option.
+
+    """
+
+    branches: "tuple[tuple[_Node, ...], ...]"
+
+
+_Node = _Literal | _Token | _Choice
+
+# Compile-time state: (emit_literal, capitalize).
+_State = tuple[bool, bool]
+
+
+def _emit(nodes: tuple[_Node, ...], rng, buffer: list[str]) -> None:
+    """
+    Emit a sequence of compiled nodes into the buffer.
+
+    Args:
+        nodes:
+            The nodes to emit.
+        rng:
+            The random generator, or the `random` module, to draw from.
+        buffer:
+            The string buffer where the output is appended.
+
+    """
+    choice = rng.choice
+    for node in nodes:
+        if isinstance(node, _Token):
+            if node.alias is None:
+                buffer.append(choice(node.tokens))
+            else:
+                buffer.append(node.tokens[node.alias.draw(rng)])
+        elif isinstance(node, _Literal):
+            buffer.append(node.text)
+        else:
+            _emit(choice(node.branches), rng, buffer)
+
+
+def _emit_counted(
+    nodes: tuple[_Node, ...],
+    rng,
+    buffer: list[str],
+    draws: dict[str, Counter],
+) -> None:
+    """
+    Emit a sequence of compiled nodes, counting the tokens drawn.
+
+    This is `_emit` with instrumentation, kept apart so that generation
+    without it pays nothing. Both draw the same names for the same random
+    state.
+
+    Args:
+        nodes:
+            The nodes to emit.
+        rng:
+            The random generator, or the `random` module, to draw from.
+        buffer:
+            The string buffer where the output is appended.
+        draws:
+            The number of times each token is drawn, per class, updated in
+            place. Tokens are counted as written in the token set, whether
+            or not they were capitalized.
+
+    """
+    choice = rng.choice
+    # randrange(n) consumes the random state like choice on n tokens.
+    randrange = rng.randrange
+    for node in nodes:
+        if isinstance(node, _Token):
+            if node.alias is None:
+                index = randrange(len(node.tokens))
+            else:
+                index = node.alias.draw(rng)
+            buffer.append(node.tokens[index])
+            draws[node.key][node.originals[index]] += 1
+        elif isinstance(node, _Literal):
+            buffer.append(node.text)
+        else:
+            _emit_counted(choice(node.branches), rng, buffer, draws)
+
+
+def _emit_smooth(
+    nodes: tuple[_Node, ...],
+    rng,
+    buffer: list[str],
+    junctions: JunctionTable,
+    ending: str,
+    draws: dict[str, Counter] | None = None,
+) -> str:
+    """
+    Emit a sequence of compiled nodes, avoiding penalized junctions.
+
+    Each token is drawn among the tokens that do not form a penalized
+    consonant cluster with the text emitted before it.
+
+    Args:
+        nodes:
+            The nodes to emit.
+        rng:
+            The random generator, or the `random` module, to draw from.
+        buffer:
+            The string buffer where the output is appended.
+        junctions:
+            The junction table of the pattern's tokens.
+        ending:
+            The consonants at the end of the text emitted so far.
+        draws:
+            If given, the number of times each token is drawn, per class,
+            is counted in it, as written in the token set.
+
+    Returns:
+        str:
+            The consonants at the end of the text after the sequence.
+
+    """
+    choice = rng.choice
+    randrange = rng.randrange
+    shape = junctions.shape
+    successors = junctions.successors
+    for node in nodes:
+        if isinstance(node, _Token):
+            fitting = successors(node.key, ending) if ending else None
+            if fitting is None:
+                if node.alias is None:
+                    index = randrange(len(node.tokens))
+                else:
+                    index = node.alias.draw(rng)
+            elif node.alias is None:
+                index = choice(fitting)
+            else:
+                alias = junctions.alias(node.key, ending)
+                index = fitting[alias.draw(rng)]
+            text = node.tokens[index]
+            if draws is not None:
+                draws[node.key][node.originals[index]] += 1
+        elif isinstance(node, _Literal):
+            text = node.text
+        else:
+            ending = _emit_smooth(
+                choice(node.branches), rng, buffer, junctions, ending, draws
+            )
+            continue
+        buffer.append(text)
+        lead, trail = shape(text)
+        ending = ending + lead if trail is None else trail
+    return ending
+
+
+def _token_lists(
+    nodes: tuple[_Node, ...],
+    lists: dict[str, list],
+) -> dict[str, list]:
+    """
+    Collect the token lists of a node sequence, keyed by class.
+
+    Args:
+        nodes:
+            The nodes to visit.
+        lists:
+            The token lists collected so far.
+
+    Returns:
+        dict[str, list]:
+            The updated token lists, with [token, weight] pairs for weighted
+            tokens.
+
+    """
+    for node in nodes:
+        if isinstance(node, _Token) and node.key not in lists:
+            if node.weights is None:
+                lists[node.key] = list(node.tokens)
+            else:
+                lists[node.key] = [
+                    [token, weight]
+                    for token, weight in zip(node.tokens, node.weights, strict=True)
+                ]
+        elif isinstance(node, _Choice):
+            for branch in node.branches:
+                _token_lists(branch, lists)
+    return lists
+
+
+def _count(nodes: tuple[_Node, ...], memo: dict[int, int]) -> int:
+    """
+    Count the distinct ways a node sequence can be generated.
+
+    Args:
+        nodes:
+            The nodes to count.
+        memo:
+            Counts of the sequences already visited, keyed by identity, since
+            branches may share their continuation.
+
+    Returns:
+        int:
+            The number of combinations of token and branch choices.
+
+    """
+    total = memo.get(id(nodes))
+    if total is None:
+        total = 1
+        for node in nodes:
+            if isinstance(node, _Token):
+                total *= len(node.tokens)
+            elif isinstance(node, _Choice):
+                total *= sum(_count(branch, memo) for branch in node.branches)
+        memo[id(nodes)] = total
+    return total
+
+
+def _unrank(
+    nodes: tuple[_Node, ...],
+    index: int,
+    memo: dict[int, int],
+    buffer: list[str],
+) -> None:
+    """
+    Emit the combination of a node sequence with the given rank.
+
+    Nodes are treated as the digits of a mixed-radix number, the first node
+    being the most significant one.
+
+    Args:
+        nodes:
+            The nodes to emit.
+        index:
+            The rank of the combination, in range(_count(nodes)).
+        memo:
+            Counts of the sequences already visited, keyed by identity.
+        buffer:
+            The string buffer where the output is appended.
+
+    """
+    sizes = []
+    for node in nodes:
+        if isinstance(node, _Token):
+            sizes.append(len(node.tokens))
+        elif isinstance(node, _Choice):
+            sizes.append(sum(_count(branch, memo) for branch in node.branches))
+        else:
+            sizes.append(1)
+    remaining = _count(nodes, memo)
+    for node, size in zip(nodes, sizes, strict=True):
+        remaining //= size
+        digit, index = divmod(index, remaining)
+        if isinstance(node, _Token):
+            buffer.append(node.tokens[digit])
+        elif isinstance(node, _Literal):
+            buffer.append(node.text)
+        else:
+            for branch in node.branches:
+                branch_size = _count(branch, memo)
+                if digit < branch_size:
+                    _unrank(branch, digit, memo, buffer)
+                    break
+                digit -= branch_size
+
+
+def _spellings(
+    nodes: tuple[_Node, ...],
+    name: str,
+    start: int,
+    memo: dict[int, int],
+) -> Iterator[tuple[int, int]]:
+    """
+    Find the combinations of a node sequence that spell part of a name.
+
+    Args:
+        nodes:
+            The nodes to match.
+        name:
+            The name to match against.
+        start:
+            The position in the name where the nodes' output must start.
+        memo:
+            Counts of the sequences already visited, keyed by identity.
+
+    Yields:
+        tuple[int, int]:
+            The rank of each combination whose output is `name[start:end]`,
+            and `end`, by increasing rank.
+
+    """
+    # Place value of each node's digit, as in _unrank.
+    places = [1] * len(nodes)
+    for position in range(len(nodes) - 1, 0, -1):
+        node = nodes[position]
+        if isinstance(node, _Token):
+            size = len(node.tokens)
+        elif isinstance(node, _Choice):
+            size = sum(_count(branch, memo) for branch in node.branches)
+        else:
+            size = 1
+        places[position - 1] = places[position] * size
+
+    def walk(position: int, pos: int) -> Iterator[tuple[int, int]]:
+        if position == len(nodes):
+            yield 0, pos
+            return
+        node, place = nodes[position], places[position]
+        if isinstance(node, _Literal):
+            if name.startswith(node.text, pos):
+                yield from walk(position + 1, pos + len(node.text))
+        elif isinstance(node, _Token):
+            for digit, token in enumerate(node.tokens):
+                if name.startswith(token, pos):
+                    for rank, end in walk(position + 1, pos + len(token)):
+                        yield digit * place + rank, end
+        else:
+            offset = 0
+            for branch in node.branches:
+                for digit, middle in _spellings(branch, name, pos, memo):
+                    for rank, end in walk(position + 1, middle):
+                        yield (offset + digit) * place + rank, end
+                offset += _count(branch, memo)
+
+    return walk(0, start)
+
+
+def _split_groups(pattern: str) -> list[str | tuple[str, ...]]:
+    """
+    Split a pattern into single characters and resolved groups.
+
+    The splitting mirrors the original character-by-character state machine,
+    including its handling of stray `|` and `>` characters outside a group.
+
+    Args:
+        pattern:
+            The pattern to split.
+
+    Returns:
+        list[str | tuple[str, ...]]:
+            Characters outside groups, and a tuple of options for each group.
+
+    """
+    items: list[str | tuple[str, ...]] = []
+    options: list[str] = []
+    current: list[str] = []
+    inside_group = False
+    for character in pattern:
+        if character == "<":
+            inside_group = True
+            options = []
+            current = []
+        elif character == "|":
+            options.append("".join(current))
+            current = []
+        elif character == ">":
+            inside_group = False
+            options.append("".join(current))
+            current = []
+            items.append(tuple(options))
+            options = []
+        elif inside_group:
+            current.append(character)
+        else:
+            items.append(character)
+    return items
+
+
+def _append(nodes: list[_Node], node: _Node) -> None:
+    """
+    Append a node, merging consecutive literals into a single node.
+
+    Args:
+        nodes:
+            The node list being built.
+        node:
+            The node to append.
+
+    """
+    if nodes and isinstance(node, _Literal) and isinstance(nodes[-1], _Literal):
+        nodes[-1] = _Literal(nodes[-1].text + node.text)
+    else:
+        nodes.append(node)
+
+
+def _concat(head: tuple[_Node, ...], tail: tuple[_Node, ...]) -> tuple[_Node, ...]:
+    """
+    Concatenate two node sequences, merging literals at the boundary.
+
+    Args:
+        head:
+            The leading nodes.
+        tail:
+            The trailing nodes.
+
+    Returns:
+        tuple[_Node, ...]:
+            The concatenated nodes.
+
+    """
+    nodes = list(head)
+    for node in tail:
+        _append(nodes, node)
+    return tuple(nodes)
+
+
+class _Compiler:
+    """
+    Translate a pattern into a tree of nodes.
+
+    The pattern state (literal mode and pending capitalization) is resolved at
+    compile time. When the options of a group leave the state in different
+    configurations, the rest of the pattern is compiled once per resulting
+    state and appended to the matching branches.
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        token_map: Mapping[str, Sequence[str]],
+    ) -> None:
+        """
+        Initialize the compiler.
+
+        Args:
+            pattern:
+                The pattern to compile.
+            token_map:
+                The token lists available to the pattern.
+
+        """
+        self._items = _split_groups(pattern)
+        self._token_map = token_map
+        self._tokens: dict[tuple[str, bool], _Token | None] = {}
+        self._memo: dict[tuple[int, _State], tuple[_Node, ...]] = {}
+
+    def compile(self) -> tuple[_Node, ...]:
+        """
+        Compile the whole pattern.
+
+        Returns:
+            tuple[_Node, ...]:
+                The compiled nodes.
+
+        """
+        return self._compile_from(0, (False, False))
+
+    def _token(self, key: str, capitalize: bool) -> _Token | None:
+        """
+        Resolve the token node for a key, or None if the key has no tokens.
+
+        Args:
+            key:
+                The pattern character.
+            capitalize:
+                Whether the first character of each token is capitalized.
+
+        Returns:
+            _Token | None:
+                The token node, shared between all uses of the same key.
+
+        """
+        cache_key = (key, capitalize)
+        if cache_key not in self._tokens:
+            entries = self._token_map.get(key)
+            if not entries:
+                self._tokens[cache_key] = None
+                return None
+            originals, weights = split_weights(entries)
+            tokens = originals
+            if capitalize:
+                tokens = tuple(token[:1].upper() + token[1:] for token in tokens)
+            alias = None if weights is None else AliasTable(weights)
+            self._tokens[cache_key] = _Token(key, tokens, originals, weights, alias)
+        return self._tokens[cache_key]
+
+    def _compile_character(
+        self,
+        character: str,
+        state: _State,
+        nodes: list[_Node],
+    ) -> _State:
+        """
+        Compile a single character outside of a group.
+
+        Args:
+            character:
+                The character to compile.
+            state:
+                The state before the character.
+            nodes:
+                The node list being built.
+
+        Returns:
+            _State:
+                The state after the character.
+
+        """
+        emit_literal, capitalize = state
+        if character == "(":
+            return True, capitalize
+        if character == ")":
+            return False, capitalize
+        if character == "!":
+            return emit_literal, True
+        token = None if emit_literal else self._token(character, capitalize)
+        if token is None:
+            _append(nodes, _Literal(character.upper() if capitalize else character))
+        else:
+            _append(nodes, token)
+        return emit_literal, False
+
+    def _compile_option(
+        self,
+        option: str,
+        state: _State,
+    ) -> tuple[tuple[_Node, ...], _State]:
+        """
+        Compile the characters of a single group option.
+
+        Args:
+            option:
+                The option text.
+            state:
+                The state when entering the option.
+
+        Returns:
+            tuple[tuple[_Node, ...], _State]:
+                The compiled nodes and the state when leaving the option.
+
+        """
+        nodes: list[_Node] = []
+        for character in option:
+            state = self._compile_character(character, state, nodes)
+        return tuple(nodes), state
+
+    def _compile_from(self, index: int, state: _State) -> tuple[_Node, ...]:
+        """
+        Compile the items starting at the given index.
+
+        Args:
+            index:
+                The index of the first item to compile.
+            state:
+                The state before that item.
+
+        Returns:
+            tuple[_Node, ...]:
+                The compiled nodes.
+
+        """
+        memo_key = (index, state)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        nodes: list[_Node] = []
+        while index < len(self._items):
+            item = self._items[index]
+            index += 1
+            if isinstance(item, str):
+                state = self._compile_character(item, state, nodes)
+                continue
+            compiled = [self._compile_option(option, state) for option in item]
+            exit_states = {exit_state for _, exit_state in compiled}
+            if len(exit_states) == 1:
+                nodes.append(_Choice(tuple(branch for branch, _ in compiled)))
+                state = exit_states.pop()
+                continue
+            # The options diverge: each branch carries its own continuation.
+            nodes.append(
+                _Choice(
+                    tuple(
+                        _concat(branch, self._compile_from(index, exit_state))
+                        for branch, exit_state in compiled
+                    )
+                )
+            )
+            break
+        result = tuple(nodes)
+        self._memo[memo_key] = result
+        return result
+
+
+class CompiledPattern:
+    """
+    A pattern parsed once and bound to a token set.
+
+    Compiled patterns resolve groups, literals, capitalization and token
+    lookups ahead of time, so generating a name only walks a small tree of
+    nodes. Token lists are captured when the pattern is compiled: later
+    changes to the token set are not reflected.
+
+    Attributes:
+        pattern (str):
+            The source pattern.
+        language (str):
+            The language token set the pattern was compiled against.
+
+    """
+
+    __slots__ = ("_counts", "_junctions", "_nodes", "language", "pattern")
+
+    def __init__(
+        self,
+        pattern: str,
+        token_map: Mapping[str, Sequence[str]],
+        language: str = "default",
+        junctions: JunctionTable | Callable[[], JunctionTable | None] | None = None,
+    ) -> None:
+        """
+        Compile a pattern against a token map.
+
+        Args:
+            pattern:
+                The pattern defining the structure of the name.
+            token_map:
+                The token lists available to the pattern. Entries are tokens
+                or [token, weight] pairs.
+            language:
+                The name of the language the token map belongs to.
+            junctions:
+                The junction table of the token map, shared by the patterns
+                of a language, or a function returning it, called on first
+                use. If None, or if the function returns None, a table of
+                the pattern's own tokens is built on first use.
+
+        Raises:
+            ValueError:
+                If a token list used by the pattern holds an invalid entry.
+
+        """
+        self.pattern = pattern
+        self.language = language
+        self._nodes = _Compiler(pattern, token_map).compile()
+        # Sizes of the node sequences, keyed by identity.
+        self._counts: dict[int, int] = {}
+        self._junctions = junctions
+
+    def __repr__(self) -> str:
+        return f"CompiledPattern({self.pattern!r}, language={self.language!r})"
+
+    def __getstate__(self) -> tuple[None, dict[str, Any]]:
+        state = {name: getattr(self, name) for name in self.__slots__}
+        # A function building the junction table reads the token sets of
+        # this process, so other processes build their own table instead.
+        if callable(state["_junctions"]):
+            state["_junctions"] = None
+        return None, state
+
+    @property
+    def space_size(self) -> int:
+        """
+        Number of distinct combinations of token and group choices.
+
+        This is an upper bound on the number of distinct names the pattern
+        can produce: different combinations may spell the same name.
+
+        Returns:
+            int:
+                The size of the pattern's output space.
+
+        """
+        return _count(self._nodes, self._counts)
+
+    def name_at(self, index: int) -> str:
+        """
+        Return the name at a given rank of the output space.
+
+        Ranks enumerate every combination of token and group choices in a
+        fixed order, from 0 to `space_size - 1`.
+
+        Args:
+            index (int):
+                The rank of the name.
+
+        Returns:
+            str:
+                The name for that combination.
+
+        Raises:
+            IndexError:
+                If index is outside range(space_size).
+
+        """
+        if not 0 <= index < self.space_size:
+            raise IndexError(
+                f"index {index} out of range for a space of {self.space_size}"
+            )
+        buffer: list[str] = []
+        _unrank(self._nodes, index, self._counts, buffer)
+        return "".join(buffer)
+
+    def rank_of(self, name: str) -> int:
+        """
+        Return the lowest rank of the output space that spells a name.
+
+        Different combinations may spell the same name, so
+        `rank_of(name_at(index))` may be lower than `index`.
+
+        Args:
+            name (str):
+                The name to look up.
+
+        Returns:
+            int:
+                The lowest rank `index` such that `name_at(index) == name`.
+
+        Raises:
+            ValueError:
+                If the pattern cannot produce the name.
+
+        """
+        for rank, end in _spellings(self._nodes, name, 0, self._counts):
+            if end == len(name):
+                return rank
+        raise ValueError(f"{self.pattern!r} cannot produce {name!r}")
+
+    def generate(
+        self,
+        rng: random.Random | None = None,
+        draws: dict[str, Counter] | None = None,
+    ) -> str:
+        """
+        Generate a name.
+
+        Args:
+            rng (random.Random | None):
+                The random generator to draw from. If None, the global
+                `random` module is used.
+            draws (dict[str, Counter] | None):
+                If given, the number of times each token is drawn, per
+                class, is counted in it, such as
+                `GenerationStats.token_draws`.
+
+        Returns:
+            str:
+                The generated name.
+
+        """
+        buffer: list[str] = []
+        if draws is None:
+            _emit(self._nodes, random if rng is None else rng, buffer)
+        else:
+            _emit_counted(self._nodes, random if rng is None else rng, buffer, draws)
+        return "".join(buffer)
+
+    def generate_pronounceable(
+        self,
+        rng: random.Random | None = None,
+        scorer: pronounceability.PronounceabilityScorer | None = None,
+        draws: dict[str, Counter] | None = None,
+    ) -> str:
+        """
+        Generate a name, steering clear of clusters formed between tokens.
+
+        Each token is drawn among the tokens that do not form a penalized
+        consonant cluster with the text before it, for instance a run of
+        four consonants when a cluster token follows another, using the
+        junction table of the pattern. Tokens are drawn uniformly from all
+        candidates when none fits. Clusters inside a single token are kept,
+        so the name still has to be scored.
+
+        Args:
+            rng (random.Random | None):
+                The random generator to draw from. If None, the global
+                `random` module is used.
+            scorer (PronounceabilityScorer | None):
+                The scorer whose cluster rules are applied. If None, the
+                scorer used by `score_pronounceability` is used.
+            draws (dict[str, Counter] | None):
+                If given, the number of times each token is drawn, per
+                class, is counted in it.
+
+        Returns:
+            str:
+                The generated name.
+
+        """
+        if scorer is None:
+            scorer = pronounceability.get_scorer()
+        junctions = self._junctions
+        if callable(junctions):
+            junctions = self._junctions = junctions()
+        if junctions is None or not scorer.rules_match(junctions.rules):
+            junctions = self._junctions = JunctionTable(
+                _token_lists(self._nodes, {}), scorer
+            )
+        buffer: list[str] = []
+        _emit_smooth(
+            self._nodes, random if rng is None else rng, buffer, junctions, "", draws
+        )
+        return "".join(buffer)
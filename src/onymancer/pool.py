@@ -0,0 +1,332 @@
+"""Pools of pre-generated names, refilled in the background."""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, NamedTuple
+
+from . import namegen
+from .dedup import SeenSet
+
+# Batches generated at most per refill of a unique pool.
+_UNIQUE_ROUNDS = 10
+
+# Constraints restricting the output space of the pattern.
+_SPACE_CONSTRAINTS = (
+    "min_length",
+    "max_length",
+    "starts_with",
+    "ends_with",
+    "contains",
+)
+
+
+class PoolStats(NamedTuple):
+    """
+    Statistics about a name pool.
+
+    Attributes:
+        depth (int):
+            Number of names ready to be handed out.
+        capacity (int):
+            Maximum number of names kept ready.
+        served (int):
+            Number of names handed out.
+        generated (int):
+            Number of names added to the pool.
+        refills (int):
+            Number of batches generated to fill the pool.
+        refill_seconds (float):
+            Time spent generating those batches.
+
+    """
+
+    depth: int
+    capacity: int
+    served: int
+    generated: int
+    refills: int
+    refill_seconds: float
+
+    @property
+    def refill_rate(self) -> float:
+        """
+        Number of names added per second of refill work.
+
+        Returns:
+            float:
+                The refill rate, or 0.0 if the pool was never refilled.
+
+        """
+        return self.generated / self.refill_seconds if self.refill_seconds else 0.0
+
+
+class NamePool:
+    """
+    A ring buffer of names generated ahead of their use.
+
+    The pool is filled to capacity when created, then a background thread
+    generates a batch of names with `generate_batch` whenever fewer than
+    `low_watermark` names are left, bringing the pool back to capacity.
+    Handing out a name therefore never generates one, unless the consumers
+    outpace the refill thread.
+
+    With `unique`, no name is handed out twice over the lifetime of the
+    pool, and refills never ask for more names than the pattern has left.
+    When a refill adds no name at all, because the constraints cannot be
+    met or the unique names ran out, the pool is exhausted and stops
+    refilling; the names still in the pool can be handed out. The same
+    holds when a refill in the background raises an exception, which is
+    then raised again, as the cause of the RuntimeError, by `get()`.
+
+    Attributes:
+        pattern (str):
+            The pattern the names are generated from.
+        language (str):
+            The language token set used.
+
+    """
+
+    def __init__(
+        self,
+        pattern: str,
+        language: str = "default",
+        constraints: dict[str, Any] | None = None,
+        capacity: int = 1000,
+        low_watermark: int | None = None,
+        unique: bool = False,
+        seed: int | None = None,
+    ) -> None:
+        """
+        Fill the pool and start its refill thread.
+
+        Args:
+            pattern:
+                The pattern to use for generation.
+            language:
+                The language token set to use.
+            constraints:
+                Constraint keyword arguments passed to `generate_batch`,
+                such as `min_length`, `starts_with`, `min_pronounceability`
+                or `engine`.
+            capacity:
+                The maximum number of names kept ready.
+            low_watermark:
+                The number of names below which the pool is refilled. If
+                None, a quarter of the capacity is used.
+            unique:
+                Whether every name handed out must be distinct.
+            seed:
+                Optional seed, making the sequence of names handed out
+                reproducible.
+
+        Raises:
+            ValueError:
+                If capacity is not positive or low_watermark is not between
+                1 and capacity.
+            TypeError:
+                If constraints holds an argument `generate_batch` does not
+                accept.
+
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if low_watermark is None:
+            low_watermark = max(1, capacity // 4)
+        if not 0 < low_watermark <= capacity:
+            raise ValueError(
+                f"low_watermark must be between 1 and {capacity}, got {low_watermark}"
+            )
+        self.pattern = pattern
+        self.language = language
+        self._constraints = dict(constraints or {})
+        self._capacity = capacity
+        self._low_watermark = low_watermark
+        self._unique = unique
+        self._seen = SeenSet() if unique else None
+        self._space = 0
+        if unique:
+            self._space = namegen.pattern_space_size(
+                pattern,
+                language,
+                **{
+                    name: value
+                    for name, value in self._constraints.items()
+                    if name in _SPACE_CONSTRAINTS
+                },
+            )
+        self._rng = random.Random(seed)
+        self._names: deque[str] = deque(maxlen=capacity)
+        self._condition = threading.Condition()
+        self._closed = False
+        self._exhausted = False
+        self._error: Exception | None = None
+        self._served = 0
+        self._generated = 0
+        self._refills = 0
+        self._refill_seconds = 0.0
+        self._refill(capacity)
+        self._thread = threading.Thread(
+            target=self._refill_loop, name="onymancer-pool", daemon=True
+        )
+        self._thread.start()
+
+    # typing.Self needs Python 3.11, and the package supports 3.10.
+    def __enter__(self) -> "NamePool":  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _refill(self, count: int) -> None:
+        """
+        Generate names and add them to the pool.
+
+        For unique pools, the count is capped by the number of names the
+        pattern has left, names handed out before are dropped and batches
+        are generated again, up to `_UNIQUE_ROUNDS` times, to make up for
+        them.
+
+        Args:
+            count:
+                The number of names to generate.
+
+        """
+        start = time.perf_counter()
+        names: list[str] = []
+        rounds = 1
+        if self._seen is not None:
+            count = min(count, self._space - len(self._seen))
+            rounds = _UNIQUE_ROUNDS if count > 0 else 0
+        for _ in range(rounds):
+            batch = namegen.generate_batch(
+                self.pattern,
+                count - len(names),
+                language=self.language,
+                rng=self._rng,
+                unique=self._unique,
+                **self._constraints,
+            )
+            if self._seen is None:
+                names = batch
+                break
+            names.extend(name for name in batch if self._seen.add(name))
+            if len(names) == count:
+                break
+        elapsed = time.perf_counter() - start
+        with self._condition:
+            self._names.extend(names)
+            self._generated += len(names)
+            self._refills += 1
+            self._refill_seconds += elapsed
+            if not names:
+                self._exhausted = True
+            self._condition.notify_all()
+
+    def _refill_loop(self) -> None:
+        """
+        Refill the pool whenever it drops below the low watermark.
+        """
+        while True:
+            with self._condition:
+                while (
+                    not self._closed
+                    and not self._exhausted
+                    and len(self._names) >= self._low_watermark
+                ):
+                    self._condition.wait()
+                if self._closed or self._exhausted:
+                    return
+                missing = self._capacity - len(self._names)
+            try:
+                self._refill(missing)
+            except Exception as error:  # noqa: BLE001 - raised again by get()
+                with self._condition:
+                    self._error = error
+                    self._condition.notify_all()
+                return
+
+    def get(self, timeout: float | None = None) -> str:
+        """
+        Hand out a name.
+
+        Args:
+            timeout:
+                The number of seconds to wait for a name when the pool is
+                empty, or None to wait until one is generated.
+
+        Returns:
+            str:
+                The oldest name of the pool.
+
+        Raises:
+            TimeoutError:
+                If no name is ready within the timeout.
+            RuntimeError:
+                If the pool is empty and closed or exhausted, or its refill
+                thread failed, with the exception it raised as the cause.
+
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self._names:
+                if self._error is not None:
+                    raise RuntimeError(
+                        "The name pool failed to generate names."
+                    ) from self._error
+                if self._closed or self._exhausted:
+                    raise RuntimeError("The name pool cannot generate more names.")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No name was ready within the timeout.")
+                self._condition.wait(remaining)
+            name = self._names.popleft()
+            self._served += 1
+            if len(self._names) < self._low_watermark:
+                self._condition.notify_all()
+            return name
+
+    def stats(self) -> PoolStats:
+        """
+        Report the pool statistics.
+
+        Returns:
+            PoolStats:
+                The depth of the pool and its service and refill counters.
+
+        """
+        with self._condition:
+            return PoolStats(
+                len(self._names),
+                self._capacity,
+                self._served,
+                self._generated,
+                self._refills,
+                self._refill_seconds,
+            )
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        Whether the pool stopped refilling because a refill added no name.
+
+        Returns:
+            bool:
+                True if the pool is exhausted.
+
+        """
+        return self._exhausted
+
+    def close(self) -> None:
+        """
+        Stop the refill thread. Names already in the pool can still be
+        handed out.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
@@ -1,7 +1,18 @@
 """Pronounceability scoring module for fantasy names."""
 
 import re
-from typing import Dict, List, Set
+from collections.abc import Sequence
+from collections.abc import Set as AbstractSet
+
+from .cache import CacheInfo, LRUCache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+# Number of names scored together by the NumPy backend
+_BATCH_CHUNK = 65536
 
 
 class PronounceabilityScorer:
@@ -31,6 +42,9 @@ class PronounceabilityScorer:
         'str', 'scr', 'squ', 'cl', 'cr', 'dr', 'fl', 'fr', 'gl', 'gr', 'pl', 'pr'
     }
 
+    # Letters that form consonant clusters
+    CONSONANTS = frozenset('bcdfghjklmnpqrstvwxyz')
+
     def __init__(self):
         """Initialize the scorer with phonetic rules."""
         pass
@@ -44,6 +58,7 @@ class PronounceabilityScorer:
 
         Returns:
             Float between 0.0 and 1.0, where 1.0 is highly pronounceable
+
         """
         if not name or len(name) < 2:
             return 0.0
@@ -51,30 +66,377 @@ class PronounceabilityScorer:
         # Normalize to lowercase for analysis
         name_lower = name.lower()
 
-        # Calculate individual scores (weighted)
-        scores = []
+        # Consonant clusters (40%), vowel distribution (30%), syllable
+        # structure (20%) and repetition penalty (10%), in a single scan
+        cluster_score, vowel_score, syllable_score, repetition_score = (
+            self._scan(name_lower)
+        )
 
-        # Consonant cluster analysis (40% weight)
-        cluster_score = self._score_consonant_clusters(name_lower)
-        scores.append((cluster_score, 0.4))
+        # Calculate weighted average
+        total_score = (
+            cluster_score * 0.4
+            + vowel_score * 0.3
+            + syllable_score * 0.2
+            + repetition_score * 0.1
+        )
 
-        # Vowel distribution (30% weight)
-        vowel_score = self._score_vowel_distribution(name_lower)
-        scores.append((vowel_score, 0.3))
+        # Ensure score is between 0 and 1
+        return max(0.0, min(1.0, total_score))
 
-        # Syllable structure (20% weight)
-        syllable_score = self._score_syllable_structure(name_lower)
-        scores.append((syllable_score, 0.2))
+    def score_batch(self, names: Sequence[str], engine: str = "python") -> list[float]:
+        """
+        Calculate pronounceability scores for many names at once.
 
-        # Repetition penalty (10% weight)
-        repetition_score = self._score_repetition_penalty(name_lower)
-        scores.append((repetition_score, 0.1))
+        Args:
+            names: The names to score
+            engine: "python" to score names one by one, or "numpy" to score
+                printable ASCII names with array operations. The NumPy
+                backend gives the same scores and falls back to the Python
+                one when NumPy is not installed.
 
-        # Calculate weighted average
-        total_score = sum(score * weight for score, weight in scores)
+        Returns:
+            The score of each name, in order
 
-        # Ensure score is between 0 and 1
-        return max(0.0, min(1.0, total_score))
+        Raises:
+            ValueError: If the engine is unknown
+
+        """
+        if engine not in ("python", "numpy"):
+            raise ValueError(f"Unknown engine {engine!r}, expected 'python' or 'numpy'.")
+        if engine == "python" or np is None:
+            return [self.score_pronounceability(name) for name in names]
+
+        scores = [0.0] * len(names)
+        batch = []
+        for index, name in enumerate(names):
+            if len(name) < 2:
+                continue
+            name_lower = name.lower()
+            if name_lower.isascii() and name_lower.isprintable():
+                batch.append((len(name_lower), index, name_lower))
+            else:
+                scores[index] = self.score_pronounceability(name)
+
+        # Group names of similar length to keep the padding small
+        batch.sort()
+        tables = self._batch_tables()
+        for start in range(0, len(batch), _BATCH_CHUNK):
+            chunk = batch[start:start + _BATCH_CHUNK]
+            chunk_scores = self._score_chunk([name for _, _, name in chunk], tables)
+            for (_, index, _), score in zip(chunk, chunk_scores, strict=True):
+                scores[index] = score
+        return scores
+
+    def _batch_tables(self) -> tuple:
+        """
+        Build the lookup tables used by the NumPy backend.
+
+        Returns:
+            The vowel and consonant tables indexed by byte, and the sorted
+            codes of the allowed two- and three-letter clusters
+
+        """
+        ascii_chars = [chr(code) for code in range(128)]
+        vowel_table = np.zeros(256, dtype=bool)
+        vowel_table[:128] = [char in self.VOWELS for char in ascii_chars]
+        consonant_table = np.zeros(256, dtype=bool)
+        consonant_table[:128] = [char in self.CONSONANTS for char in ascii_chars]
+        digraphs = np.array(sorted(
+            ord(cluster[0]) << 8 | ord(cluster[1])
+            for cluster in self.ALLOWED_DIGRAPHS | self.COMMON_CLUSTERS
+            if len(cluster) == 2 and cluster.isascii()
+        ), dtype=np.int64)
+        trigraphs = np.array(sorted(
+            ord(cluster[0]) << 16 | ord(cluster[1]) << 8 | ord(cluster[2])
+            for cluster in self.ALLOWED_TRIGRAPHS
+            if len(cluster) == 3 and cluster.isascii()
+        ), dtype=np.int64)
+        return vowel_table, consonant_table, digraphs, trigraphs
+
+    def _score_chunk(self, names: list[str], tables: tuple) -> list[float]:
+        """
+        Score lowercased printable ASCII names of two or more characters.
+
+        Names are encoded into a zero-padded byte matrix, one row per name,
+        and every rule of `_scan` is evaluated column-wise. Penalties are
+        accumulated in the same order as the scalar scorer, so the scores
+        are identical.
+
+        Args:
+            names: The names to score
+            tables: The lookup tables returned by `_batch_tables`
+
+        Returns:
+            The score of each name, in order
+
+        """
+        vowel_table, consonant_table, digraphs, trigraphs = tables
+        width = max(map(len, names))
+        rows = len(names)
+        matrix = np.array(names, dtype=f"S{width}").view(np.uint8).reshape(rows, width)
+        lengths = np.fromiter(map(len, names), dtype=np.int64, count=rows)
+        columns = np.arange(width)
+        valid = columns < lengths[:, None]
+        codes = matrix.astype(np.int64)
+        # Code of the bigram and trigram ending at each column
+        bigrams = np.zeros_like(codes)
+        bigrams[:, 1:] = codes[:, :-1] << 8 | codes[:, 1:]
+        trigrams = np.zeros_like(codes)
+        trigrams[:, 2:] = bigrams[:, 1:-1] << 8 | codes[:, 2:]
+
+        # Vowel distribution
+        is_vowel = vowel_table[matrix] & valid
+        vowel_count = is_vowel.sum(axis=1)
+        vowel_ratio = vowel_count / lengths
+        vowel_score = np.select(
+            [
+                vowel_count == 0,
+                (vowel_ratio >= 0.25) & (vowel_ratio <= 0.6),
+                ((vowel_ratio >= 0.15) & (vowel_ratio < 0.25))
+                | ((vowel_ratio > 0.6) & (vowel_ratio <= 0.75)),
+            ],
+            [0.0, 1.0, 0.7],
+            0.3,
+        )
+
+        # Syllable structure
+        transitions = ((is_vowel[:, 1:] != is_vowel[:, :-1]) & valid[:, 1:]).sum(axis=1)
+        syllable_score = transitions / (lengths - 1)
+
+        # Consonant clusters, penalized at the last letter of each run
+        is_consonant = consonant_table[matrix] & valid
+        run_start = np.maximum.accumulate(
+            np.where(is_consonant, -1, columns), axis=1
+        )
+        run_length = columns - run_start
+        run_end = is_consonant.copy()
+        run_end[:, :-1] &= ~is_consonant[:, 1:]
+        run_end &= run_length >= 2
+        penalty = np.where(
+            run_length == 2,
+            np.where(np.isin(bigrams, digraphs), 0.0, 0.1),
+            np.where(
+                run_length == 3,
+                np.where(np.isin(trigrams, trigraphs), 0.0, 0.2),
+                0.5,
+            ),
+        )
+        # cumsum adds left to right, like the scalar accumulation
+        cluster_penalty = np.cumsum(np.where(run_end, penalty, 0.0), axis=1)[:, -1]
+        cluster_count = run_end.sum(axis=1)
+        max_reasonable_penalty = np.where(cluster_count == 0, 1.0, cluster_count * 0.3)
+        normalized_penalty = np.minimum(cluster_penalty, max_reasonable_penalty)
+        cluster_score = np.where(
+            cluster_count == 0,
+            1.0,
+            np.maximum(0.0, 1.0 - (normalized_penalty / max_reasonable_penalty)),
+        )
+
+        # Repetition penalty
+        doubled = (codes[:, 1:] == codes[:, :-1]) & valid[:, 1:]
+        double_count = doubled.sum(axis=1)
+        has_triple = (doubled[:, 1:] & doubled[:, :-1]).any(axis=1)
+        # Without triples, bigram occurrences never overlap
+        pair_valid = valid[:, 1:]
+        keys = np.arange(rows)[:, None] << 16 | bigrams[:, 1:]
+        _, inverse, counts = np.unique(
+            keys[pair_valid], return_inverse=True, return_counts=True
+        )
+        pair_counts = np.zeros(keys.shape, dtype=np.int64)
+        pair_counts[pair_valid] = counts[inverse]
+        repeated = (pair_counts > 1) & (columns[:-1] < (lengths - 3)[:, None])
+        repeats = [0.0]
+        for _ in range(width):
+            repeats.append(repeats[-1] + 0.05)
+        pattern_repeats = np.array(repeats)[repeated.sum(axis=1)]
+        total_penalty = double_count * 0.1 + pattern_repeats
+        repetition_score = np.where(
+            lengths < 3,
+            1.0,
+            np.where(
+                has_triple, 0.2, np.maximum(0.0, 1.0 - np.minimum(total_penalty, 0.8))
+            ),
+        )
+
+        total_score = (
+            cluster_score * 0.4
+            + vowel_score * 0.3
+            + syllable_score * 0.2
+            + repetition_score * 0.1
+        )
+        return np.clip(total_score, 0.0, 1.0).tolist()
+
+    def _scan(self, name: str) -> tuple[float, float, float, float]:
+        """
+        Compute the four sub-scores in one pass over a lowercased name.
+
+        This returns exactly what the `_score_*` methods compute separately,
+        without regular expressions or quadratic substring counts.
+
+        Args:
+            name: The lowercased name to score
+
+        Returns:
+            The cluster, vowel, syllable and repetition scores
+
+        """
+        vowels = self.VOWELS
+        consonants = self.CONSONANTS
+        length = len(name)
+
+        vowel_count = 0
+        good_transitions = 0
+        previous_vowel = False
+
+        cluster_count = 0
+        cluster_penalty = 0.0
+        run_length = 0
+
+        has_triple = False
+        double_count = 0
+        # Non-overlapping bigram counts, as computed by str.count
+        bigram_counts: dict[str, int] = {}
+        bigram_ends: dict[str, int] = {}
+
+        for index, char in enumerate(name):
+            is_vowel = char in vowels
+            if is_vowel:
+                vowel_count += 1
+            if index and is_vowel != previous_vowel:
+                good_transitions += 1
+            previous_vowel = is_vowel
+
+            if char in consonants:
+                run_length += 1
+            else:
+                if run_length >= 2:
+                    cluster_count += 1
+                    cluster_penalty += self.cluster_penalty(
+                        name[index - run_length:index]
+                    )
+                run_length = 0
+
+            if index:
+                previous = name[index - 1]
+                if previous == char and char != '\n':
+                    double_count += 1
+                    if index >= 2 and name[index - 2] == char:
+                        has_triple = True
+                bigram = previous + char
+                if index - 1 >= bigram_ends.get(bigram, 0):
+                    bigram_counts[bigram] = bigram_counts.get(bigram, 0) + 1
+                    bigram_ends[bigram] = index + 1
+        if run_length >= 2:
+            cluster_count += 1
+            cluster_penalty += self.cluster_penalty(name[length - run_length:])
+
+        # Consonant clusters
+        if cluster_count == 0:
+            cluster_score = 1.0
+        else:
+            max_reasonable_penalty = cluster_count * 0.3
+            normalized_penalty = min(cluster_penalty, max_reasonable_penalty)
+            cluster_score = max(
+                0.0, 1.0 - (normalized_penalty / max_reasonable_penalty)
+            )
+
+        # Vowel distribution
+        if vowel_count == 0:
+            vowel_score = 0.0
+        else:
+            vowel_ratio = vowel_count / length
+            if 0.25 <= vowel_ratio <= 0.6:
+                vowel_score = 1.0
+            elif 0.15 <= vowel_ratio < 0.25 or 0.6 < vowel_ratio <= 0.75:
+                vowel_score = 0.7
+            else:
+                vowel_score = 0.3
+
+        # Syllable structure
+        total_transitions = max(length - 1, 0)
+        if total_transitions == 0:
+            syllable_score = 0.5
+        else:
+            syllable_score = good_transitions / total_transitions
+
+        # Repetition penalty
+        if length < 3:
+            repetition_score = 1.0
+        elif has_triple:
+            repetition_score = 0.2
+        else:
+            pattern_repeats = 0.0
+            for i in range(length - 3):
+                if bigram_counts[name[i:i + 2]] > 1:
+                    pattern_repeats += 0.05
+            total_penalty = double_count * 0.1 + pattern_repeats
+            repetition_score = max(0.0, 1.0 - min(total_penalty, 0.8))
+
+        return cluster_score, vowel_score, syllable_score, repetition_score
+
+    def cluster_penalty(self, cluster: str) -> float:
+        """
+        Penalty of a single consonant cluster.
+
+        Args:
+            cluster: A run of two or more consonants
+
+        Returns:
+            The penalty, 0.0 for allowed clusters
+
+        """
+        cluster_len = len(cluster)
+        if cluster_len == 2:
+            if cluster in self.ALLOWED_DIGRAPHS or cluster in self.COMMON_CLUSTERS:
+                return 0.0
+            return 0.1
+        if cluster_len == 3:
+            if cluster in self.ALLOWED_TRIGRAPHS:
+                return 0.0
+            return 0.2
+        return 0.5
+
+    def _rule_sets(self) -> tuple[AbstractSet[str], ...]:
+        """
+        Collect the rule sets the scores depend on.
+
+        Returns:
+            The rule sets, as they are now
+
+        """
+        return (
+            self.ALLOWED_DIGRAPHS,
+            self.ALLOWED_TRIGRAPHS,
+            self.COMMON_CLUSTERS,
+            self.VOWELS,
+            self.CONSONANTS,
+        )
+
+    def rules_fingerprint(self) -> tuple[frozenset[str], ...]:
+        """
+        Take a snapshot of the current rule sets.
+
+        Returns:
+            A copy of each rule set, to compare with `rules_match`
+
+        """
+        return tuple(frozenset(rules) for rules in self._rule_sets())
+
+    def rules_match(self, fingerprint: tuple[frozenset[str], ...]) -> bool:
+        """
+        Check whether the rule sets still hold what a snapshot recorded.
+
+        The contents are compared, so rule sets edited in place are noticed
+        as well as replaced ones.
+
+        Args:
+            fingerprint: A snapshot taken with `rules_fingerprint`
+
+        Returns:
+            True if every rule set holds the same entries as in the snapshot
+
+        """
+        return fingerprint == self._rule_sets()
 
     def _score_consonant_clusters(self, name: str) -> float:
         """
@@ -147,9 +509,6 @@ class PronounceabilityScorer:
 
         Looks for alternating consonant-vowel patterns.
         """
-        # Simple syllable detection: CV, VC, CVC patterns
-        cv_pattern = re.compile(r'[cv][cv]?[cv]?', re.IGNORECASE)
-
         # Convert to C/V representation
         cv_string = ''.join('v' if c in self.VOWELS else 'c' for c in name)
 
@@ -205,10 +564,170 @@ class PronounceabilityScorer:
         return max(0.0, score)
 
 
+class CachingScorer(PronounceabilityScorer):
+    """
+    Pronounceability scorer that remembers the scores of recent names.
+
+    Scores are kept in a bounded LRU cache keyed by name. The cache is
+    emptied when the rule sets change, either because they are replaced or
+    because entries are added to or removed from them.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize the scorer.
+
+        Args:
+            maxsize: Maximum number of scores kept
+
+        """
+        super().__init__()
+        self._cache = LRUCache(maxsize)
+        self._rules = self.rules_fingerprint()
+
+    def _check_rules(self) -> None:
+        """Empty the cache if the rule sets changed since the last call."""
+        if not self.rules_match(self._rules):
+            self._cache.clear(reset_stats=False)
+            self._rules = self.rules_fingerprint()
+
+    def score_pronounceability(self, name: str) -> float:
+        """
+        Calculate overall pronounceability score for a name, using the cache.
+
+        Args:
+            name: The name to score
+
+        Returns:
+            Float between 0.0 and 1.0, where 1.0 is highly pronounceable
+
+        """
+        self._check_rules()
+        score = self._cache.get(name)
+        if score is None:
+            score = super().score_pronounceability(name)
+            self._cache.put(name, score)
+        return score
+
+    def score_batch(self, names: Sequence[str], engine: str = "python") -> list[float]:
+        """
+        Calculate pronounceability scores for many names, using the cache.
+
+        Only the names missing from the cache are scored, in a single batch.
+
+        Args:
+            names: The names to score
+            engine: "python" or "numpy", as for `PronounceabilityScorer`
+
+        Returns:
+            The score of each name, in order
+
+        Raises:
+            ValueError: If the engine is unknown
+
+        """
+        self._check_rules()
+        scores = [self._cache.get(name) for name in names]
+        missing = [index for index, score in enumerate(scores) if score is None]
+        if missing:
+            fresh = super().score_batch([names[index] for index in missing], engine)
+            for index, score in zip(missing, fresh, strict=True):
+                scores[index] = score
+                self._cache.put(names[index], score)
+        return scores
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Report the cache statistics.
+
+        Returns:
+            The hit, miss and eviction counters and the cache sizes
+
+        """
+        return self._cache.info()
+
+    def cache_clear(self) -> None:
+        """Empty the cache and reset its statistics."""
+        self._cache.clear()
+
+    def cache_resize(self, maxsize: int) -> None:
+        """
+        Change the number of scores kept, evicting the oldest ones if needed.
+
+        Args:
+            maxsize: Maximum number of scores kept
+
+        Raises:
+            ValueError: If maxsize is negative
+
+        """
+        self._cache.resize(maxsize)
+
+
 # Global scorer instance
 _scorer = PronounceabilityScorer()
 
 
+def enable_score_cache(maxsize: int = 4096) -> None:
+    """
+    Memoize the scores computed by the module-level functions.
+
+    Calling it again resizes the cache and keeps the cached scores.
+
+    Args:
+        maxsize: Maximum number of scores kept
+
+    Raises:
+        ValueError: If maxsize is negative
+
+    """
+    # The module-level functions read the scorer when called, so it is swapped.
+    global _scorer  # noqa: PLW0603
+    if isinstance(_scorer, CachingScorer):
+        _scorer.cache_resize(maxsize)
+    else:
+        _scorer = CachingScorer(maxsize)
+
+
+def get_scorer() -> PronounceabilityScorer:
+    """
+    Return the scorer used by the module-level functions.
+
+    It changes when the score cache is enabled or disabled.
+
+    Returns:
+        The current scorer
+
+    """
+    return _scorer
+
+
+def disable_score_cache() -> None:
+    """Stop memoizing scores and drop the cached ones."""
+    global _scorer  # noqa: PLW0603
+    _scorer = PronounceabilityScorer()
+
+
+def score_cache_info() -> CacheInfo:
+    """
+    Report statistics about the score cache.
+
+    Returns:
+        The hit, miss and eviction counters and the cache sizes, all zero
+        when the cache is disabled
+
+    """
+    if isinstance(_scorer, CachingScorer):
+        return _scorer.cache_info()
+    return CacheInfo(0, 0, 0, 0, 0)
+
+
+def score_cache_clear() -> None:
+    """Empty the score cache and reset its statistics."""
+    if isinstance(_scorer, CachingScorer):
+        _scorer.cache_clear()
+
+
 def score_pronounceability(name: str) -> float:
     """
     Score how pronounceable a fantasy name is.
@@ -226,10 +745,33 @@ def score_pronounceability(name: str) -> float:
         0.85
         >>> score_pronounceability("Brrrgh")
         0.4
+
     """
     return _scorer.score_pronounceability(name)
 
 
+def score_pronounceability_batch(
+    names: Sequence[str], engine: str = "python"
+) -> list[float]:
+    """
+    Score the pronounceability of many names at once.
+
+    Args:
+        names: The names to score
+        engine: "python" or "numpy". The NumPy backend scores printable
+            ASCII names with array operations and gives the same scores. It
+            falls back to the Python engine when NumPy is not installed.
+
+    Returns:
+        The score of each name, in order
+
+    Raises:
+        ValueError: If the engine is unknown
+
+    """
+    return _scorer.score_batch(names, engine=engine)
+
+
 def is_pronounceable(name: str, threshold: float = 0.6) -> bool:
     """
     Check if a name meets a minimum pronounceability threshold.
@@ -240,5 +782,6 @@ def is_pronounceable(name: str, threshold: float = 0.6) -> bool:
 
     Returns:
         True if name is pronounceable above threshold
+
     """
-    return score_pronounceability(name) >= threshold
\ No newline at end of file
+    return score_pronounceability(name) >= threshold
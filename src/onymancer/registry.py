@@ -0,0 +1,599 @@
+"""Registry of language token sets, parsed on first use."""
+
+import json
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from pathlib import Path
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import Any, NamedTuple
+
+from .alias import split_weights
+from .model import ModelFile, pack_strings, unpack_strings, write_model
+
+# Tag of the language model files.
+LANGUAGE_KIND = b"TOKN"
+
+# Suffixes of the language files of a data directory, by order of preference.
+_SUFFIXES = (".onym", ".json")
+
+
+class RegistryInfo(NamedTuple):
+    """
+    Statistics about a language registry.
+
+    Attributes:
+        loaded (int):
+            Number of token sets in memory.
+        evictions (int):
+            Number of token sets dropped to respect the memory budget.
+        currbytes (int):
+            Estimated size of the token sets in memory, in bytes.
+        maxbytes (int | None):
+            The memory budget, or None if it is unbounded.
+
+    """
+
+    loaded: int
+    evictions: int
+    currbytes: int
+    maxbytes: int | None
+
+
+def token_set_size(tokens: Mapping[str, Sequence]) -> int:
+    """
+    Estimate the memory held by a token set.
+
+    Args:
+        tokens:
+            The token lists, keyed by class.
+
+    Returns:
+        int:
+            The size of the mapping, its keys, lists and entries, in bytes.
+            Objects shared with other token sets are counted in each.
+
+    """
+    size = sys.getsizeof(tokens)
+    for key, entries in tokens.items():
+        size += sys.getsizeof(key) + sys.getsizeof(entries)
+        for entry in entries:
+            size += sys.getsizeof(entry)
+            if isinstance(entry, (list, tuple)):
+                size += sum(sys.getsizeof(part) for part in entry)
+    return size
+
+
+def estimate_size(obj: object, skip: tuple[type, ...] = ()) -> int:
+    """
+    Estimate the memory held by an object and the objects it references.
+
+    Containers, instance dictionaries and slots are followed, and every
+    object is counted once. Classes, modules and functions are not.
+
+    Args:
+        obj:
+            The object to measure.
+        skip:
+            Types whose instances referenced by the object are neither
+            counted nor followed, such as objects shared with other owners.
+
+    Returns:
+        int:
+            The estimated size in bytes.
+
+    """
+    size = 0
+    seen: set[int] = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or (item is not obj and isinstance(item, skip)):
+            continue
+        seen.add(id(item))
+        if isinstance(item, (type, ModuleType, FunctionType, BuiltinFunctionType)):
+            continue
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif not isinstance(item, (str, bytes, int, float)):
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for cls in type(item).__mro__:
+                slots = cls.__dict__.get("__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if slot not in ("__dict__", "__weakref__") and hasattr(item, slot):
+                        stack.append(getattr(item, slot))
+    return size
+
+
+def write_token_set(tokens: Mapping[str, Sequence], filename: str) -> None:
+    """
+    Write a token set to a binary model file.
+
+    The keys and the tokens are stored as UTF-8 blobs with the offsets of
+    their bounds, along with the token bounds of each class and the weights
+    of the tokens.
+
+    Args:
+        tokens:
+            The token lists, keyed by class.
+        filename:
+            The path of the file to write.
+
+    Raises:
+        ValueError:
+            If a token list holds an invalid entry.
+
+    """
+    keys: list[str] = []
+    texts: list[str] = []
+    bounds = array("q", [0])
+    weights = array("d")
+    weighted = bytearray()
+    for key, entries in tokens.items():
+        key_tokens, key_weights = split_weights(entries)
+        keys.append(key)
+        texts.extend(key_tokens)
+        bounds.append(len(texts))
+        weights.extend(key_weights or [1.0] * len(key_tokens))
+        weighted.append(key_weights is not None)
+    key_offsets, key_blob = pack_strings(keys)
+    text_offsets, text_blob = pack_strings(texts)
+    write_model(
+        filename,
+        LANGUAGE_KIND,
+        {
+            b"KOFF": key_offsets,
+            b"KEYS": key_blob,
+            b"TOFF": text_offsets,
+            b"TEXT": text_blob,
+            b"CLSS": bounds,
+            b"WGHT": weights,
+            b"WFLG": bytes(weighted),
+        },
+    )
+
+
+def read_token_set(filename: str) -> dict[str, list]:
+    """
+    Read a token set written with `write_token_set`.
+
+    Args:
+        filename:
+            The path of the file to read.
+
+    Returns:
+        dict[str, list]:
+            The token lists, keyed by class. Weighted lists hold
+            [token, weight] pairs.
+
+    Raises:
+        OSError:
+            If the file cannot be opened.
+        ValueError:
+            If the file is not a valid language model file.
+
+    """
+    model = ModelFile(filename)
+    if model.kind != LANGUAGE_KIND:
+        raise ValueError(f"{filename} does not hold a token set.")
+    try:
+        keys = unpack_strings(model.section(b"KOFF"), model.section(b"KEYS"))
+        texts = unpack_strings(model.section(b"TOFF"), model.section(b"TEXT"))
+        bounds = model.section(b"CLSS")
+        weights = model.section(b"WGHT")
+        weighted = model.section(b"WFLG")
+        tokens: dict[str, list] = {}
+        for index, key in enumerate(keys):
+            start, stop = bounds[index], bounds[index + 1]
+            if weighted[index]:
+                tokens[key] = [
+                    [texts[position], weights[position]]
+                    for position in range(start, stop)
+                ]
+            else:
+                tokens[key] = texts[start:stop]
+    except (IndexError, KeyError, UnicodeDecodeError) as error:
+        raise ValueError(f"{filename} is corrupted.") from error
+    return tokens
+
+
+def _read_source(path: Path) -> dict[str, list]:
+    """
+    Parse the token set of a language file, JSON or binary.
+
+    Args:
+        path:
+            The path of the file.
+
+    Returns:
+        dict[str, list]:
+            The token lists, keyed by class.
+
+    """
+    if path.suffix == ".onym":
+        return read_token_set(str(path))
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class LanguageRegistry:
+    """
+    The token sets of the languages, keyed by language name.
+
+    Languages are discovered by name: the token set of language `x` is the
+    file `x.onym` or `x.json` of the data directory, parsed the first time
+    `x` is looked up. Creating the registry reads nothing, so its cost does
+    not depend on the number of files in the directory. Token sets can also
+    be registered directly, with the file they were read from.
+
+    With a memory budget, the least recently used token sets are evicted
+    once their estimated size, including the data charged to them with
+    `charge`, exceeds it, and parsed again from their file on their next
+    lookup. Token sets registered without a file cannot be parsed again,
+    so they are never evicted, and neither are pinned ones.
+
+    All operations are protected by a lock, so a language looked up from
+    several threads at once is parsed a single time.
+    """
+
+    def __init__(
+        self,
+        data_dir: str | Path | None = None,
+        max_bytes: int | None = None,
+        on_evict: Callable[[str], None] | None = None,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            data_dir:
+                The directory holding the files of the languages, or None to
+                only hold registered token sets.
+            max_bytes:
+                The memory budget of the token sets, in bytes, or None for
+                no budget.
+            on_evict:
+                A function called with the name of every evicted language,
+                to drop the data derived from its token set.
+
+        Raises:
+            ValueError:
+                If max_bytes is negative.
+
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"max_bytes must be non-negative, got {max_bytes}")
+        self._data_dir = None if data_dir is None else Path(data_dir)
+        self._max_bytes = max_bytes
+        self._on_evict = on_evict
+        self._tokens: OrderedDict[str, dict[str, list]] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._sources: dict[str, Path] = {}
+        self._pinned: set[str] = set()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def __contains__(self, language: str) -> bool:
+        return language in self._tokens or self._path(language) is not None
+
+    def __getitem__(self, language: str) -> dict[str, list]:
+        tokens = self.get(language)
+        if tokens is None:
+            raise KeyError(language)
+        return tokens
+
+    def __setitem__(self, language: str, tokens: dict[str, list]) -> None:
+        self.register(language, tokens)
+
+    def __delitem__(self, language: str) -> None:
+        with self._lock:
+            if language not in self._tokens and language not in self._sources:
+                raise KeyError(language)
+            self._sources.pop(language, None)
+            self._pinned.discard(language)
+            self._drop(language)
+
+    def _path(self, language: str) -> Path | None:
+        """
+        Find the file holding the token set of a language.
+
+        Args:
+            language:
+                The name of the language.
+
+        Returns:
+            Path | None:
+                The file the language was registered with, or else its file
+                in the data directory, or None if it has none.
+
+        """
+        source = self._sources.get(language)
+        if source is not None:
+            return source
+        if (
+            self._data_dir is None
+            or not language
+            or language.startswith(".")
+            or Path(language).name != language
+        ):
+            return None
+        for suffix in _SUFFIXES:
+            path = self._data_dir / f"{language}{suffix}"
+            if path.is_file():
+                return path
+        return None
+
+    def _drop(self, language: str) -> None:
+        """
+        Remove a token set from memory. The lock must be held.
+
+        Args:
+            language:
+                The name of the language.
+
+        """
+        if self._tokens.pop(language, None) is not None:
+            self._bytes -= self._sizes.pop(language)
+
+    def _insert(self, language: str, tokens: dict[str, list]) -> None:
+        """
+        Keep a token set in memory and enforce the budget. The lock must be
+        held.
+
+        Args:
+            language:
+                The name of the language.
+            tokens:
+                The token set.
+
+        """
+        self._drop(language)
+        self._tokens[language] = tokens
+        self._sizes[language] = token_set_size(tokens)
+        self._bytes += self._sizes[language]
+        self._shrink(keep=language)
+
+    def _shrink(self, keep: str | None = None) -> None:
+        """
+        Evict the least recently used token sets that can be parsed again
+        until the budget holds. The lock must be held.
+
+        Args:
+            keep:
+                A language that is not evicted, the one just used.
+
+        """
+        if self._max_bytes is None:
+            return
+        for language in list(self._tokens):
+            if self._bytes <= self._max_bytes:
+                break
+            if language == keep or language in self._pinned:
+                continue
+            self._drop(language)
+            self._evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(language)
+
+    def register(
+        self,
+        language: str,
+        tokens: dict[str, list],
+        source: str | Path | None = None,
+    ) -> None:
+        """
+        Register the token set of a language.
+
+        Args:
+            language:
+                The name of the language.
+            tokens:
+                The token set.
+            source:
+                The JSON or binary model file the token set was read from,
+                used to parse it again after an eviction. If None, the
+                token set is never evicted.
+
+        """
+        with self._lock:
+            if source is None:
+                self._sources.pop(language, None)
+                self._pinned.add(language)
+            else:
+                self._sources[language] = Path(source)
+                self._pinned.discard(language)
+            self._insert(language, tokens)
+
+    def pin(self, language: str) -> None:
+        """
+        Keep the token set of a language in memory whatever the budget.
+
+        Args:
+            language:
+                The name of the language, parsed now if needed.
+
+        Raises:
+            KeyError:
+                If the language is unknown.
+
+        """
+        with self._lock:
+            self[language]
+            self._pinned.add(language)
+
+    def touch(self, language: str) -> None:
+        """
+        Mark the token set of a language as the most recently used one.
+
+        Lookups of data derived from a token set, such as a compiled pattern
+        found in a cache, call it so that eviction follows their use.
+
+        Args:
+            language:
+                The name of the language. Languages not in memory are left
+                alone.
+
+        """
+        with self._lock:
+            if language in self._tokens:
+                self._tokens.move_to_end(language)
+
+    def charge(self, language: str, nbytes: int) -> None:
+        """
+        Add the size of data derived from a token set to its own.
+
+        Data built from a token set, such as its junction table or the
+        patterns compiled against it, is then covered by the budget. The
+        charges are dropped with the token set; a negative charge releases
+        data dropped before it. Languages not in memory are not charged.
+
+        Args:
+            language:
+                The name of the language.
+            nbytes:
+                The number of bytes to add to the size of its token set.
+
+        """
+        with self._lock:
+            if language not in self._tokens:
+                return
+            nbytes = max(nbytes, -self._sizes[language])
+            self._sizes[language] += nbytes
+            self._bytes += nbytes
+            self._shrink(keep=language)
+
+    def get(self, language: str, default: Any = None) -> Any:
+        """
+        Return the token set of a language, parsing its file if needed.
+
+        Args:
+            language:
+                The name of the language.
+            default:
+                The value returned for unknown languages.
+
+        Returns:
+            Any:
+                The token set, or default.
+
+        Raises:
+            OSError:
+                If the file of the language cannot be read.
+            ValueError:
+                If the file of the language is not a valid token set file.
+
+        """
+        with self._lock:
+            tokens = self._tokens.get(language)
+            if tokens is not None:
+                self._tokens.move_to_end(language)
+                return tokens
+            path = self._path(language)
+            if path is None:
+                return default
+            tokens = _read_source(path)
+            self._insert(language, tokens)
+            return tokens
+
+    def available(self) -> list[str]:
+        """
+        List the languages that can be looked up.
+
+        Returns:
+            list[str]:
+                The names of the registered languages and of the languages
+                with a file in the data directory, sorted.
+
+        """
+        with self._lock:
+            names = set(self._tokens) | set(self._sources)
+        if self._data_dir is not None:
+            for suffix in _SUFFIXES:
+                names.update(path.stem for path in self._data_dir.glob(f"*{suffix}"))
+        return sorted(names)
+
+    def loaded(self) -> list[str]:
+        """
+        List the languages whose token set is in memory.
+
+        Returns:
+            list[str]:
+                The names of the languages in memory, sorted.
+
+        """
+        with self._lock:
+            return sorted(self._tokens)
+
+    def preload(self, languages: Iterable[str] | None = None) -> None:
+        """
+        Parse token sets ahead of their first use.
+
+        With a memory budget, token sets parsed first may be evicted by the
+        ones parsed after them.
+
+        Args:
+            languages:
+                The languages to parse, or None for all the available ones.
+
+        Raises:
+            KeyError:
+                If one of the languages is unknown.
+
+        """
+        for language in self.available() if languages is None else languages:
+            self[language]
+
+    def sizes(self) -> dict[str, int]:
+        """
+        Report the estimated size of each token set in memory.
+
+        Returns:
+            dict[str, int]:
+                The size in bytes of each loaded language, from the least
+                to the most recently used.
+
+        """
+        with self._lock:
+            return {language: self._sizes[language] for language in self._tokens}
+
+    def info(self) -> RegistryInfo:
+        """
+        Report the registry statistics.
+
+        Returns:
+            RegistryInfo:
+                The number of loaded languages, the eviction counter, and
+                the memory used and allowed.
+
+        """
+        with self._lock:
+            return RegistryInfo(
+                len(self._tokens), self._evictions, self._bytes, self._max_bytes
+            )
+
+    def resize(self, max_bytes: int | None) -> None:
+        """
+        Change the memory budget, evicting token sets if needed.
+
+        Args:
+            max_bytes:
+                The new budget in bytes, or None for no budget.
+
+        Raises:
+            ValueError:
+                If max_bytes is negative.
+
+        """
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"max_bytes must be non-negative, got {max_bytes}")
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._shrink()
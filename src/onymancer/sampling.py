@@ -0,0 +1,755 @@
+"""Exact constrained sampling from compiled patterns."""
+
+import random
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Callable
+from itertools import accumulate
+from typing import Any, cast
+
+from .alias import AliasTable
+from .pattern import CompiledPattern, _Choice, _Literal, _Node, _Token
+
+
+class _Position:
+    """
+    A point in the node tree, with the position to resume at once it ends.
+
+    Attributes:
+        nodes (tuple[_Node, ...]):
+            The node sequence being walked.
+        index (int):
+            The index of the next node in the sequence.
+        parent (_Position | None):
+            Where to continue after the sequence, or None at the end of the
+            pattern.
+        key (tuple):
+            A hashable identity for the position.
+
+    """
+
+    __slots__ = ("index", "key", "nodes", "parent")
+
+    def __init__(
+        self,
+        nodes: tuple[_Node, ...],
+        index: int,
+        parent: "_Position | None",
+    ) -> None:
+        self.nodes = nodes
+        self.index = index
+        self.parent = parent
+        self.key: tuple = (id(nodes), index, None if parent is None else parent.key)
+
+
+class _LengthAutomaton:
+    """
+    Track the length of the name built so far against length bounds.
+
+    States are lengths. Once the minimum is reached and there is no maximum,
+    longer lengths are folded into a single state.
+    """
+
+    def __init__(self, min_length: int | None, max_length: int | None) -> None:
+        """
+        Initialize the automaton.
+
+        Args:
+            min_length:
+                Minimum accepted length, or None.
+            max_length:
+                Maximum accepted length, or None.
+
+        """
+        self.min_length = min_length
+        self.max_length = max_length
+        self.start = 0
+
+    def advance(self, state: int, text: str) -> int | None:
+        """
+        Compute the state after appending some text.
+
+        Args:
+            state:
+                The current state.
+            text:
+                The appended text.
+
+        Returns:
+            int | None:
+                The new state, or None if the bounds can no longer be met.
+
+        """
+        length = state + len(text)
+        if self.max_length is not None:
+            return length if length <= self.max_length else None
+        if self.min_length is not None:
+            return min(length, self.min_length)
+        return 0
+
+    def accepts(self, state: int) -> bool:
+        """
+        Check whether a complete name in the given state is accepted.
+
+        Args:
+            state:
+                The final state.
+
+        Returns:
+            bool:
+                True if the name satisfies the bounds.
+
+        """
+        return self.min_length is None or state >= self.min_length
+
+
+class _PrefixAutomaton:
+    """
+    Track how much of a required prefix the name built so far has matched.
+
+    States count the matched characters; the full length means the prefix is
+    complete and any further text is accepted.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        """
+        Initialize the automaton.
+
+        Args:
+            prefix:
+                The required prefix.
+
+        """
+        self.prefix = prefix
+        self.start = 0
+
+    def advance(self, state: int, text: str) -> int | None:
+        """
+        Compute the state after appending some text.
+
+        Args:
+            state:
+                The current state.
+            text:
+                The appended text.
+
+        Returns:
+            int | None:
+                The new state, or None if the prefix can no longer match.
+
+        """
+        remaining = self.prefix[state:]
+        if not remaining:
+            return state
+        if len(text) >= len(remaining):
+            return len(self.prefix) if text.startswith(remaining) else None
+        return state + len(text) if remaining.startswith(text) else None
+
+    def accepts(self, state: int) -> bool:
+        """
+        Check whether a complete name in the given state is accepted.
+
+        Args:
+            state:
+                The final state.
+
+        Returns:
+            bool:
+                True if the whole prefix was matched.
+
+        """
+        return state == len(self.prefix)
+
+
+class _SubstringAutomaton:
+    """
+    Track occurrences of a string with a Knuth-Morris-Pratt automaton.
+
+    States are the length of the longest suffix of the name built so far that
+    is also a prefix of the string. In `contains` mode a full match is
+    absorbing; in suffix mode the match must hold at the very end.
+    """
+
+    def __init__(self, needle: str, absorbing: bool) -> None:
+        """
+        Initialize the automaton.
+
+        Args:
+            needle:
+                The string to look for.
+            absorbing:
+                Whether a full match is kept once found (`contains`) rather
+                than required at the end (`ends_with`).
+
+        """
+        self.needle = needle
+        self.absorbing = absorbing
+        self.start = 0
+        self._failure = [0] * (len(needle) + 1)
+        matched = 0
+        for index in range(1, len(needle)):
+            while matched and needle[index] != needle[matched]:
+                matched = self._failure[matched]
+            if needle[index] == needle[matched]:
+                matched += 1
+            self._failure[index + 1] = matched
+        self._steps: dict[tuple[int, str], int] = {}
+
+    def _step(self, state: int, character: str) -> int:
+        """
+        Compute the state after appending a single character.
+
+        Args:
+            state:
+                The current state.
+            character:
+                The appended character.
+
+        Returns:
+            int:
+                The new state.
+
+        """
+        key = (state, character)
+        result = self._steps.get(key)
+        if result is None:
+            needle = self.needle
+            result = state
+            if result == len(needle):
+                result = self._failure[result]
+            while result and needle[result] != character:
+                result = self._failure[result]
+            if result < len(needle) and needle[result] == character:
+                result += 1
+            self._steps[key] = result
+        return result
+
+    def advance(self, state: int, text: str) -> int:
+        """
+        Compute the state after appending some text.
+
+        Args:
+            state:
+                The current state.
+            text:
+                The appended text.
+
+        Returns:
+            int:
+                The new state.
+
+        """
+        final = len(self.needle)
+        for character in text:
+            if self.absorbing and state == final:
+                break
+            state = self._step(state, character)
+        return state
+
+    def accepts(self, state: int) -> bool:
+        """
+        Check whether a complete name in the given state is accepted.
+
+        Args:
+            state:
+                The final state.
+
+        Returns:
+            bool:
+                True if the string was found (or ends the name).
+
+        """
+        return state == len(self.needle)
+
+
+class _ProductAutomaton:
+    """
+    Run several automata side by side; a name must satisfy all of them.
+    """
+
+    def __init__(self, parts: list) -> None:
+        """
+        Initialize the automaton.
+
+        Args:
+            parts:
+                The automata to combine.
+
+        """
+        self.parts = parts
+        self.start = tuple(part.start for part in parts)
+
+    def advance(self, state: tuple, text: str) -> tuple | None:
+        """
+        Compute the state after appending some text.
+
+        Args:
+            state:
+                The current state, one entry per automaton.
+            text:
+                The appended text.
+
+        Returns:
+            tuple | None:
+                The new state, or None if any automaton rejects the text.
+
+        """
+        result = []
+        for part, part_state in zip(self.parts, state, strict=True):
+            part_state = part.advance(part_state, text)
+            if part_state is None:
+                return None
+            result.append(part_state)
+        return tuple(result)
+
+    def accepts(self, state: tuple) -> bool:
+        """
+        Check whether a complete name in the given state is accepted.
+
+        Args:
+            state:
+                The final state.
+
+        Returns:
+            bool:
+                True if every automaton accepts.
+
+        """
+        return all(
+            part.accepts(part_state)
+            for part, part_state in zip(self.parts, state, strict=True)
+        )
+
+
+class ConstrainedSampler:
+    """
+    Draw names from a compiled pattern conditioned on constraints.
+
+    Length bounds, a required prefix, a required suffix and a required
+    substring are tracked by small automata. For every point of the pattern
+    and every automaton state, the sampler computes the probability that the
+    rest of the pattern completes a valid name. Tokens are grouped into
+    buckets by the state they lead to (their length, how much of the prefix
+    they match, ...), and each draw picks a bucket in proportion to its share
+    of valid completions, then a token inside it, uniformly or by weight.
+    Names therefore follow exactly the distribution of generate-then-reject,
+    but every draw succeeds.
+    """
+
+    def __init__(
+        self,
+        compiled: CompiledPattern,
+        min_length: int | None = None,
+        max_length: int | None = None,
+        starts_with: str | None = None,
+        ends_with: str | None = None,
+        contains: str | None = None,
+    ) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            compiled:
+                The compiled pattern to draw from.
+            min_length:
+                Minimum length of the generated names, or None.
+            max_length:
+                Maximum length of the generated names, or None.
+            starts_with:
+                String that generated names must start with, or None.
+            ends_with:
+                String that generated names must end with, or None.
+            contains:
+                String that generated names must contain, or None.
+
+        """
+        self.compiled = compiled
+        parts: list = []
+        if min_length is not None or max_length is not None:
+            parts.append(_LengthAutomaton(min_length, max_length))
+        if starts_with:
+            parts.append(_PrefixAutomaton(starts_with))
+        if ends_with:
+            parts.append(_SubstringAutomaton(ends_with, absorbing=False))
+        if contains:
+            parts.append(_SubstringAutomaton(contains, absorbing=True))
+        if not parts:
+            parts.append(_LengthAutomaton(None, None))
+        self._automaton = parts[0] if len(parts) == 1 else _ProductAutomaton(parts)
+        # The sampler walks the node tree of the pattern.
+        self._root = _Position(compiled._nodes, 0, None)  # noqa: SLF001
+        self._tables: dict[tuple, tuple[float, list[float], list]] = {}
+        self._counts: dict[tuple, int] = {}
+
+    @property
+    def probability(self) -> float:
+        """
+        Probability that an unconstrained name satisfies the constraints.
+
+        Returns:
+            float:
+                The acceptance probability, 0.0 if the constraints cannot be
+                met by this pattern.
+
+        """
+        return self._value(self._root, self._automaton.start)
+
+    @property
+    def space_size(self) -> int:
+        """
+        Number of combinations of token and group choices that satisfy the
+        constraints.
+
+        This is an upper bound on the number of distinct valid names.
+
+        Returns:
+            int:
+                The size of the constrained output space.
+
+        """
+        return self._count(self._root, self._automaton.start)
+
+    def sample(
+        self,
+        rng: random.Random | None = None,
+        draws: dict[str, Counter] | None = None,
+    ) -> str:
+        """
+        Draw one name satisfying the constraints.
+
+        Args:
+            rng (random.Random | None):
+                The random generator to draw from. If None, the global
+                `random` module is used.
+            draws (dict[str, Counter] | None):
+                If given, the number of times each token is drawn, per
+                class, is counted in it.
+
+        Returns:
+            str:
+                The generated name.
+
+        Raises:
+            ValueError:
+                If no name of the pattern satisfies the constraints.
+
+        """
+        if self.probability == 0.0:
+            raise ValueError(
+                f"No name of pattern {self.compiled.pattern!r} satisfies the "
+                "constraints."
+            )
+        source = random if rng is None else rng
+        buffer: list[str] = []
+        position: _Position | None = self._root
+        state = self._automaton.start
+        while position is not None:
+            if position.index == len(position.nodes):
+                position = position.parent
+                continue
+            node = position.nodes[position.index]
+            following = _Position(position.nodes, position.index + 1, position.parent)
+            if isinstance(node, _Literal):
+                buffer.append(node.text)
+                state = self._automaton.advance(state, node.text)
+                position = following
+                continue
+            total, cumulative, entries = self._table(position, state)
+            entry = entries[bisect_right(cumulative, source.random() * total)]
+            if isinstance(node, _Token):
+                indices, state, alias = entry
+                if alias is None:
+                    index = source.choice(indices)
+                else:
+                    index = indices[alias.draw(source)]
+                buffer.append(node.tokens[index])
+                if draws is not None:
+                    draws[node.key][node.originals[index]] += 1
+                position = following
+            else:
+                position = entry
+        return "".join(buffer)
+
+    def _resolve(
+        self,
+        position: _Position,
+        state: Any,
+    ) -> tuple[_Position | None, Any]:
+        """
+        Walk past literals and sequence ends up to the next token or group.
+
+        Args:
+            position:
+                The current position.
+            state:
+                The automaton state, or None if already invalid.
+
+        Returns:
+            tuple[_Position | None, Any]:
+                The position of the next token or group, or None at the end of
+                the pattern, and the automaton state there, or None if the
+                name can no longer be valid.
+
+        """
+        current: _Position | None = position
+        while current is not None and state is not None:
+            if current.index == len(current.nodes):
+                current = current.parent
+                continue
+            node = current.nodes[current.index]
+            if not isinstance(node, _Literal):
+                break
+            state = self._automaton.advance(state, node.text)
+            current = _Position(current.nodes, current.index + 1, current.parent)
+        return current, state
+
+    def _outcomes(self, position: _Position, state: Any) -> list:
+        """
+        List the outcomes of a token or group node.
+
+        Args:
+            position:
+                The position of the node.
+            state:
+                The automaton state before the node.
+
+        Returns:
+            list:
+                For tokens, (state, indices) buckets grouping the indices of
+                the tokens by the state they lead to. For groups, the start
+                position of each branch.
+
+        """
+        node = position.nodes[position.index]
+        if isinstance(node, _Token):
+            buckets: dict[Any, list[int]] = {}
+            for index, token in enumerate(node.tokens):
+                next_state = self._automaton.advance(state, token)
+                buckets.setdefault(next_state, []).append(index)
+            return list(buckets.items())
+        following = _Position(position.nodes, position.index + 1, position.parent)
+        return [
+            _Position(branch, 0, following) for branch in cast("_Choice", node).branches
+        ]
+
+    def _fill(
+        self,
+        position: _Position,
+        state: Any,
+        memo: dict[tuple, Any],
+        build: Callable[[_Position, Any, list], Any],
+    ) -> Any:
+        """
+        Compute a memoized entry, along with the entries it depends on.
+
+        The entries of the nodes after a node are computed first, from the
+        end of the pattern backwards, with an explicit stack rather than
+        recursion, so long patterns do not exhaust the call stack.
+
+        Args:
+            position:
+                The position of a token or group node.
+            state:
+                The automaton state before the node.
+            memo:
+                The entries computed so far, by position key and state.
+            build:
+                Computes the entry of a node from its outcomes, once those of
+                the nodes they lead to are in the memo.
+
+        Returns:
+            Any:
+                The entry of the node.
+
+        """
+        stack: list[tuple[_Position, Any, list | None]] = [(position, state, None)]
+        while stack:
+            current, current_state, outcomes = stack.pop()
+            memo_key = (current.key, current_state)
+            if memo_key in memo:
+                continue
+            if outcomes is None:
+                outcomes = self._outcomes(current, current_state)
+                if isinstance(current.nodes[current.index], _Token):
+                    following = _Position(
+                        current.nodes, current.index + 1, current.parent
+                    )
+                    starts = [(following, next_state) for next_state, _ in outcomes]
+                else:
+                    starts = [(start, current_state) for start in outcomes]
+                missing = []
+                for start, start_state in starts:
+                    child, child_state = self._resolve(start, start_state)
+                    if (
+                        child is not None
+                        and child_state is not None
+                        and (child.key, child_state) not in memo
+                    ):
+                        missing.append((child, child_state, None))
+                if missing:
+                    # Come back to the node once the nodes after it are done.
+                    stack.append((current, current_state, outcomes))
+                    stack.extend(missing)
+                    continue
+            memo[memo_key] = build(current, current_state, outcomes)
+        return memo[(position.key, state)]
+
+    def _value(self, position: _Position, state: Any) -> float:
+        """
+        Probability that the rest of the pattern completes a valid name.
+
+        Args:
+            position:
+                The current position.
+            state:
+                The automaton state, or None if already invalid.
+
+        Returns:
+            float:
+                The completion probability.
+
+        """
+        current, state = self._resolve(position, state)
+        if state is None:
+            return 0.0
+        if current is None:
+            return 1.0 if self._automaton.accepts(state) else 0.0
+        return self._table(current, state)[0]
+
+    def _count(self, position: _Position, state: Any) -> int:
+        """
+        Count the combinations completing a valid name from a position.
+
+        Args:
+            position:
+                The current position.
+            state:
+                The automaton state, or None if already invalid.
+
+        Returns:
+            int:
+                The number of valid completions.
+
+        """
+        current, state = self._resolve(position, state)
+        if state is None:
+            return 0
+        if current is None:
+            return 1 if self._automaton.accepts(state) else 0
+        count = self._counts.get((current.key, state))
+        if count is None:
+            count = self._fill(current, state, self._counts, self._build_count)
+        return count
+
+    def _build_count(self, position: _Position, state: Any, outcomes: list) -> int:
+        """
+        Count the valid completions of a token or group node.
+
+        Args:
+            position:
+                The position of the node.
+            state:
+                The automaton state before the node.
+            outcomes:
+                The outcomes of the node, as returned by `_outcomes`.
+
+        Returns:
+            int:
+                The number of valid completions.
+
+        """
+        count = 0
+        if isinstance(position.nodes[position.index], _Token):
+            following = _Position(position.nodes, position.index + 1, position.parent)
+            for next_state, indices in outcomes:
+                count += len(indices) * self._count(following, next_state)
+        else:
+            for start in outcomes:
+                count += self._count(start, state)
+        return count
+
+    def _table(
+        self,
+        position: _Position,
+        state: Any,
+    ) -> tuple[float, list[float], list]:
+        """
+        Get the weighted outcomes of a token or group node.
+
+        Args:
+            position:
+                The position of the node.
+            state:
+                The automaton state before the node.
+
+        Returns:
+            tuple[float, list[float], list]:
+                The total weight, the cumulative weights with the last entry
+                nudged to infinity, and the outcome of each entry: a
+                (token indices, state, alias table) bucket for tokens, with an
+                alias table drawing weighted tokens or None, or the branch
+                position for groups.
+
+        """
+        table = self._tables.get((position.key, state))
+        if table is None:
+            table = self._fill(position, state, self._tables, self._build_table)
+        return table
+
+    def _build_table(
+        self,
+        position: _Position,
+        state: Any,
+        outcomes: list,
+    ) -> tuple[float, list[float], list]:
+        """
+        Build the weighted outcomes of a token or group node.
+
+        Args:
+            position:
+                The position of the node.
+            state:
+                The automaton state before the node.
+            outcomes:
+                The outcomes of the node, as returned by `_outcomes`.
+
+        Returns:
+            tuple[float, list[float], list]:
+                The weighted outcomes, as returned by `_table`.
+
+        """
+        node = position.nodes[position.index]
+        weights: list[float] = []
+        entries: list = []
+        if isinstance(node, _Token):
+            following = _Position(position.nodes, position.index + 1, position.parent)
+            token_weights = node.weights
+            if token_weights is None:
+                share = 1.0 / len(node.tokens)
+            else:
+                share = 1.0 / sum(token_weights)
+            for next_state, indices in outcomes:
+                alias = None
+                bucket_weight: float
+                if token_weights is None:
+                    bucket_weight = len(indices)
+                else:
+                    bucket_weights = [token_weights[index] for index in indices]
+                    bucket_weight = sum(bucket_weights)
+                    alias = AliasTable(bucket_weights)
+                weight = share * bucket_weight * self._value(following, next_state)
+                if weight > 0.0:
+                    weights.append(weight)
+                    entries.append((tuple(indices), next_state, alias))
+        else:
+            share = 1.0 / len(outcomes)
+            for start in outcomes:
+                weight = share * self._value(start, state)
+                if weight > 0.0:
+                    weights.append(weight)
+                    entries.append(start)
+        cumulative = list(accumulate(weights))
+        if cumulative:
+            # Guard against rounding so the last entry is always reachable.
+            cumulative[-1] = float("inf")
+        return (sum(weights), cumulative, entries)
@@ -0,0 +1,537 @@
+"""Asynchronous HTTP/JSON name generation service."""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
+from http import HTTPStatus
+from typing import Any, cast
+from urllib.parse import urlsplit
+
+from . import namegen
+
+# Options accepted by the endpoints, besides the pattern.
+_GENERATE_OPTIONS = frozenset({"seed", "language"})
+_BATCH_OPTIONS = frozenset(
+    {
+        "count",
+        "seed",
+        "language",
+        "min_length",
+        "max_length",
+        "starts_with",
+        "ends_with",
+        "contains",
+        "min_pronounceability",
+        "unique",
+        "max_attempts",
+        "timeout",
+    }
+)
+
+# Batch options whose cost does not depend on the count alone: constrained
+# batches may draw many candidates per name, or build a sampler for long
+# patterns, so they are always generated in the executor.
+_CONSTRAINTS = frozenset(
+    {
+        "min_length",
+        "max_length",
+        "starts_with",
+        "ends_with",
+        "contains",
+        "min_pronounceability",
+        "unique",
+    }
+)
+
+# Types of the parameters, checked before any generation. Integers are
+# accepted for floats, booleans only for booleans.
+_PARAM_TYPES: dict[str, tuple[type, ...]] = {
+    "pattern": (str,),
+    "count": (int,),
+    "seed": (int,),
+    "language": (str,),
+    "min_length": (int,),
+    "max_length": (int,),
+    "starts_with": (str,),
+    "ends_with": (str,),
+    "contains": (str,),
+    "min_pronounceability": (int, float),
+    "unique": (bool,),
+    "max_attempts": (int,),
+    "timeout": (int, float),
+}
+
+# Parameters that must not be negative.
+_NON_NEGATIVE = frozenset({"count", "max_attempts", "timeout"})
+
+# Largest request body read, in bytes.
+_MAX_BODY = 64 * 1024
+
+_logger = logging.getLogger(__name__)
+
+
+class _RequestError(ValueError):
+    """A request the client has to fix, answered with a 400 response."""
+
+
+class NameService:
+    """
+    The name generation endpoints, independent of the transport.
+
+    Every request draws from its own generator: seeded requests from one
+    seeded with the request seed, the others from a freshly seeded one, so
+    concurrent requests never share random state. Batches of at least
+    `offload_threshold` names, and constrained batches of any size, are
+    generated in an executor, so the event loop keeps serving other requests
+    meanwhile. Invalid parameters are answered with a 400 response; any other
+    failure is logged and answered with a 500 response.
+
+    Identical seeded requests always produce the same names, so concurrent
+    ones are coalesced: while a request is being computed, the same request
+    waits for its result instead of computing it again.
+
+    Attributes:
+        coalesced (int):
+            Number of requests answered with the result of a concurrent
+            identical request.
+
+    """
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        offload_threshold: int = 1000,
+        max_count: int = 100_000,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            executor:
+                The executor large batches are generated in. If None, a
+                thread pool owned by the service is created on first use.
+                A process pool keeps the event loop free of generation
+                work entirely, but its workers only know the bundled
+                languages.
+            offload_threshold:
+                The number of names from which an unconstrained batch is
+                generated in the executor.
+            max_count:
+                The largest number of names a request may ask for.
+
+        """
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._offload_threshold = offload_threshold
+        self._max_count = max_count
+        self._pending: dict[tuple[str, str], asyncio.Future] = {}
+        self.coalesced = 0
+
+    def close(self) -> None:
+        """
+        Shut down the thread pool created by the service, if any.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, function: Callable[[], Any], offload: bool) -> Any:
+        """
+        Run a generation function, in the executor for large jobs.
+
+        Args:
+            function:
+                The function to run.
+            offload:
+                Whether to run it in the executor.
+
+        Returns:
+            Any:
+                The result of the function.
+
+        """
+        if not offload:
+            return function()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="onymancer")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function)
+
+    async def _coalesce(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        function: Callable[[], Any],
+        offload: bool,
+    ) -> Any:
+        """
+        Run a request, sharing the computation of identical seeded ones.
+
+        Args:
+            endpoint:
+                The name of the endpoint.
+            params:
+                The parameters of the request.
+            function:
+                The function computing the result.
+            offload:
+                Whether to run it in the executor.
+
+        Returns:
+            Any:
+                The result of the function.
+
+        """
+        if params.get("seed") is None:
+            return await self._run(function, offload)
+        key = (endpoint, json.dumps(params, sort_keys=True))
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(function, offload))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.coalesced += 1
+        # A client going away must not cancel the work others wait for.
+        return await asyncio.shield(task)
+
+    def _parse(self, body: bytes, options: frozenset[str]) -> dict[str, Any]:
+        """
+        Decode and check the parameters of a request.
+
+        Args:
+            body:
+                The JSON body of the request.
+            options:
+                The parameters accepted besides the pattern.
+
+        Returns:
+            dict[str, Any]:
+                The parameters.
+
+        Raises:
+            _RequestError:
+                If the body is not a JSON object with a pattern, or holds an
+                unknown parameter or a value of the wrong type or sign.
+
+        """
+        try:
+            params = json.loads(body or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError) as error:
+            raise _RequestError(f"Invalid JSON body: {error}") from None
+        if not isinstance(params, dict):
+            raise _RequestError("The body must be a JSON object.")
+        if params.get("pattern") is None:
+            raise _RequestError("The 'pattern' parameter is required.")
+        unknown = set(params) - options - {"pattern"}
+        if unknown:
+            raise _RequestError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        for name, value in params.items():
+            if value is None:
+                continue
+            types = _PARAM_TYPES[name]
+            if not isinstance(value, types) or (
+                isinstance(value, bool) and bool not in types
+            ):
+                kind = " or ".join(kind.__name__ for kind in types)
+                raise _RequestError(f"The {name!r} parameter must be a {kind}.")
+            if name in _NON_NEGATIVE and cast("float", value) < 0:
+                raise _RequestError(f"The {name!r} parameter must not be negative.")
+        return params
+
+    async def generate(self, body: bytes) -> dict[str, Any]:
+        """
+        Handle a request for a single name.
+
+        Args:
+            body:
+                The JSON body, with `pattern` and optional `seed` and
+                `language`.
+
+        Returns:
+            dict[str, Any]:
+                The response, holding the name under "name".
+
+        Raises:
+            _RequestError:
+                If the request is invalid.
+
+        """
+        params = self._parse(body, _GENERATE_OPTIONS)
+        options = dict(params)
+        if options.get("seed") is None:
+            options.pop("seed", None)
+            options["rng"] = random.Random()
+        name = await self._coalesce(
+            "generate", params, partial(namegen.generate, **options), False
+        )
+        return {"name": name}
+
+    async def generate_batch(self, body: bytes) -> dict[str, Any]:
+        """
+        Handle a request for several names.
+
+        Args:
+            body:
+                The JSON body, with `pattern`, `count` and the optional
+                seed, language and constraints of `generate_batch`.
+
+        Returns:
+            dict[str, Any]:
+                The response, holding the names under "names".
+
+        Raises:
+            _RequestError:
+                If the request is invalid.
+
+        """
+        params = self._parse(body, _BATCH_OPTIONS)
+        count = params.get("count")
+        if count is None or count > self._max_count:
+            raise _RequestError(
+                f"The 'count' parameter must be between 0 and {self._max_count}."
+            )
+        offload = count >= self._offload_threshold or any(
+            params.get(name) for name in _CONSTRAINTS
+        )
+        if params.get("unique"):
+            space = await self._run(
+                partial(
+                    namegen.pattern_space_size,
+                    params["pattern"],
+                    params.get("language") or "default",
+                    **{
+                        name: params.get(name)
+                        for name in (
+                            "min_length",
+                            "max_length",
+                            "starts_with",
+                            "ends_with",
+                            "contains",
+                        )
+                    },
+                ),
+                offload,
+            )
+            if 0 < space < count:
+                raise _RequestError(
+                    f"Cannot generate {count} unique names: the pattern and "
+                    f"constraints allow at most {space}."
+                )
+        options = dict(params)
+        if options.get("seed") is None:
+            options.pop("seed", None)
+            options["rng"] = random.Random()
+        names = await self._coalesce(
+            "generate_batch",
+            params,
+            partial(namegen.generate_batch, **options),
+            offload,
+        )
+        return {"names": names}
+
+    async def handle(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        """
+        Route a request to its endpoint.
+
+        Args:
+            method:
+                The HTTP method.
+            target:
+                The request target, a path with an optional query string.
+            body:
+                The request body.
+
+        Returns:
+            tuple[HTTPStatus, dict[str, Any]]:
+                The status and the JSON payload of the response.
+
+        """
+        routes = {
+            "/generate": self.generate,
+            "/generate_batch": self.generate_batch,
+        }
+        path = urlsplit(target).path
+        if path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        endpoint = routes.get(path)
+        if endpoint is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST."}
+        try:
+            return HTTPStatus.OK, await endpoint(body)
+        except _RequestError as error:
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except Exception:
+            # Any other failure is the server's, whatever its type.
+            _logger.exception("Failed to handle %s %s", method, path)
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            return status, {"error": status.phrase}
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve the HTTP/1.1 requests of a connection.
+
+        Args:
+            reader:
+                The stream the requests are read from.
+            writer:
+                The stream the responses are written to.
+
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers: dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if len(parts) != 3 or not 0 <= length <= _MAX_BODY:
+                    status = HTTPStatus.BAD_REQUEST
+                    if length > _MAX_BODY:
+                        status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                    self._respond(writer, status, {"error": status.phrase}, False)
+                    await writer.drain()
+                    break
+                method, target, version = parts
+                body = await reader.readexactly(length)
+                status, payload = await self.handle(method, target, body)
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    def _respond(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: dict[str, Any],
+        keep_alive: bool,
+    ) -> None:
+        """
+        Write a JSON response.
+
+        Args:
+            writer:
+                The stream to write to.
+            status:
+                The status of the response.
+            payload:
+                The JSON payload.
+            keep_alive:
+                Whether the connection stays open for other requests.
+
+        """
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+
+async def start_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    service: NameService | None = None,
+) -> asyncio.Server:
+    """
+    Start serving the name generation endpoints.
+
+    The server answers `POST /generate` and `POST /generate_batch`, whose
+    JSON bodies take the arguments of `generate` and `generate_batch`, and
+    `GET /health`.
+
+    Args:
+        host:
+            The address to listen on, the local host by default.
+        port:
+            The port to listen on, 0 to pick a free one.
+        service:
+            The service answering the requests. If None, one with the
+            default settings is created.
+
+    Returns:
+        asyncio.Server:
+            The running server.
+
+    """
+    if service is None:
+        service = NameService()
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the server until interrupted.
+
+    Args:
+        argv:
+            The command-line arguments, or None to use `sys.argv`.
+
+    Returns:
+        int:
+            The exit status.
+
+    """
+    parser = argparse.ArgumentParser(description="Serve onymancer over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind")
+    parser.add_argument("--port", type=int, default=8000, help="port to bind")
+    parser.add_argument(
+        "--preload", nargs="*", metavar="LANGUAGE", help="languages to parse first"
+    )
+    args = parser.parse_args(argv)
+    if args.preload is not None:
+        namegen.preload(args.preload or None)
+
+    async def serve() -> None:
+        service = NameService()
+        server = await start_server(args.host, args.port, service)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            service.close()
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(serve())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
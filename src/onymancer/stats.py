@@ -0,0 +1,192 @@
+"""Opt-in statistics about name generation."""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+# Reasons a candidate name is rejected, in the order they are checked.
+REJECTION_REASONS = (
+    "length",
+    "starts_with",
+    "ends_with",
+    "contains",
+    "pronounceability",
+    "duplicate",
+)
+
+# Upper bounds of the name length histogram buckets. The bounds must not
+# change between scrapes, so they are fixed rather than taken from the data.
+LENGTH_BUCKETS = (2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 14, 16, 20, 24, 32)
+
+
+def _label(value: object) -> str:
+    """
+    Escape a Prometheus label value.
+
+    Args:
+        value:
+            The value of the label.
+
+    Returns:
+        str:
+            The value with backslashes, quotes and newlines escaped.
+
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class GenerationStats:
+    """
+    Counters filled by `generate_batch` and `iter_names` when given one.
+
+    The same object can be passed to several calls to accumulate their
+    counters. Collecting them costs a little time per name, so they are
+    only collected on request.
+
+    With the Python engine, length and character constraints are met by
+    construction, so their rejection counters stay at zero; the NumPy
+    engine filters candidates and counts them. Token draws are not counted
+    by the NumPy engine.
+
+    Attributes:
+        attempts (int):
+            Number of candidate names drawn.
+        accepted (int):
+            Number of names returned.
+        rejections (Counter[str]):
+            Number of candidates rejected, keyed by the first constraint
+            they failed, one of `REJECTION_REASONS`.
+        token_draws (defaultdict[str, Counter[str]]):
+            Number of times each token was drawn, keyed by token class, then
+            by the token as written in the token set, so capitalized draws
+            are counted with the others.
+        lengths (Counter[int]):
+            Number of returned names of each length.
+        generation_seconds (float):
+            Time spent drawing candidates.
+        scoring_seconds (float):
+            Time spent scoring the pronounceability of candidates.
+
+    """
+
+    attempts: int = 0
+    accepted: int = 0
+    rejections: Counter = field(default_factory=Counter)
+    token_draws: defaultdict = field(default_factory=lambda: defaultdict(Counter))
+    lengths: Counter = field(default_factory=Counter)
+    generation_seconds: float = 0.0
+    scoring_seconds: float = 0.0
+
+    @property
+    def acceptance_rate(self) -> float:
+        """
+        Fraction of candidates that were returned.
+
+        Returns:
+            float:
+                The acceptance rate, or 0.0 if nothing was drawn.
+
+        """
+        return self.accepted / self.attempts if self.attempts else 0.0
+
+    def merge(self, other: "GenerationStats") -> None:
+        """
+        Add the counters of another statistics object to this one.
+
+        Args:
+            other:
+                The statistics to add, such as those collected by a worker
+                process.
+
+        """
+        self.attempts += other.attempts
+        self.accepted += other.accepted
+        self.rejections.update(other.rejections)
+        for key, counts in other.token_draws.items():
+            self.token_draws[key].update(counts)
+        self.lengths.update(other.lengths)
+        self.generation_seconds += other.generation_seconds
+        self.scoring_seconds += other.scoring_seconds
+
+    def to_prometheus(self, prefix: str = "onymancer") -> str:
+        """
+        Export the counters in the Prometheus text exposition format.
+
+        Args:
+            prefix:
+                The prefix of the metric names.
+
+        Returns:
+            str:
+                The metrics, ready to be served on a `/metrics` endpoint.
+
+        """
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, text: str, samples: list[str]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(samples)
+
+        metric(
+            "attempts_total",
+            "counter",
+            "Candidate names drawn.",
+            [f"{prefix}_attempts_total {self.attempts}"],
+        )
+        metric(
+            "accepted_total",
+            "counter",
+            "Names returned.",
+            [f"{prefix}_accepted_total {self.accepted}"],
+        )
+        metric(
+            "rejections_total",
+            "counter",
+            "Candidate names rejected, by failed constraint.",
+            [
+                f'{prefix}_rejections_total{{constraint="{reason}"}} '
+                f"{self.rejections[reason]}"
+                for reason in REJECTION_REASONS
+            ],
+        )
+        metric(
+            "token_draws_total",
+            "counter",
+            "Tokens drawn, by token class.",
+            [
+                f'{prefix}_token_draws_total{{key="{_label(key)}",'
+                f'token="{_label(token)}"}} {count}'
+                for key, counts in sorted(self.token_draws.items())
+                for token, count in sorted(counts.items())
+            ],
+        )
+        metric(
+            "seconds_total",
+            "counter",
+            "Time spent generating names, by phase.",
+            [
+                (
+                    f'{prefix}_seconds_total{{phase="generation"}} '
+                    f"{self.generation_seconds!r}"
+                ),
+                (
+                    f'{prefix}_seconds_total{{phase="scoring"}} '
+                    f"{self.scoring_seconds!r}"
+                ),
+            ],
+        )
+        total = sum(self.lengths.values())
+        buckets = [
+            f'{prefix}_name_length_bucket{{le="{bound}"}} '
+            f"{sum(n for length, n in self.lengths.items() if length <= bound)}"
+            for bound in LENGTH_BUCKETS
+        ]
+        buckets.append(f'{prefix}_name_length_bucket{{le="+Inf"}} {total}')
+        buckets.append(
+            f"{prefix}_name_length_sum "
+            f"{sum(length * count for length, count in self.lengths.items())}"
+        )
+        buckets.append(f"{prefix}_name_length_count {total}")
+        metric("name_length", "histogram", "Length of the returned names.", buckets)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,292 @@
+"""NumPy-backed batch generation engine."""
+
+import random
+import time
+
+from .budget import AttemptBudget
+from .dedup import BloomFilter, SeenSet
+from .pattern import CompiledPattern, _Choice, _Literal, _Node, _Token
+from .pronounceability import score_pronounceability_batch
+from .stats import GenerationStats
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+
+def is_available() -> bool:
+    """
+    Check whether the NumPy engine can be used.
+
+    Returns:
+        bool:
+            True if NumPy is installed, False otherwise.
+
+    """
+    return np is not None
+
+
+def _make_generator(seed: int | None, rng: random.Random | None):
+    """
+    Create the NumPy generator used for a batch.
+
+    Args:
+        seed:
+            The seed for random number generation, if any.
+        rng:
+            The random generator supplied by the caller, if any. It is used
+            to derive the NumPy seed.
+
+    Returns:
+        numpy.random.Generator:
+            The generator to draw from.
+
+    """
+    if seed is None:
+        seed = (rng or random).getrandbits(64)
+    return np.random.default_rng(seed)
+
+
+def _token_table(node: _Token) -> tuple:
+    """
+    Encode the tokens of a node as arrays.
+
+    Args:
+        node:
+            The token node.
+
+    Returns:
+        tuple:
+            The token array, and the thresholds and aliases of the node's
+            alias table as arrays, or None for unweighted tokens.
+
+    """
+    tokens = np.array(node.tokens)
+    if node.alias is None:
+        return tokens, None, None
+    return (
+        tokens,
+        np.array(node.alias.thresholds),
+        np.array(node.alias.aliases, dtype=np.intp),
+    )
+
+
+def _sample(nodes: tuple[_Node, ...], size: int, generator, tables: dict):
+    """
+    Generate a column of names from a node sequence.
+
+    Args:
+        nodes:
+            The compiled nodes to generate from.
+        size:
+            The number of names to generate.
+        generator (numpy.random.Generator):
+            The generator used to draw token and branch indices.
+        tables (dict):
+            Token tables keyed by token node identity, filled on first use.
+
+    Returns:
+        numpy.ndarray:
+            A unicode array holding the generated names.
+
+    """
+    names = np.zeros(size, dtype="<U1")
+    for node in nodes:
+        if isinstance(node, _Literal):
+            names = np.char.add(names, node.text)
+        elif isinstance(node, _Token):
+            table = tables.get(id(node))
+            if table is None:
+                table = tables[id(node)] = _token_table(node)
+            tokens, thresholds, aliases = table
+            if thresholds is None:
+                indices = generator.integers(0, len(tokens), size=size)
+            else:
+                # Vectorized alias method: a column and a height per draw.
+                values = generator.random(size) * len(tokens)
+                columns = values.astype(np.intp)
+                indices = np.where(
+                    values - columns < thresholds[columns], columns, aliases[columns]
+                )
+            names = np.char.add(names, tokens[indices])
+        else:
+            names = np.char.add(names, _sample_choice(node, size, generator, tables))
+    return names
+
+
+def _sample_choice(node: _Choice, size: int, generator, tables: dict):
+    """
+    Generate a column of names from a group, one branch draw per name.
+
+    Args:
+        node:
+            The choice node to generate from.
+        size:
+            The number of names to generate.
+        generator (numpy.random.Generator):
+            The generator used to draw token and branch indices.
+        tables (dict):
+            Token tables keyed by token node identity, filled on first use.
+
+    Returns:
+        numpy.ndarray:
+            A unicode array holding the generated parts.
+
+    """
+    picks = generator.integers(0, len(node.branches), size=size)
+    parts = []
+    for index, branch in enumerate(node.branches):
+        mask = picks == index
+        count = int(mask.sum())
+        if count:
+            parts.append((mask, _sample(branch, count, generator, tables)))
+    width = max((part.dtype.itemsize // 4 for _, part in parts), default=1)
+    result = np.zeros(size, dtype=f"<U{max(width, 1)}")
+    for mask, part in parts:
+        result[mask] = part
+    return result
+
+
+def generate_batch(
+    compiled: CompiledPattern,
+    count: int,
+    seed: int | None = None,
+    rng: random.Random | None = None,
+    min_length: int | None = None,
+    max_length: int | None = None,
+    starts_with: str | None = None,
+    ends_with: str | None = None,
+    contains: str | None = None,
+    min_pronounceability: float | None = None,
+    seen: SeenSet | BloomFilter | None = None,
+    stats: GenerationStats | None = None,
+    budget: AttemptBudget | None = None,
+) -> list[str]:
+    """
+    Generate names in bulk with NumPy.
+
+    Token indices for whole columns of names are drawn at once and the names
+    are assembled from pre-encoded token arrays. Length and character
+    constraints are applied as array masks, and survivors are scored for
+    pronounceability in bulk. The output follows its own random stream, so
+    it differs from the Python engine for the same seed.
+
+    Args:
+        compiled:
+            The compiled pattern to generate from.
+        count:
+            Number of names to generate.
+        seed:
+            Optional seed for reproducibility.
+        rng:
+            Random generator used to derive the NumPy seed when no seed is
+            given. If None, the global `random` module is used.
+        min_length:
+            Minimum length constraint for generated names.
+        max_length:
+            Maximum length constraint for generated names.
+        starts_with:
+            String that generated names must start with.
+        ends_with:
+            String that generated names must end with.
+        contains:
+            String that generated names must contain.
+        min_pronounceability:
+            Minimum pronounceability score (0.0-1.0) for generated names.
+        seen:
+            The record of names already returned when names must be unique,
+            or None.
+        stats:
+            If given, the attempts, rejections, timings and name lengths of
+            the call are added to it. Token draws are not counted.
+        budget:
+            The budget bounding the number of candidates drawn, checked
+            after each batch. If None, an adaptive budget with no cap is
+            used.
+
+    Returns:
+        list[str]:
+            List of generated names that meet all specified constraints. May
+            return fewer than 'count' names if the budget runs out.
+
+    Raises:
+        RuntimeError:
+            If NumPy is not installed.
+
+    """
+    if np is None:
+        raise RuntimeError("The NumPy engine requires numpy to be installed.")
+    if budget is None:
+        budget = AttemptBudget()
+    generator = _make_generator(seed, rng)
+    tables: dict = {}
+    names: list[str] = []
+    attempts = 0
+    accepted = 0
+    while len(names) < count and budget.allows(attempts, len(names)):
+        needed = count - len(names)
+        # Oversample by the inverse of the acceptance rate observed so far,
+        # by at most ten times the number of names still needed.
+        rate = accepted / attempts if accepted else 1.0 / (attempts + 1)
+        size = max(needed, min(int(needed / rate) + 1, needed * 10))
+        if budget.max_attempts is not None:
+            size = min(size, budget.max_attempts - attempts)
+        start = time.perf_counter()
+        # The engine draws from the node tree of the pattern.
+        batch = _sample(compiled._nodes, size, generator, tables)  # noqa: SLF001
+        attempts += size
+        checks = []
+        if min_length is not None or max_length is not None:
+            lengths = np.char.str_len(batch)
+            fits = np.ones(size, dtype=bool)
+            if min_length is not None:
+                fits &= lengths >= min_length
+            if max_length is not None:
+                fits &= lengths <= max_length
+            checks.append(("length", fits))
+        if starts_with is not None:
+            checks.append(("starts_with", np.char.startswith(batch, starts_with)))
+        if ends_with is not None:
+            checks.append(("ends_with", np.char.endswith(batch, ends_with)))
+        if contains is not None:
+            checks.append(("contains", np.char.find(batch, contains) >= 0))
+        mask = np.ones(size, dtype=bool)
+        for reason, fits in checks:
+            if stats is not None:
+                stats.rejections[reason] += int(np.count_nonzero(mask & ~fits))
+            mask &= fits
+        candidates = batch[mask].tolist()
+        drawn = time.perf_counter()
+        if min_pronounceability is not None:
+            scores = score_pronounceability_batch(candidates, engine="numpy")
+            scored = len(candidates)
+            candidates = [
+                name
+                for name, score in zip(candidates, scores, strict=True)
+                if score >= min_pronounceability
+            ]
+            if stats is not None:
+                stats.rejections["pronounceability"] += scored - len(candidates)
+        scoring = time.perf_counter() - drawn
+        if seen is not None:
+            fresh: list[str] = []
+            checked = 0
+            for name in candidates:
+                if len(fresh) == needed:
+                    break
+                checked += 1
+                if seen.add(name):
+                    fresh.append(name)
+            if stats is not None:
+                stats.rejections["duplicate"] += checked - len(fresh)
+            candidates = fresh
+        accepted += len(candidates)
+        names.extend(candidates[:needed])
+        if stats is not None:
+            stats.attempts += size
+            stats.accepted += min(len(candidates), needed)
+            stats.lengths.update(map(len, candidates[:needed]))
+            stats.generation_seconds += drawn - start
+            stats.scoring_seconds += scoring
+    return names
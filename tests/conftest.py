@@ -0,0 +1,31 @@
+"""Fixtures shared by the tests."""
+
+from collections.abc import Iterator
+
+import pytest
+
+from onymancer import namegen
+
+
+@pytest.fixture(autouse=True)
+def _restore_global_state() -> Iterator[None]:
+    """
+    Restore the global token sets and memory bounds after each test.
+
+    Tests change the default token map, load languages and resize the caches
+    of the module. Whatever they do, the next test starts from the same
+    state.
+    """
+    tokens = dict(namegen._token_map)
+    languages = set(namegen._language_tokens.available())
+    cache_size = namegen.cache_info().maxsize
+    budget = namegen.language_info().maxbytes
+    yield
+    namegen.set_cache_maxsize(cache_size)
+    namegen.set_language_budget(budget)
+    for language in set(namegen._language_tokens.available()) - languages:
+        del namegen._language_tokens[language]
+        namegen._invalidate_compiled(language)
+    if namegen._token_map != tokens:
+        namegen._token_map.clear()
+        namegen.set_tokens(tokens)
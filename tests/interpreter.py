@@ -0,0 +1,221 @@
+"""
+Reference interpreter of the pattern language.
+
+The character-by-character interpreter below is the reference definition of
+the pattern language. Generation goes through CompiledPattern, which must
+produce the same output for the same random state.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+from onymancer import namegen
+from onymancer.alias import AliasTable, split_weights
+
+
+@dataclass
+class _OptionT:
+    """
+    Struct that encapsulates all the state options.
+
+    Attributes:
+        capitalize (bool):
+            Whether to capitalize the next character.
+        emit_literal (bool):
+            Whether to emit characters as literals.
+        inside_group (bool):
+            Whether currently inside a group.
+        current_option (str):
+            The current option being built.
+        options (list[str]):
+            The list of options in the current group.
+        language (str):
+            The language token set to use.
+
+    """
+
+    capitalize: bool = field(
+        default=False,
+        metadata={"description": "Whether to capitalize the next character."},
+    )
+    emit_literal: bool = field(
+        default=False,
+        metadata={"description": "Whether to emit characters as literals."},
+    )
+    inside_group: bool = field(
+        default=False, metadata={"description": "Whether currently inside a group."}
+    )
+    current_option: str = field(
+        default="", metadata={"description": "The current option being built."}
+    )
+    options: list[str] = field(
+        default_factory=list,
+        metadata={"description": "The list of options in the current group."},
+    )
+    language: str = field(
+        default="default",
+        metadata={"description": "The language token set to use."},
+    )
+
+
+def _capitalize_and_clear(options: _OptionT, character: str) -> str:
+    """
+    Capitalize the given character if capitalize is True.
+
+    Args:
+        options:
+            The current state options.
+        character:
+            The input character.
+
+    Returns:
+        str:
+            The capitalized character if capitalize is True, else the original.
+
+    """
+    if options.capitalize:
+        options.capitalize = False
+        return character.upper()
+    return character
+
+
+def _process_token(
+    options: _OptionT,
+    buffer: list[str],
+    key: str,
+    rng: random.Random | None = None,
+) -> bool:
+    """
+    Process a token based on the provided key and append it to the buffer.
+
+    Args:
+        options:
+            The current state options.
+        buffer:
+            The string buffer where the processed token will be appended.
+        key:
+            The key representing the type of token to process.
+        rng:
+            The random generator to draw from. If None, the global `random`
+            module is used.
+
+    Returns:
+        bool:
+            True on success, False otherwise.
+
+    """
+    if options.language == "default":
+        tokens = namegen._token_map.get(key, [])
+    else:
+        token_map = namegen._language_tokens.get(options.language, {})
+        tokens = token_map.get(key, [])
+    if not tokens:
+        buffer.append(_capitalize_and_clear(options, key))
+    else:
+        tokens, weights = split_weights(tokens)
+        if weights is None:
+            token = (rng or random).choice(tokens)
+        else:
+            token = tokens[AliasTable(weights).draw(rng)]
+        it = iter(token)
+        first_char = next(it, "")
+        buffer.append(_capitalize_and_clear(options, first_char))
+        buffer.extend(it)
+    return True
+
+
+def _process_character(
+    options: _OptionT,
+    buffer: list[str],
+    character: str,
+    rng: random.Random | None = None,
+) -> bool:
+    """
+    Process a character from the pattern and append it to the buffer.
+
+    Args:
+        options:
+            The current state options.
+        buffer:
+            The string buffer where the processed character will be appended.
+        character:
+            The character to process.
+        rng:
+            The random generator to draw from. If None, the global `random`
+            module is used.
+
+    Returns:
+        bool:
+            True on success, False otherwise.
+
+    """
+    if character == "(":
+        if options.inside_group:
+            options.current_option += character
+        else:
+            options.emit_literal = True
+    elif character == ")":
+        if options.inside_group:
+            options.current_option += character
+        else:
+            options.emit_literal = False
+    elif character == "<":
+        options.inside_group = True
+        options.options.clear()
+        options.current_option = ""
+    elif character == "|":
+        options.options.append(options.current_option)
+        options.current_option = ""
+    elif character == ">":
+        options.inside_group = False
+        options.options.append(options.current_option)
+        options.current_option = ""
+        # Ensure there's at least one option in the group.
+        if not options.options:
+            return False
+        # Randomly pick an option.
+        option = (rng or random).choice(options.options)
+        # Process and append the selected option.
+        for token in option:
+            if not _process_character(options, buffer, token, rng):
+                return False
+        # Clear options after processing the group.
+        options.options.clear()
+    elif character == "!":
+        if options.inside_group:
+            options.current_option += character
+        else:
+            options.capitalize = True
+    elif options.inside_group:
+        options.current_option += character
+    elif options.emit_literal:
+        buffer.append(_capitalize_and_clear(options, character))
+    elif not _process_token(options, buffer, character, rng):
+        return False
+    return True
+
+
+def interpret(pattern: str, seed: int, language: str = "default") -> str:
+    """
+    Run the reference interpreter on a pattern.
+
+    Args:
+        pattern:
+            The pattern to interpret.
+        seed:
+            The seed of the global `random` module, which the interpreter
+            draws from.
+        language:
+            The language token set to use.
+
+    Returns:
+        str:
+            The generated name.
+
+    """
+    random.seed(seed)
+    options = _OptionT(language=language)
+    buffer: list[str] = []
+    for character in pattern:
+        _process_character(options, buffer, character)
+    return "".join(buffer)
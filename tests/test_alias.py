@@ -0,0 +1,51 @@
+"""Tests for weighted token lists and alias tables."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from onymancer.alias import AliasTable, split_weights
+
+
+def test_alias_table_distribution() -> None:
+    """Test that indices are drawn in proportion to their weights."""
+    table = AliasTable([5, 1, 0.5, 3.5])
+    rng = random.Random(0)
+    counts = Counter(table.draw(rng) for _ in range(100_000))
+    for index, weight in enumerate([5, 1, 0.5, 3.5]):
+        assert counts[index] / 100_000 == pytest.approx(weight / 10, abs=0.01)
+
+
+def test_alias_table_single_weight() -> None:
+    """Test a table with a single index."""
+    table = AliasTable([2.0])
+    assert len(table) == 1
+    assert {table.draw(random.Random(seed)) for seed in range(10)} == {0}
+
+
+def test_alias_table_uniform() -> None:
+    """Test that equal weights keep every column full."""
+    table = AliasTable([1, 1, 1])
+    assert table.thresholds == (1.0, 1.0, 1.0)
+
+
+def test_alias_table_empty() -> None:
+    """Test that a table needs at least one weight."""
+    with pytest.raises(ValueError, match="Cannot build an alias table without weights"):
+        AliasTable([])
+
+
+def test_split_weights() -> None:
+    """Test splitting plain and weighted entries."""
+    assert split_weights(["a", "b"]) == (("a", "b"), None)
+    assert split_weights([["ael", 5], "yr"]) == (("ael", "yr"), (5.0, 1.0))
+
+
+@pytest.mark.parametrize(
+    "entry", [["a"], ["a", 0], ["a", -1], ["a", "2"], ["a", True], [1, 2], 3]
+)
+def test_split_weights_invalid(entry) -> None:
+    """Test that invalid entries are rejected."""
+    with pytest.raises(ValueError, match="Invalid token entry"):
+        split_weights([entry])
@@ -0,0 +1,46 @@
+"""Tests for the benchmark suite."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from onymancer import bench
+
+
+def test_bench_report(tmp_path: Path) -> None:
+    """Test that the report covers every benchmark and is valid JSON."""
+    output = tmp_path / "report.json"
+    assert bench.main(["--count", "200", "--repeat", "1", "-o", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert set(report["presets"]) == set(bench.PRESETS)
+    assert set(report["constraints"]) == set(bench.CONSTRAINTS)
+    assert set(report["scoring"]) == {"short", "long"}
+    assert set(report["languages"]) >= {"default", "elvish", "dwarvish"}
+    assert report["import"]["import_seconds"] > 0
+    assert set(report["import"]["padded_import_seconds"]) == {
+        str(extra) for extra in bench.IMPORT_PADDING
+    }
+    for result in report["presets"].values():
+        assert result["names_per_second"] > 0
+    for result in report["constraints"].values():
+        assert 0.0 <= result["acceptance_rate"] <= 1.0
+    assert report["constraints"]["none"]["returned"] == 200
+    assert report["languages"]["elvish"]["estimated_bytes"] > 0
+
+
+def test_bench_import_padding() -> None:
+    """Test that the import is timed for each amount of padding."""
+    result = bench.bench_import(1, padding=(0, 20))
+    assert set(result["padded_import_seconds"]) == {"0", "20"}
+    assert result["import_seconds"] == result["padded_import_seconds"]["0"]
+    assert isinstance(result["seconds_per_language_file"], float)
+    with pytest.raises(ValueError, match="two distinct"):
+        bench.bench_import(1, padding=(5, 5))
+
+
+def test_bench_report_to_stdout(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that the report is written to stdout without an output file."""
+    assert bench.main(["--count", "100", "--repeat", "1"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert set(report["presets"]) == set(bench.PRESETS)
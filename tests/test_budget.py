@@ -0,0 +1,87 @@
+"""Tests for adaptive attempt budgets."""
+
+import time
+
+import pytest
+
+from onymancer import generate_batch, pattern_space_size
+from onymancer.budget import STALL_WINDOW, AttemptBudget
+
+
+def test_budget_attempt_cap() -> None:
+    """Test that the attempt cap ends the loop at the cap."""
+    budget = AttemptBudget(max_attempts=10, stall_window=None)
+    assert budget.next_check == 10
+    assert not budget.allows(10, 3)
+    assert not budget.stalled
+    assert budget.acceptance_rate == 0.3
+
+
+def test_budget_stall() -> None:
+    """Test that a window without acceptance ends the loop."""
+    budget = AttemptBudget(stall_window=100)
+    assert budget.next_check == 100
+    assert budget.allows(100, 1)
+    assert budget.next_check == 200
+    assert not budget.allows(200, 1)
+    assert budget.stalled
+
+
+def test_budget_unbounded_and_validation() -> None:
+    """Test a budget without limits and invalid limits."""
+    assert AttemptBudget(stall_window=None).next_check is None
+    with pytest.raises(ValueError, match="max_attempts must be non-negative"):
+        AttemptBudget(max_attempts=-1)
+    with pytest.raises(ValueError, match="timeout must be non-negative"):
+        AttemptBudget(timeout=-1.0)
+    with pytest.raises(ValueError, match="stall_window must be positive"):
+        AttemptBudget(stall_window=0)
+
+
+def test_generate_batch_gives_up_on_impossible_threshold() -> None:
+    """Test that an unsatisfiable threshold stops after one stall window."""
+    with pytest.warns(RuntimeWarning, match="Gave up"):
+        names = generate_batch("!svs", 5, seed=1, min_pronounceability=2.0)
+    assert names == []
+
+
+def test_generate_batch_max_attempts() -> None:
+    """Test that the attempt cap bounds the batch without a warning."""
+    assert generate_batch("!svs", 100, seed=1, max_attempts=10) == generate_batch(
+        "!svs", 10, seed=1
+    )
+    assert generate_batch("!svs", 5, seed=1, max_attempts=0) == []
+    with pytest.raises(ValueError, match="max_attempts must be non-negative"):
+        generate_batch("!svs", 5, max_attempts=-1)
+
+
+def test_generate_batch_timeout() -> None:
+    """Test that the timeout returns the names accepted so far."""
+    start = time.perf_counter()
+    names = generate_batch(
+        "!svsvs", 10**7, seed=1, min_pronounceability=0.5, timeout=0.05
+    )
+    assert time.perf_counter() - start < 5.0
+    assert 0 < len(names) < 10**7
+    assert generate_batch("!svs", 5, seed=1, timeout=0.0) == []
+    with pytest.raises(ValueError, match="timeout must be non-negative"):
+        generate_batch("!svs", 5, timeout=-1.0)
+
+
+def test_generate_batch_exhausts_unique_names() -> None:
+    """Test that a batch needing every unique name gets enough attempts."""
+    count = pattern_space_size("sv")
+    assert count > STALL_WINDOW // 10
+    assert len(generate_batch("sv", count, seed=1, unique=True)) == count
+
+
+def test_numpy_budget() -> None:
+    """Test the budget of the NumPy engine."""
+    pytest.importorskip("numpy")
+    with pytest.warns(RuntimeWarning, match="Gave up"):
+        names = generate_batch(
+            "!svs", 5, seed=1, engine="numpy", min_pronounceability=2.0
+        )
+    assert names == []
+    names = generate_batch("!svs", 100, seed=1, engine="numpy", max_attempts=50)
+    assert len(names) == 50
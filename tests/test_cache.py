@@ -0,0 +1,72 @@
+"""Tests for the LRU cache."""
+
+import pytest
+
+from onymancer.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """Test that the least recently used entry is evicted first."""
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (3, 1, 1)
+
+
+def test_lru_cache_zero_size_disables_caching() -> None:
+    """Test that a zero-sized cache stores nothing."""
+    cache = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert len(cache) == 0
+    assert cache.get("a", "missing") == "missing"
+
+
+def test_lru_cache_clear_keeps_stats_on_request() -> None:
+    """Test clearing entries with and without resetting the counters."""
+    cache = LRUCache()
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear(reset_stats=False)
+    assert cache.info().hits == 1
+    assert cache.info().currsize == 0
+    cache.clear()
+    assert cache.info().hits == 0
+
+
+def test_lru_cache_rejects_negative_size() -> None:
+    """Test validation of the size bound."""
+    with pytest.raises(ValueError, match="maxsize must be non-negative"):
+        LRUCache(maxsize=-1)
+    with pytest.raises(ValueError, match="maxsize must be non-negative"):
+        LRUCache().resize(-1)
+
+
+def test_cache_info_hit_rate() -> None:
+    """Test the hit rate derived from the counters."""
+    cache = LRUCache(maxsize=2)
+    assert cache.info().hit_rate == 0.0
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    assert cache.info().hit_rate == 0.5
+
+
+def test_lru_cache_reports_removed_entries() -> None:
+    """Test that the eviction callback sees every removed entry."""
+    removed = []
+    cache = LRUCache(maxsize=2, on_evict=lambda key, _: removed.append(key))
+    for key in ("a1", "a2", "b1"):
+        cache.put(key, 0)
+    assert removed == ["a1"]
+    cache.discard(lambda key: key.startswith("a"))
+    assert removed == ["a1", "a2"]
+    assert cache.get("b1") == 0
+    cache.clear()
+    assert removed == ["a1", "a2", "b1"]
+    assert len(cache) == 0
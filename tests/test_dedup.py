@@ -0,0 +1,70 @@
+"""Tests for unique name generation."""
+
+import pytest
+
+from onymancer import compile, generate_batch, iter_names
+from onymancer.dedup import BloomFilter, SeenSet
+
+
+def test_seen_set() -> None:
+    """Test the exact seen-set."""
+    seen = SeenSet()
+    assert seen.add("a")
+    assert not seen.add("a")
+    assert "a" in seen
+    assert len(seen) == 1
+
+
+def test_bloom_filter_never_misses_seen_items() -> None:
+    """Test that the Bloom filter remembers every added item."""
+    bloom = BloomFilter(1000, error_rate=0.01)
+    items = [f"name{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+    assert bloom.nbytes < 2000
+
+
+def test_bloom_filter_validation() -> None:
+    """Test the Bloom filter parameters."""
+    with pytest.raises(ValueError, match="error_rate must be in"):
+        BloomFilter(10, error_rate=0.0)
+    with pytest.raises(ValueError, match="capacity must be non-negative"):
+        BloomFilter(-1)
+
+
+def test_space_size() -> None:
+    """Test the size of a pattern's output space."""
+    assert compile("(ab)").space_size == 1
+    assert compile("vv").space_size == 36
+    assert compile("<v|(x)>v").space_size == 7 * 6
+
+
+def test_generate_batch_unique() -> None:
+    """Test that unique batches hold distinct names."""
+    names = generate_batch("vv", count=36, seed=1, unique=True)
+    assert len(names) <= 36
+    assert len(set(names)) == len(names)
+    names = generate_batch(
+        "!svs", count=500, seed=2, unique=True, unique_error_rate=0.001
+    )
+    assert len(names) == 500
+    assert len(set(names)) == 500
+
+
+def test_generate_batch_unique_fails_fast() -> None:
+    """Test that requesting more names than exist fails immediately."""
+    with pytest.raises(ValueError, match="Cannot generate 37 unique names"):
+        generate_batch("vv", count=37, seed=1, unique=True)
+    with pytest.raises(ValueError, match="Cannot generate 10 unique names"):
+        generate_batch("vv", count=10, seed=1, unique=True, starts_with="a")
+
+
+def test_iter_names_unique() -> None:
+    """Test unique streaming generation."""
+    names = list(iter_names("!svs", seed=3, unique=True, limit=300))
+    assert len(set(names)) == 300
+    with pytest.raises(ValueError, match="needs a bounded number of names"):
+        iter_names("!svs", unique=True, unique_error_rate=0.01)
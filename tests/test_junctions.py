@@ -0,0 +1,73 @@
+"""Tests for junction compatibility tables."""
+
+import json
+import os
+import random
+import tempfile
+
+from onymancer import load_language_from_json, namegen
+from onymancer.junctions import JunctionTable
+from onymancer.pronounceability import PronounceabilityScorer
+
+
+def test_shape() -> None:
+    """Test the consonants found at both ends of a token."""
+    table = JunctionTable({})
+    assert table.shape("Strand") == ("str", "nd")
+    assert table.shape("ael") == ("", "l")
+    assert table.shape("ia") == ("", "")
+    assert table.shape("Th") == ("th", None)
+
+
+def test_penalties() -> None:
+    """Test the penalty of each token of a class after an ending."""
+    table = JunctionTable({"a": ["st"], "b": ["rpa", "ela", "ra", "hra", "rk"]})
+    # "strp" and "sthr" are runs of four, "str" a penalized trigraph, and
+    # "strk" is a run of four whatever follows.
+    assert table.penalties("b", "st") == (0.5, 0.0, 0.2, 0.5, 0.5)
+    assert table.penalties("b", "") == (0.0, 0.0, 0.0, 0.0, 0.0)
+    assert table.penalties("b", "r") == (0.2, 0.0, 0.1, 0.2, 0.0)
+
+
+def test_successors() -> None:
+    """Test the tokens drawn after an ending."""
+    table = JunctionTable({"a": ["ast"], "b": ["rpa", "ela", "ra"], "c": ["rk"]})
+    assert table.successors("b", "st") == (1,)
+    # Every token fits, or none does.
+    assert table.successors("b", "") is None
+    assert table.successors("c", "st") is None
+
+
+def test_successors_follow_scorer_rules() -> None:
+    """Test that the rules of the given scorer are applied."""
+
+    class StrScorer(PronounceabilityScorer):
+        ALLOWED_TRIGRAPHS = PronounceabilityScorer.ALLOWED_TRIGRAPHS | {"str"}
+
+    table = JunctionTable({"b": ["rpa", "ela", "ra"]}, StrScorer())
+    assert table.successors("b", "st") == (1, 2)
+
+
+def test_load_language_builds_junction_table() -> None:
+    """Test that loading a language precomputes its junction table."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump({"a": ["ast"], "b": ["rpa", "ela"]}, f)
+        temp_file = f.name
+
+    try:
+        assert load_language_from_json("junction_lang", temp_file)
+        table = namegen._language_junctions["junction_lang"]
+        assert table.successors("b", "st") == (1,)
+        compiled = namegen.compile("!ab", language="junction_lang")
+        rng = random.Random(0)
+        names = {compiled.generate_pronounceable(rng) for _ in range(20)}
+        assert names == {"Astela"}
+    finally:
+        os.unlink(temp_file)
+
+
+def test_set_token_drops_default_junction_table() -> None:
+    """Test that changing the default tokens discards their table."""
+    namegen._language_junctions["default"] = JunctionTable({"q": ["x"]})
+    namegen.set_token("q", ["first"])
+    assert "default" not in namegen._language_junctions
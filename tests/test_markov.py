@@ -0,0 +1,157 @@
+"""Tests for the Markov chain name generator."""
+
+import os
+import pickle
+import random
+import tempfile
+from collections import Counter
+
+import pytest
+
+from onymancer import (
+    MarkovGenerator,
+    generate_batch,
+    save_language,
+    score_pronounceability,
+)
+
+CORPUS = generate_batch("!<s|B>v<c|C>v", count=2000, seed=1, language="elvish")
+
+
+@pytest.mark.parametrize("order", [1, 2, 3, 4])
+def test_markov_generates_names(order: int) -> None:
+    """Test that generated names use the training alphabet."""
+    model = MarkovGenerator(CORPUS, order=order)
+    assert model.order == order
+    names = model.generate_batch(200, seed=3)
+    assert len(names) == 200
+    for name in names:
+        assert name
+        assert set(name) <= set(model.alphabet)
+
+
+def test_markov_learns_starts_and_ends() -> None:
+    """Test that names begin and end like the training names."""
+    model = MarkovGenerator(["abc", "abd"], order=2)
+    assert set(model.generate_batch(100, seed=0)) == {"abc", "abd"}
+
+
+def test_markov_follows_transition_counts() -> None:
+    """Test that transitions are drawn in proportion to their counts."""
+    model = MarkovGenerator(["ab"] * 3 + ["ac"], order=1)
+    counts = Counter(model.generate_batch(20000, seed=1))
+    assert counts["ab"] / 20000 == pytest.approx(0.75, abs=0.02)
+
+
+def test_markov_reproducibility() -> None:
+    """Test seeded and rng-driven generation."""
+    model = MarkovGenerator(CORPUS)
+    assert model.generate(seed=5) == model.generate(seed=5)
+    first = model.generate_batch(20, seed=5)
+    assert first == model.generate_batch(20, rng=random.Random(5))
+    with pytest.raises(ValueError, match="Specify either seed or rng"):
+        model.generate(seed=1, rng=random.Random(1))
+
+
+def test_markov_constraints() -> None:
+    """Test the constraints shared with generate_batch."""
+    model = MarkovGenerator(CORPUS)
+    names = model.generate_batch(
+        50,
+        seed=2,
+        min_length=5,
+        max_length=8,
+        starts_with=CORPUS[0][:2],
+        contains="a",
+        min_pronounceability=0.6,
+        unique=True,
+    )
+    assert names
+    assert len(set(names)) == len(names)
+    for name in names:
+        assert 5 <= len(name) <= 8
+        assert name.startswith(CORPUS[0][:2])
+        assert "a" in name
+        assert score_pronounceability(name) >= 0.6
+
+
+def test_markov_ends_with() -> None:
+    """Test the suffix constraint."""
+    model = MarkovGenerator(CORPUS)
+    suffix = CORPUS[0][-1]
+    names = model.generate_batch(20, seed=4, ends_with=suffix)
+    assert names
+    assert all(name.endswith(suffix) for name in names)
+
+
+def test_markov_unreachable_prefix() -> None:
+    """Test that a prefix the chain cannot generate gives a warning."""
+    model = MarkovGenerator(["abc"], order=2)
+    with pytest.warns(RuntimeWarning):
+        assert model.generate_batch(5, starts_with="b") == []
+    with pytest.warns(RuntimeWarning):
+        assert model.generate_batch(5, starts_with="abc", max_length=2) == []
+
+
+def test_markov_max_length_abandons_long_names() -> None:
+    """Test that names longer than max_length are never returned."""
+    model = MarkovGenerator(["a", "aaaaaaaa"], order=1)
+    names = model.generate_batch(100, seed=0, max_length=3)
+    assert names
+    assert all(len(name) <= 3 for name in names)
+
+
+def test_markov_attempt_budget() -> None:
+    """Test that batches follow the adaptive attempt budget."""
+    model = MarkovGenerator(CORPUS, order=2)
+    # Rare names are no longer cut off after count * 10 walks.
+    names = model.generate_batch(50, seed=1, min_length=8, contains="th")
+    assert len(names) == 50
+    assert len(model.generate_batch(100, seed=1, max_attempts=10)) <= 10
+    assert model.generate_batch(100, seed=1, timeout=0.0) == []
+    with pytest.warns(RuntimeWarning, match="Gave up"):
+        assert model.generate_batch(5, seed=1, contains="#") == []
+    with pytest.raises(ValueError, match="max_attempts must be non-negative"):
+        model.generate_batch(5, max_attempts=-1)
+
+
+def test_markov_invalid_training() -> None:
+    """Test the validation of the training parameters."""
+    with pytest.raises(ValueError, match="order must be between 1 and 4"):
+        MarkovGenerator(["abc"], order=5)
+    with pytest.raises(ValueError, match="without example names"):
+        MarkovGenerator(["", ""])
+
+
+def test_markov_repr() -> None:
+    """Test the size counters."""
+    model = MarkovGenerator(["ab", "ac"], order=1)
+    # States: the start, "a", "b" and "c".
+    assert model.state_count == 4
+    assert model.transition_count == 5
+    assert repr(model) == "MarkovGenerator(order=1, states=4, transitions=5)"
+
+
+def test_markov_save_and_load() -> None:
+    """Test that a loaded chain generates the same names."""
+    model = MarkovGenerator(CORPUS)
+    fd, path = tempfile.mkstemp(suffix=".onym")
+    os.close(fd)
+    try:
+        model.save(path)
+        loaded = MarkovGenerator.load(path)
+        assert loaded.order == model.order
+        assert loaded.alphabet == model.alphabet
+        assert repr(loaded) == repr(model)
+        assert loaded.generate_batch(50, seed=1) == model.generate_batch(50, seed=1)
+        assert loaded.generate_batch(
+            10, seed=2, starts_with=CORPUS[0][:2]
+        ) == model.generate_batch(10, seed=2, starts_with=CORPUS[0][:2])
+        # Loaded chains are pickled as their file name.
+        copy = pickle.loads(pickle.dumps(loaded))  # noqa: S301 - pickled just above
+        assert copy.generate(seed=3) == model.generate(seed=3)
+        save_language("default", path)
+        with pytest.raises(ValueError, match="does not hold a Markov chain"):
+            MarkovGenerator.load(path)
+    finally:
+        os.unlink(path)
@@ -0,0 +1,137 @@
+"""Tests for binary model files."""
+
+import os
+import tempfile
+from array import array
+
+import pytest
+
+from onymancer import (
+    generate_batch,
+    load_language_from_model,
+    namegen,
+    save_language,
+)
+from onymancer.model import ModelFile, pack_strings, unpack_strings, write_model
+
+
+@pytest.fixture
+def model_path():
+    """Provide a temporary file path, removed after the test."""
+    fd, path = tempfile.mkstemp(suffix=".onym")
+    os.close(fd)
+    yield path
+    os.unlink(path)
+
+
+def test_sections_round_trip(model_path: str) -> None:
+    """Test that every section is read back with its typecode."""
+    write_model(
+        model_path,
+        b"TEST",
+        {
+            b"INTS": array("i", [1, -2, 3]),
+            b"LONG": array("q", [2**40]),
+            b"FLTS": array("d", [0.5, 1.5]),
+            b"BLOB": b"abc",
+            b"NONE": array("i"),
+        },
+    )
+    model = ModelFile(model_path)
+    assert model.kind == b"TEST"
+    assert b"INTS" in model
+    assert b"MISS" not in model
+    assert model.section(b"INTS").tolist() == [1, -2, 3]
+    assert model.section(b"LONG").tolist() == [2**40]
+    assert model.section(b"FLTS").tolist() == [0.5, 1.5]
+    assert model.text(b"BLOB") == "abc"
+    assert len(model.section(b"NONE")) == 0
+    with pytest.raises(KeyError):
+        model.section(b"MISS")
+
+
+def test_sections_are_mapped_in_place(model_path: str) -> None:
+    """Test that sections are read-only views of the file."""
+    write_model(model_path, b"TEST", {b"INTS": array("i", [1, 2])})
+    view = ModelFile(model_path).section(b"INTS")
+    assert view.readonly
+    assert view.format == "i"
+
+
+def test_overwrite_keeps_mapped_models(model_path: str) -> None:
+    """Test that rewriting a mapped file leaves the old mapping intact."""
+    write_model(model_path, b"TEST", {b"INTS": array("i", range(4096))})
+    os.chmod(model_path, 0o640)
+    view = ModelFile(model_path).section(b"INTS")
+    write_model(model_path, b"TEST", {b"INTS": array("i", [7])})
+    assert view[4095] == 4095
+    assert ModelFile(model_path).section(b"INTS").tolist() == [7]
+    assert os.stat(model_path).st_mode & 0o777 == 0o640
+    directory = os.path.dirname(model_path)
+    assert not any(name.startswith(".onym-") for name in os.listdir(directory))
+
+
+def test_invalid_files(model_path: str) -> None:
+    """Test that files which are not models are rejected."""
+    with pytest.raises(ValueError, match="is empty"):
+        ModelFile(model_path)
+    with open(model_path, "wb") as f:
+        f.write(b"not a model file")
+    with pytest.raises(ValueError, match="is not an onymancer model file"):
+        ModelFile(model_path)
+    write_model(model_path, b"TEST", {b"INTS": array("i", [1, 2])})
+    with open(model_path, "r+b") as f:
+        f.truncate(os.path.getsize(model_path) - 4)
+    with pytest.raises(ValueError, match="is truncated"):
+        ModelFile(model_path)
+    with pytest.raises(ValueError, match="Unsupported array typecode 'h'"):
+        write_model(model_path, b"TEST", {b"INTS": array("h", [1])})
+    with pytest.raises(ValueError, match="Model kinds are four bytes long"):
+        write_model(model_path, b"TOOLONG", {})
+
+
+def test_pack_strings() -> None:
+    """Test the UTF-8 blob of a list of strings."""
+    offsets, blob = pack_strings(["ael", "", "éa"])
+    assert offsets.tolist() == [0, 3, 3, 6]
+    assert unpack_strings(memoryview(offsets), memoryview(blob)) == [
+        "ael",
+        "",
+        "éa",
+    ]
+
+
+def test_language_round_trip(model_path: str) -> None:
+    """Test that a saved language generates the same names."""
+    save_language("elvish", model_path)
+    assert load_language_from_model("elvish_model", model_path)
+    assert (
+        namegen._language_tokens["elvish_model"] == namegen._language_tokens["elvish"]
+    )
+    assert generate_batch("!sVcv", 20, seed=1, language="elvish") == generate_batch(
+        "!sVcv", 20, seed=1, language="elvish_model"
+    )
+
+
+def test_weighted_language_round_trip(model_path: str) -> None:
+    """Test that token weights are saved."""
+    namegen._language_tokens["weighted_source"] = {"s": [["ael", 5], "yr"]}
+    try:
+        save_language("weighted_source", model_path)
+    finally:
+        del namegen._language_tokens["weighted_source"]
+    assert load_language_from_model("weighted_model", model_path)
+    assert namegen._language_tokens["weighted_model"] == {
+        "s": [["ael", 5.0], ["yr", 1.0]]
+    }
+
+
+def test_language_errors(model_path: str) -> None:
+    """Test saving unknown languages and loading other files."""
+    with pytest.raises(ValueError, match="Unknown language 'no_such_language'"):
+        save_language("no_such_language", model_path)
+    assert not load_language_from_model("broken", model_path)
+    assert not load_language_from_model("broken", "/nonexistent/file.onym")
+    write_model(model_path, b"TEST", {})
+    assert not load_language_from_model("broken", model_path)
+    assert "broken" not in namegen._language_tokens
@@ -2,12 +2,18 @@
 
 import json
 import os
+import random
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 
 from onymancer import (
     generate,
     generate_batch,
+    iter_names,
     load_language_from_json,
+    namegen,
     set_token,
     set_tokens,
     score_pronounceability,
@@ -70,6 +76,44 @@ def test_generate_reproducibility() -> None:
     assert name1 == name2
 
 
+def test_generate_seed_leaves_global_random_untouched() -> None:
+    """Test that seeded generation does not reseed the global generator."""
+    random.seed(99)
+    expected = random.random()
+    random.seed(99)
+    generate("!svs", seed=1)
+    generate_batch("!svs", count=3, seed=2)
+    assert random.random() == expected
+
+
+def test_generate_with_rng() -> None:
+    """Test generation with an explicit random generator."""
+    assert generate("!svs", rng=random.Random(5)) == generate("!svs", seed=5)
+    names = generate_batch("!svs", count=4, rng=random.Random(5))
+    assert names == generate_batch("!svs", count=4, seed=5)
+
+
+def test_generate_seed_and_rng_conflict() -> None:
+    """Test that seed and rng cannot be combined."""
+    with pytest.raises(ValueError, match="Specify either seed or rng"):
+        generate("s", seed=1, rng=random.Random(1))
+    with pytest.raises(ValueError, match="Specify either seed or rng"):
+        generate_batch("s", count=1, seed=1, rng=random.Random(1))
+
+
+def test_generate_concurrent_seeded_calls() -> None:
+    """Test that seeded calls from several threads stay reproducible."""
+    expected = [generate_batch("!svs", count=50, seed=seed) for seed in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda seed: generate_batch("!svs", count=50, seed=seed),
+                range(8),
+            )
+        )
+    assert results == expected
+
+
 def test_generate_complex_pattern() -> None:
     """Test complex pattern generation."""
     pattern = "!s<v|c>!C"
@@ -136,7 +180,8 @@ def test_generate_batch_length_range() -> None:
 def test_generate_batch_impossible_constraints() -> None:
     """Test batch generation with impossible length constraints."""
     # Try to get 5 names with min_length=100 (very unlikely)
-    names = generate_batch("s", count=5, seed=42, min_length=100)
+    with pytest.warns(RuntimeWarning):
+        names = generate_batch("s", count=5, seed=42, min_length=100)
     # Should return fewer than 5 names if constraints can't be met
     assert len(names) <= 5
     # But any names returned should meet the constraint
@@ -199,7 +244,8 @@ def test_generate_batch_combined_constraints() -> None:
 def test_generate_batch_impossible_character_constraints() -> None:
     """Test batch generation with impossible character constraints."""
     # Try to get names starting with 'X' - very unlikely with current tokens
-    names = generate_batch("s!v!c", count=5, seed=42, starts_with="X")
+    with pytest.warns(RuntimeWarning):
+        names = generate_batch("s!v!c", count=5, seed=42, starts_with="X")
     # Should return fewer than 5 names or empty list if impossible
     assert len(names) <= 5
     # But any names returned should meet the constraint
@@ -255,6 +301,33 @@ def test_load_language_from_json() -> None:
         os.unlink(temp_file)
 
 
+def test_load_language_from_json_weighted() -> None:
+    """Test loading a language with weighted tokens."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump({"s": [["ael", 5], ["yr", 1]]}, f)
+        temp_file = f.name
+
+    try:
+        assert load_language_from_json("weighted_lang", temp_file)
+        names = generate_batch("s", count=600, seed=1, language="weighted_lang")
+        assert set(names) == {"ael", "yr"}
+        assert 400 < names.count("ael") < 600
+    finally:
+        os.unlink(temp_file)
+
+
+def test_load_language_from_json_invalid_weight() -> None:
+    """Test that token lists with invalid weights are rejected."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump({"s": [["ael", -1]]}, f)
+        temp_file = f.name
+
+    try:
+        assert load_language_from_json("bad_weights", temp_file) is False
+    finally:
+        os.unlink(temp_file)
+
+
 def test_load_language_from_json_invalid() -> None:
     """Test loading invalid JSON for language."""
     result = load_language_from_json("test", "nonexistent.json")
@@ -304,3 +377,53 @@ def test_generate_batch_with_pronounceability() -> None:
     assert len(names_strict) <= 10
     for name in names_strict:
         assert score_pronounceability(name) >= 0.95
+
+
+def test_pronounceability_keeps_penalized_junctions_by_default() -> None:
+    """Test that junctions are only pruned when asked to."""
+    set_tokens({"y": ["ast"], "z": ["rpa", "ela"]})
+    try:
+        names = generate_batch("yz", 200, seed=1, min_pronounceability=0.1)
+        assert set(names) == {"astrpa", "astela"}
+        names = list(iter_names("yz", seed=1, min_pronounceability=0.1, limit=50))
+        assert set(names) == {"astrpa", "astela"}
+        pruned = generate_batch(
+            "yz", 200, seed=1, min_pronounceability=0.1, prune_junctions=True
+        )
+        assert set(pruned) == {"astela"}
+    finally:
+        del namegen._token_map["y"], namegen._token_map["z"]
+        namegen._invalidate_compiled("default")
+
+
+def test_iter_names_matches_generate_batch() -> None:
+    """Test that the stream starts with the batch for the same seed."""
+    expected = generate_batch("!svs", count=20, seed=8, min_pronounceability=0.6)
+    names = list(iter_names("!svs", seed=8, min_pronounceability=0.6, limit=20))
+    assert names == expected
+
+
+def test_iter_names_is_lazy_and_unbounded() -> None:
+    """Test pulling names from an unbounded stream."""
+    stream = iter_names("!svs", seed=1, language="elvish", starts_with="Th")
+    names = [next(stream) for _ in range(1000)]
+    assert all(name.startswith("Th") for name in names)
+
+
+def test_iter_names_chunks() -> None:
+    """Test chunked iteration."""
+    chunks = list(iter_names("s", seed=2, limit=25, chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [name for chunk in chunks for name in chunk] == list(
+        iter_names("s", seed=2, limit=25)
+    )
+
+
+def test_iter_names_max_attempts_and_validation() -> None:
+    """Test the attempt cap and argument validation."""
+    names = iter_names("s", seed=3, min_pronounceability=2.0, max_attempts=50)
+    assert list(names) == []
+    with pytest.warns(RuntimeWarning):
+        assert list(iter_names("s", seed=3, starts_with="XQ")) == []
+    with pytest.raises(ValueError, match="chunk_size must be positive"):
+        iter_names("s", chunk_size=0)
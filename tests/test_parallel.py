@@ -0,0 +1,111 @@
+"""Tests for multiprocess batch generation."""
+
+import json
+import multiprocessing
+import os
+import tempfile
+
+import pytest
+
+from onymancer import GenerationStats, generate_parallel, load_language_from_json
+
+
+def test_generate_parallel_independent_of_workers() -> None:
+    """Test that the output does not depend on the number of workers."""
+    single = generate_parallel("!svs", count=250, seed=7, workers=1, chunk_size=60)
+    multi = generate_parallel("!svs", count=250, seed=7, workers=3, chunk_size=60)
+    assert len(single) == 250
+    assert single == multi
+
+
+def test_generate_parallel_constraints() -> None:
+    """Test that constraints are forwarded to every shard."""
+    names = generate_parallel(
+        "!svs",
+        count=40,
+        seed=3,
+        language="elvish",
+        workers=2,
+        chunk_size=10,
+        starts_with="Th",
+        max_length=7,
+    )
+    assert len(names) == 40
+    for name in names:
+        assert name.startswith("Th")
+        assert len(name) <= 7
+
+
+def test_generate_parallel_ships_custom_language() -> None:
+    """Test that custom languages reach spawned workers without their file."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump({"s": ["zor", "kul"]}, f)
+        temp_file = f.name
+    try:
+        assert load_language_from_json("parallel_lang", temp_file)
+    finally:
+        os.unlink(temp_file)
+    names = generate_parallel(
+        "s",
+        count=20,
+        seed=1,
+        language="parallel_lang",
+        workers=2,
+        chunk_size=10,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    assert len(names) == 20
+    assert set(names) <= {"zor", "kul"}
+
+
+def test_generate_parallel_invalid_arguments() -> None:
+    """Test validation of the sharding arguments."""
+    with pytest.raises(ValueError, match="chunk_size must be positive"):
+        generate_parallel("s", count=10, chunk_size=0)
+    with pytest.raises(ValueError, match="workers must be positive"):
+        generate_parallel("s", count=10, workers=0)
+
+
+def test_generate_parallel_unique_across_shards() -> None:
+    """Test that unique names are unique over the whole batch."""
+    names = generate_parallel(
+        "s", count=60, seed=1, workers=2, chunk_size=30, unique=True
+    )
+    assert len(names) == 60
+    assert len(set(names)) == 60
+    assert names == generate_parallel(
+        "s", count=60, seed=1, workers=1, chunk_size=30, unique=True
+    )
+    with pytest.raises(ValueError, match="Cannot generate 10000 unique names"):
+        generate_parallel("v", count=10_000, workers=2, unique=True)
+
+
+def test_generate_parallel_unique_with_attempt_cap() -> None:
+    """Test that the attempt options reach the shards of a unique batch."""
+    names = generate_parallel(
+        "s", count=40, seed=2, workers=1, chunk_size=20, unique=True, max_attempts=500
+    )
+    assert len(set(names)) == len(names) == 40
+    with pytest.raises(ValueError, match="Cannot generate 10 unique names"):
+        generate_parallel("v", count=10, unique=True, max_attempts=5, timeout=1.0)
+    with pytest.warns(RuntimeWarning):
+        assert generate_parallel("s", count=5, unique=True, starts_with="XQ") == []
+
+
+def test_generate_parallel_collects_stats() -> None:
+    """Test that the statistics of worker processes reach the caller."""
+    for workers in (1, 2):
+        stats = GenerationStats()
+        names = generate_parallel(
+            "s",
+            count=60,
+            seed=1,
+            workers=workers,
+            chunk_size=30,
+            unique=True,
+            stats=stats,
+        )
+        assert stats.accepted == len(names) == 60
+        assert sum(stats.lengths.values()) == 60
+        assert stats.attempts == stats.accepted + sum(stats.rejections.values())
+        assert stats.rejections["duplicate"] > 0
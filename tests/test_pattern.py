@@ -0,0 +1,197 @@
+"""Tests for compiled patterns."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from onymancer import CompiledPattern, compile, namegen, score_pronounceability
+from onymancer.pronounceability import PronounceabilityScorer
+
+from .interpreter import interpret
+
+EQUIVALENCE_PATTERNS = [
+    "",
+    "s",
+    "!s!v!c",
+    "s(dim)",
+    "<s|v>c",
+    "!s<v|c>!C",
+    "!t !T",
+    "!s<v|c><ford|ham|ton|ville|burg>",
+    "!sv(th)s",
+    "!<s|v>",
+    "!<|s>v",
+    "<(ab|c)>s",
+    "(a!b)s",
+    "<!s|(x)>v",
+    "<a|<b|c>>s",
+    "s|v>c",
+    "<s|v",
+    "!(s)v",
+    "<>s",
+]
+
+
+@pytest.mark.parametrize("pattern", EQUIVALENCE_PATTERNS)
+def test_compiled_matches_interpreter(pattern: str) -> None:
+    """Test that compiled patterns reproduce the interpreted output."""
+    compiled = compile(pattern)
+    for seed in range(25):
+        expected = interpret(pattern, seed)
+        assert compiled.generate(random.Random(seed)) == expected
+
+
+def test_compiled_matches_interpreter_elvish() -> None:
+    """Test compiled patterns against a non-default language."""
+    compiled = compile("!svlvs", language="elvish")
+    assert compiled.language == "elvish"
+    for seed in range(25):
+        expected = interpret("!svlvs", seed, language="elvish")
+        assert compiled.generate(random.Random(seed)) == expected
+
+
+def test_compiled_uses_global_random() -> None:
+    """Test that compiled patterns fall back to the global generator."""
+    compiled = compile("!svs")
+    random.seed(7)
+    first = compiled.generate()
+    random.seed(7)
+    assert compiled.generate() == first
+
+
+def test_compiled_binds_tokens_at_compile_time() -> None:
+    """Test that compiled patterns keep the token lists they were built with."""
+    compiled = CompiledPattern("q", {"q": ["one"]})
+    assert compiled.generate() == "one"
+    assert repr(compiled) == "CompiledPattern('q', language='default')"
+
+
+def test_compiled_capitalizes_tokens() -> None:
+    """Test capitalization of tokens and literals."""
+    compiled = CompiledPattern("!q(!x)", {"q": ["abc"]})
+    assert compiled.generate() == "AbcX"
+
+
+def test_generate_uses_pattern_cache() -> None:
+    """Test that repeated generation reuses the compiled pattern."""
+    namegen.cache_clear()
+    namegen.generate("!svs", seed=1)
+    namegen.generate("!svs", seed=2)
+    info = namegen.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert info.currsize == 1
+
+
+def test_pattern_cache_invalidated_by_set_token() -> None:
+    """Test that changing the token map invalidates compiled patterns."""
+    namegen.set_token("q", ["first"])
+    assert namegen.generate("q", seed=1) == "first"
+    namegen.set_token("q", ["second"])
+    assert namegen.generate("q", seed=1) == "second"
+    namegen.set_tokens({"q": ["third"]})
+    assert namegen.generate("q", seed=1) == "third"
+
+
+def test_pattern_cache_eviction() -> None:
+    """Test the size bound and eviction counter of the pattern cache."""
+    namegen.cache_clear()
+    namegen.set_cache_maxsize(2)
+    try:
+        for pattern in ("s", "v", "c"):
+            namegen.generate(pattern, seed=1)
+        info = namegen.cache_info()
+        assert info.currsize == 2
+        assert info.evictions == 1
+    finally:
+        namegen.set_cache_maxsize(256)
+        namegen.cache_clear()
+
+
+def test_generate_pronounceable_avoids_penalized_junctions() -> None:
+    """Test that tokens forming a penalized cluster at a junction are avoided."""
+    compiled = CompiledPattern("ab", {"a": ["ast"], "b": ["rpa", "ela"]})
+    rng = random.Random(0)
+    assert {compiled.generate_pronounceable(rng) for _ in range(50)} == {"astela"}
+    assert {compiled.generate(rng) for _ in range(50)} == {"astela", "astrpa"}
+
+
+def test_generate_pronounceable_falls_back_to_all_tokens() -> None:
+    """Test that all tokens are drawn when none fits the junction."""
+    compiled = CompiledPattern("ab", {"a": ["ast"], "b": ["rpa"]})
+    assert compiled.generate_pronounceable(random.Random(0)) == "astrpa"
+
+
+def test_generate_pronounceable_follows_scorer_rules() -> None:
+    """Test that the junction tables are rebuilt for different rules."""
+
+    class StrScorer(PronounceabilityScorer):
+        ALLOWED_TRIGRAPHS = PronounceabilityScorer.ALLOWED_TRIGRAPHS | {"str"}
+
+    compiled = CompiledPattern("ab", {"a": ["ast"], "b": ["ra", "ela"]})
+    rng = random.Random(0)
+    assert {compiled.generate_pronounceable(rng) for _ in range(50)} == {"astela"}
+    names = {compiled.generate_pronounceable(rng, StrScorer()) for _ in range(50)}
+    assert names == {"astela", "astra"}
+
+
+def test_generate_pronounceable_notices_edited_rules() -> None:
+    """Test that the junction table is rebuilt when rules are edited in place."""
+    scorer = PronounceabilityScorer()
+    scorer.ALLOWED_TRIGRAPHS = set(scorer.ALLOWED_TRIGRAPHS)
+    compiled = CompiledPattern("ab", {"a": ["ast"], "b": ["ra", "ela"]})
+    rng = random.Random(0)
+    assert {compiled.generate_pronounceable(rng, scorer) for _ in range(50)} == {
+        "astela"
+    }
+    scorer.ALLOWED_TRIGRAPHS.add("str")
+    names = {compiled.generate_pronounceable(rng, scorer) for _ in range(50)}
+    assert names == {"astela", "astra"}
+
+
+def test_generate_pronounceable_raises_acceptance() -> None:
+    """Test that more names pass the threshold than when filtering only."""
+    compiled = compile("!ss")
+    rng = random.Random(3)
+    plain = sum(
+        score_pronounceability(compiled.generate(rng)) >= 0.7 for _ in range(2000)
+    )
+    smooth = sum(
+        score_pronounceability(compiled.generate_pronounceable(rng)) >= 0.7
+        for _ in range(2000)
+    )
+    assert smooth > plain
+
+
+def test_compiled_matches_interpreter_weighted() -> None:
+    """Test that weighted tokens are drawn like the interpreter does."""
+    namegen.set_token("q", [["ael", 5], "yr", ["is", 0.5]])
+    try:
+        compiled = compile("!qq")
+        for seed in range(25):
+            expected = interpret("!qq", seed)
+            assert compiled.generate(random.Random(seed)) == expected
+    finally:
+        del namegen._token_map["q"]
+        namegen._invalidate_compiled("default")
+
+
+def test_compiled_weighted_distribution() -> None:
+    """Test that weighted tokens follow their weights."""
+    compiled = CompiledPattern("q", {"q": [["a", 3], "b"]})
+    rng = random.Random(1)
+    counts = Counter(compiled.generate(rng) for _ in range(20000))
+    assert counts["a"] / 20000 == pytest.approx(0.75, abs=0.02)
+    assert compiled.space_size == 2
+
+
+def test_generate_pronounceable_weighted() -> None:
+    """Test that fitting successors are drawn by weight."""
+    compiled = CompiledPattern(
+        "ab", {"a": ["ast"], "b": [["rpa", 10], ["ela", 3], ["o", 1]]}
+    )
+    rng = random.Random(2)
+    counts = Counter(compiled.generate_pronounceable(rng) for _ in range(20000))
+    assert set(counts) == {"astela", "asto"}
+    assert counts["astela"] / 20000 == pytest.approx(0.75, abs=0.02)
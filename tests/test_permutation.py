@@ -0,0 +1,95 @@
+"""Tests for output space enumeration."""
+
+import pytest
+
+from onymancer import (
+    CompiledPattern,
+    iter_unique,
+    name_at,
+    pattern_space_size,
+)
+from onymancer.permutation import FeistelPermutation
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 17, 256, 1000])
+def test_feistel_permutation_is_bijective(size: int) -> None:
+    """Test that the permutation visits every index exactly once."""
+    permutation = FeistelPermutation(size, seed=42)
+    assert sorted(permutation(i) for i in range(size)) == list(range(size))
+
+
+def test_feistel_permutation_depends_on_seed() -> None:
+    """Test that different seeds give different orders."""
+    first = [FeistelPermutation(1000, seed=1)(i) for i in range(20)]
+    second = [FeistelPermutation(1000, seed=2)(i) for i in range(20)]
+    assert first != second
+    with pytest.raises(IndexError):
+        FeistelPermutation(10, seed=1)(10)
+
+
+def test_name_at_enumerates_the_space() -> None:
+    """Test unranking against a brute-force enumeration."""
+    compiled = CompiledPattern("!q<q|(x)>", {"q": ["a", "b", "c"]})
+    assert compiled.space_size == 12
+    names = [compiled.name_at(i) for i in range(compiled.space_size)]
+    expected = [
+        first.upper() + second for first in "abc" for second in ["a", "b", "c", "x"]
+    ]
+    assert names == expected
+    with pytest.raises(IndexError):
+        compiled.name_at(12)
+
+
+def test_name_at_diverging_groups() -> None:
+    """Test unranking when group options change the literal state."""
+    compiled = CompiledPattern("<(|>q", {"q": ["a", "b"]})
+    names = {compiled.name_at(i) for i in range(compiled.space_size)}
+    assert names == {"q", "a", "b"}
+
+
+def test_rank_of_finds_the_lowest_rank() -> None:
+    """Test that rank_of inverts name_at up to repeated spellings."""
+    compiled = CompiledPattern("q<q|(ab)>", {"q": ["a", "ab", "b"]})
+    assert compiled.name_at(1) == compiled.name_at(3) == "aab"
+    assert compiled.rank_of("aab") == 1
+    for index in range(compiled.space_size):
+        assert compiled.name_at(compiled.rank_of(compiled.name_at(index))) == (
+            compiled.name_at(index)
+        )
+    with pytest.raises(ValueError, match="cannot produce"):
+        compiled.rank_of("c")
+
+
+def test_iter_unique_walks_whole_space() -> None:
+    """Test that iter_unique yields every combination once."""
+    size = pattern_space_size("!vc")
+    names = list(iter_unique("!vc", seed=5))
+    assert len(names) == size
+    assert sorted(names) == sorted(name_at("!vc", i) for i in range(size))
+
+
+def test_iter_unique_skips_repeated_spellings() -> None:
+    """Test that combinations spelling the same name yield it once."""
+    size = pattern_space_size("!s<v|c>")
+    distinct = {name_at("!s<v|c>", i) for i in range(size)}
+    assert len(distinct) < size
+    names = list(iter_unique("!s<v|c>", seed=2))
+    assert len(names) == len(distinct)
+    assert set(names) == distinct
+
+
+def test_iter_unique_shards() -> None:
+    """Test that index ranges partition the stream."""
+    whole = list(iter_unique("!svs", seed=9, language="elvish", stop=300))
+    shards = list(iter_unique("!svs", seed=9, language="elvish", stop=150))
+    shards += list(iter_unique("!svs", seed=9, language="elvish", start=150, stop=300))
+    assert shards == whole
+    assert len(set(whole)) == len(whole)
+    size = pattern_space_size("<s|v><v|s>")
+    shards = [
+        name
+        for start in range(0, size, 1000)
+        for name in iter_unique("<s|v><v|s>", seed=9, start=start, stop=start + 1000)
+    ]
+    assert len(shards) == len(set(shards))
+    assert set(shards) == {name_at("<s|v><v|s>", i) for i in range(size)}
@@ -0,0 +1,109 @@
+"""Tests for pre-generated name pools."""
+
+import time
+
+import pytest
+
+from onymancer import NamePool, generate_batch, name_at, namegen, pattern_space_size
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    """Wait until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_pool_is_filled_on_creation() -> None:
+    """Test that names are ready as soon as the pool exists."""
+    with NamePool("!sv", capacity=50, seed=1) as pool:
+        stats = pool.stats()
+        assert stats.depth == len(pool) == 50
+        assert stats.refills == 1
+        assert pool.get() == generate_batch("!sv", 1, seed=1)[0]
+
+
+def test_pool_applies_constraints() -> None:
+    """Test that the names meet the generate_batch constraints."""
+    constraints = {"min_length": 4, "starts_with": "A"}
+    with NamePool("!svs", "elvish", constraints, capacity=20, seed=2) as pool:
+        names = [pool.get(timeout=5) for _ in range(60)]
+    assert all(len(name) >= 4 and name.startswith("A") for name in names)
+
+
+def test_pool_refills_below_watermark() -> None:
+    """Test that the refill thread tops the pool up."""
+    with NamePool("!svs", capacity=20, low_watermark=10, seed=3) as pool:
+        for _ in range(11):
+            pool.get()
+        _wait_for(lambda: pool.stats().refills == 2)
+        stats = pool.stats()
+        assert stats.depth == 20
+        assert stats.served == 11
+        assert stats.generated == 31
+        assert stats.refill_rate > 0
+
+
+def test_pool_uniqueness_and_exhaustion() -> None:
+    """Test that a unique pool hands each name out once, then stops."""
+    pattern = "<(a)|(b)|(c)><(d)|(e)>"
+    size = pattern_space_size(pattern)
+    with NamePool(pattern, capacity=4, low_watermark=2, unique=True, seed=4) as pool:
+        names = []
+        while True:
+            try:
+                names.append(pool.get(timeout=5))
+            except RuntimeError:
+                break
+        assert pool.exhausted
+    assert sorted(names) == sorted(name_at(pattern, index) for index in range(size))
+
+
+def test_pool_capacity_above_unique_space() -> None:
+    """Test a unique pool larger than the pattern's output space."""
+    pattern = "<(a)|(b)><(c)|(d)|(e)>"
+    assert pattern_space_size(pattern, starts_with="a") == 3
+    with NamePool(
+        pattern, constraints={"starts_with": "a"}, capacity=100, unique=True
+    ) as pool:
+        assert len(pool) == 3
+        names = [pool.get(timeout=5) for _ in range(3)]
+        with pytest.raises(RuntimeError, match="cannot generate"):
+            pool.get(timeout=5)
+        assert pool.exhausted
+    assert sorted(names) == ["ac", "ad", "ae"]
+
+
+def test_pool_reports_refill_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an exception in the refill thread reaches the consumers."""
+
+    def fail(*_args: object, **_kwargs: object) -> list[str]:
+        raise RecursionError("too deep")
+
+    with NamePool("!sv", capacity=4, low_watermark=2, seed=6) as pool:
+        monkeypatch.setattr(namegen, "generate_batch", fail)
+        for _ in range(4):
+            pool.get(timeout=5)
+        with pytest.raises(RuntimeError, match="failed") as info:
+            pool.get(timeout=5)
+        assert isinstance(info.value.__cause__, RecursionError)
+
+
+def test_pool_timeout_and_close() -> None:
+    """Test waiting on an empty pool."""
+    pool = NamePool("s", capacity=1, seed=5)
+    pool.close()
+    pool.get()
+    with pytest.raises(RuntimeError):
+        pool.get(timeout=0.01)
+
+
+def test_pool_validation() -> None:
+    """Test the validation of the pool sizes."""
+    with pytest.raises(ValueError, match="capacity must be positive"):
+        NamePool("s", capacity=0)
+    with pytest.raises(ValueError, match="low_watermark must be between 1 and 5"):
+        NamePool("s", capacity=5, low_watermark=6)
+    with pytest.raises(TypeError):
+        NamePool("s", constraints={"no_such_option": 1})
@@ -0,0 +1,231 @@
+"""Tests for the pronounceability scorer."""
+
+import random
+
+import pytest
+
+from onymancer import (
+    disable_score_cache,
+    enable_score_cache,
+    generate_batch,
+    is_pronounceable,
+    score_cache_clear,
+    score_cache_info,
+    score_pronounceability,
+    score_pronounceability_batch,
+)
+from onymancer.pronounceability import CachingScorer, PronounceabilityScorer
+
+
+def _reference_score(scorer: PronounceabilityScorer, name: str) -> float:
+    """Score a name with the separate, regex-based sub-scores."""
+    if not name or len(name) < 2:
+        return 0.0
+    name_lower = name.lower()
+    scores = [
+        (scorer._score_consonant_clusters(name_lower), 0.4),
+        (scorer._score_vowel_distribution(name_lower), 0.3),
+        (scorer._score_syllable_structure(name_lower), 0.2),
+        (scorer._score_repetition_penalty(name_lower), 0.1),
+    ]
+    total_score = sum(score * weight for score, weight in scores)
+    return max(0.0, min(1.0, total_score))
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "",
+        "a",
+        "ab",
+        "aa",
+        "aaa",
+        "Eldrin",
+        "Thalia",
+        "Borogar",
+        "Quartz",
+        "Zephyr",
+        "Brrrgh",
+        "Xxxzzz",
+        "Xyzzyx",
+        "strength",
+        "Anna",
+        "banana",
+        "abababab",
+        "aaaa",
+        "aabbaabb",
+        "abcabcabc",
+        "tsktsk",
+        "schtroumpf",
+        "Jean-Luc",
+        "O'Neil",
+        "Van der Berg",
+        "a\n\n\nb",
+        "a\nna\nn",
+        "ssh\nssh",
+        "İstanbul",
+        "Straße",
+        "ÆÐÞ",
+        "1234",
+        "  ",
+    ],
+)
+def test_scan_matches_reference(name: str) -> None:
+    """Test that the single-pass scorer matches the reference exactly."""
+    scorer = PronounceabilityScorer()
+    assert scorer.score_pronounceability(name) == _reference_score(scorer, name)
+
+
+def test_scan_matches_reference_on_random_strings() -> None:
+    """Test the single-pass scorer on random strings from a small alphabet."""
+    scorer = PronounceabilityScorer()
+    rng = random.Random(1)
+    alphabet = "aeiouybcdfghklmnrstwxyzAEBRT '-\n"
+    for _ in range(3000):
+        name = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        assert scorer.score_pronounceability(name) == _reference_score(scorer, name)
+
+
+def test_scan_matches_reference_on_generated_names() -> None:
+    """Test the single-pass scorer on generated names."""
+    scorer = PronounceabilityScorer()
+    for pattern in ("!s!v!c", "!sV<c|v>s", "!BVCs<v|(ar)>"):
+        for name in generate_batch(pattern, 300, seed=3):
+            assert scorer.score_pronounceability(name) == _reference_score(scorer, name)
+
+
+def test_scan_uses_customized_rules() -> None:
+    """Test that rule sets overridden on a subclass are honoured."""
+
+    class StrictScorer(PronounceabilityScorer):
+        ALLOWED_DIGRAPHS: set[str] = set()
+        COMMON_CLUSTERS: set[str] = set()
+        VOWELS = set("aeiou")
+
+    scorer = StrictScorer()
+    for name in ("Thalia", "Ashley", "Eldrin", "Brynn"):
+        assert scorer.score_pronounceability(name) == _reference_score(scorer, name)
+    assert scorer.score_pronounceability(
+        "Thalia"
+    ) < PronounceabilityScorer().score_pronounceability("Thalia")
+
+
+def test_score_batch_python_engine() -> None:
+    """Test that batch scoring matches scoring names one by one."""
+    names = ["Eldrin", "", "a", "Brrrgh", "Straße"]
+    assert score_pronounceability_batch(names) == [
+        score_pronounceability(name) for name in names
+    ]
+    assert score_pronounceability_batch([]) == []
+
+
+def test_score_batch_unknown_engine() -> None:
+    """Test that an unknown engine is rejected."""
+    with pytest.raises(ValueError, match="Unknown engine 'gpu'"):
+        score_pronounceability_batch(["Eldrin"], engine="gpu")
+
+
+def test_score_batch_numpy_engine_matches_scalar_scores() -> None:
+    """Test that the NumPy backend gives exactly the scalar scores."""
+    pytest.importorskip("numpy")
+    rng = random.Random(2)
+    alphabet = "aeiouybcdfghklmnrstwxyzAEBRT '-\nß"
+    names = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        for _ in range(3000)
+    ]
+    names += generate_batch("!sV<c|v>s", 500, seed=5)
+    names += ["strength", "tsktsk", "abababab", "aabbaabb", "Xyzzyx", "tchdge"]
+    assert score_pronounceability_batch(names, engine="numpy") == [
+        score_pronounceability(name) for name in names
+    ]
+
+
+def test_score_batch_numpy_engine_uses_customized_rules() -> None:
+    """Test that the NumPy backend honours rule sets overridden on a subclass."""
+    pytest.importorskip("numpy")
+
+    class StrictScorer(PronounceabilityScorer):
+        ALLOWED_DIGRAPHS: set[str] = set()
+        VOWELS = set("aeiou")
+
+    scorer = StrictScorer()
+    names = ["Thalia", "Ashley", "Eldrin", "Brynn", "Matchday"]
+    assert scorer.score_batch(names, engine="numpy") == [
+        scorer.score_pronounceability(name) for name in names
+    ]
+
+
+@pytest.fixture
+def score_cache():
+    """Enable the module-level score cache for the duration of a test."""
+    enable_score_cache(maxsize=2)
+    yield
+    disable_score_cache()
+
+
+def test_score_cache_is_opt_in() -> None:
+    """Test that scores are not memoized unless the cache is enabled."""
+    score_pronounceability("Eldrin")
+    assert score_cache_info() == (0, 0, 0, 0, 0)
+
+
+@pytest.mark.usefixtures("score_cache")
+def test_score_cache_statistics() -> None:
+    """Test that cached scores are reused and counted."""
+    expected = score_pronounceability("Eldrin")
+    assert score_pronounceability("Eldrin") == expected
+    assert is_pronounceable("Eldrin") == (expected >= 0.6)
+    info = score_cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (2, 1, 2, 1)
+    assert info.hit_rate == pytest.approx(2 / 3)
+    score_pronounceability("Thalia")
+    score_pronounceability("Borogar")
+    assert score_cache_info().evictions == 1
+    score_cache_clear()
+    assert score_cache_info() == (0, 0, 0, 2, 0)
+
+
+@pytest.mark.usefixtures("score_cache")
+def test_score_cache_resize_and_disable() -> None:
+    """Test that enabling again resizes the cache, and disabling drops it."""
+    score_pronounceability("Eldrin")
+    enable_score_cache(maxsize=10)
+    assert score_cache_info().maxsize == 10
+    assert score_cache_info().currsize == 1
+    disable_score_cache()
+    assert score_cache_info().maxsize == 0
+
+
+def test_score_cache_batch() -> None:
+    """Test that batch scoring fills and reuses the cache."""
+    scorer = CachingScorer(maxsize=10)
+    names = ["Eldrin", "Thalia", "Eldrin"]
+    scores = scorer.score_batch(names)
+    assert scores == [scorer.score_pronounceability(name) for name in names]
+    assert scorer.cache_info().currsize == 2
+
+
+def test_score_cache_invalidated_by_rule_changes() -> None:
+    """Test that customizing the rule sets empties the cache."""
+    scorer = CachingScorer()
+    before = scorer.score_pronounceability("Ashon")
+    scorer.ALLOWED_DIGRAPHS = scorer.ALLOWED_DIGRAPHS - {"sh"}
+    after = scorer.score_pronounceability("Ashon")
+    assert after < before
+    scorer.COMMON_CLUSTERS = set(scorer.COMMON_CLUSTERS)
+    scorer.COMMON_CLUSTERS.add("sh")
+    assert scorer.score_pronounceability("Ashon") == before
+    assert scorer.cache_info().hits == 0
+
+
+def test_score_cache_invalidated_by_same_size_edits() -> None:
+    """Test that rule sets edited in place without changing size are noticed."""
+    scorer = CachingScorer()
+    scorer.ALLOWED_DIGRAPHS = set(scorer.ALLOWED_DIGRAPHS)
+    before = scorer.score_pronounceability("Kzarth")
+    scorer.ALLOWED_DIGRAPHS.discard("wh")
+    scorer.ALLOWED_DIGRAPHS.add("kz")
+    after = scorer.score_pronounceability("Kzarth")
+    assert after > before
+    assert after == PronounceabilityScorer.score_pronounceability(scorer, "Kzarth")
@@ -0,0 +1,280 @@
+"""Tests for the language registry."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from onymancer import (
+    generate,
+    generate_batch,
+    language_info,
+    load_language_from_json,
+    namegen,
+    preload,
+    set_language_budget,
+)
+from onymancer.registry import LanguageRegistry, read_token_set, write_token_set
+
+
+def _write_languages(directory: Path, count: int) -> None:
+    """Write `count` small language files named lang0, lang1, ..."""
+    for index in range(count):
+        path = directory / f"lang{index}.json"
+        path.write_text(json.dumps({"s": [f"t{index}"]}), encoding="utf-8")
+
+
+def test_languages_are_parsed_on_first_use(tmp_path: Path) -> None:
+    """Test that nothing is read until a language is looked up."""
+    _write_languages(tmp_path, 50)
+    registry = LanguageRegistry(tmp_path)
+    assert registry.loaded() == []
+    assert "lang7" in registry
+    assert registry.loaded() == []
+    assert registry["lang7"] == {"s": ["t7"]}
+    assert registry.loaded() == ["lang7"]
+    assert len(registry.available()) == 50
+
+
+def test_unknown_languages(tmp_path: Path) -> None:
+    """Test lookups of languages without a file."""
+    (tmp_path / "sub").mkdir()
+    _write_languages(tmp_path / "sub", 1)
+    registry = LanguageRegistry(tmp_path)
+    assert registry.get("missing", {}) == {}
+    assert "missing" not in registry
+    # Names are not paths.
+    assert registry.get("sub/lang0") is None
+    with pytest.raises(KeyError):
+        registry["missing"]
+
+
+def test_registered_languages(tmp_path: Path) -> None:
+    """Test token sets registered directly."""
+    registry = LanguageRegistry(tmp_path)
+    registry["custom"] = {"s": ["a"]}
+    assert registry.loaded() == ["custom"]
+    assert registry.available() == ["custom"]
+    del registry["custom"]
+    assert "custom" not in registry
+
+
+def test_preload(tmp_path: Path) -> None:
+    """Test parsing languages ahead of their first use."""
+    _write_languages(tmp_path, 5)
+    registry = LanguageRegistry(tmp_path)
+    registry.preload(["lang1", "lang3"])
+    assert registry.loaded() == ["lang1", "lang3"]
+    registry.preload()
+    assert len(registry.loaded()) == 5
+    with pytest.raises(KeyError):
+        registry.preload(["missing"])
+
+
+def test_concurrent_lookups_parse_once(tmp_path: Path) -> None:
+    """Test that threads looking up a language share one parse."""
+    _write_languages(tmp_path, 1)
+    registry = LanguageRegistry(tmp_path)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry["lang0"]))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result is results[0] for result in results)
+
+
+def test_import_only_parses_default() -> None:
+    """Test that importing the package parses no language but the default."""
+    code = (
+        "from onymancer import namegen;"
+        "print(','.join(namegen._language_tokens.loaded()))"
+    )
+    src = Path(__file__).resolve().parents[1] / "src"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(src)},
+    )
+    assert result.stdout.strip() == "default"
+
+
+def test_bundled_languages_load_lazily() -> None:
+    """Test generation with a bundled language and the preload helper."""
+    preload(["elvish"])
+    assert generate("s", seed=1, language="dwarvish")
+    with pytest.raises(KeyError):
+        preload(["no_such_language"])
+
+
+def test_budget_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test that the oldest token sets are dropped past the budget."""
+    _write_languages(tmp_path, 3)
+    evicted = []
+    registry = LanguageRegistry(tmp_path, on_evict=evicted.append)
+    registry.preload(["lang0", "lang1"])
+    size = registry.sizes()["lang0"]
+    assert registry.info().currbytes == 2 * size
+    registry["lang0"]
+    registry.resize(2 * size)
+    registry["lang2"]
+    assert registry.loaded() == ["lang0", "lang2"]
+    assert evicted == ["lang1"]
+    info = registry.info()
+    assert info.evictions == 1
+    assert info.currbytes <= info.maxbytes == 2 * size
+    # Evicted languages are parsed again transparently.
+    assert registry["lang1"] == {"s": ["t1"]}
+    assert registry.loaded() == ["lang1", "lang2"]
+
+
+def test_touch_and_pin(tmp_path: Path) -> None:
+    """Test that touched token sets are kept and pinned ones never evicted."""
+    _write_languages(tmp_path, 4)
+    registry = LanguageRegistry(tmp_path)
+    registry.preload(["lang0", "lang1", "lang2"])
+    size = registry.sizes()["lang0"]
+    registry.pin("lang0")
+    registry.touch("lang1")
+    registry.touch("lang3")
+    assert "lang3" not in registry.loaded()
+    registry.resize(2 * size)
+    assert registry.loaded() == ["lang0", "lang1"]
+    registry["lang3"]
+    assert registry.loaded() == ["lang0", "lang3"]
+    with pytest.raises(KeyError):
+        registry.pin("missing")
+
+
+def test_budget_keeps_languages_without_file(tmp_path: Path) -> None:
+    """Test that token sets that cannot be parsed again are kept."""
+    _write_languages(tmp_path, 1)
+    registry = LanguageRegistry(tmp_path, max_bytes=0)
+    registry["custom"] = {"s": ["a"]}
+    registry["lang0"]
+    registry["lang0"] = {"s": ["override"]}
+    registry.resize(0)
+    assert registry.loaded() == ["custom", "lang0"]
+    assert registry["lang0"] == {"s": ["override"]}
+    with pytest.raises(ValueError, match="max_bytes must be non-negative"):
+        registry.resize(-1)
+
+
+def test_registered_sources_reload(tmp_path: Path) -> None:
+    """Test that token sets are parsed again from the file given."""
+    source = tmp_path / "culture.onym"
+    write_token_set({"s": [["ka", 2], "ri"]}, str(source))
+    registry = LanguageRegistry(max_bytes=0)
+    registry.register("culture_42", read_token_set(str(source)), source)
+    registry.register("other", {"s": ["a"]}, tmp_path / "missing.json")
+    assert registry.loaded() == ["other"]
+    assert registry["culture_42"] == {"s": [["ka", 2.0], ["ri", 1.0]]}
+    assert registry.available() == ["culture_42", "other"]
+
+
+def test_binary_files_are_discovered(tmp_path: Path) -> None:
+    """Test that model files of the data directory are preferred."""
+    _write_languages(tmp_path, 1)
+    write_token_set({"s": ["binary"]}, str(tmp_path / "lang0.onym"))
+    registry = LanguageRegistry(tmp_path)
+    assert registry.available() == ["lang0"]
+    assert registry["lang0"] == {"s": ["binary"]}
+
+
+def test_language_budget_reloads_loaded_files(tmp_path: Path) -> None:
+    """Test the budget of the token sets loaded from files."""
+    path = tmp_path / "budget.json"
+    path.write_text(json.dumps({"s": ["ka"], "v": ["ri"]}), encoding="utf-8")
+    assert load_language_from_json("budget_lang", str(path))
+    before = generate_batch("sv", 5, seed=1, language="budget_lang")
+    try:
+        set_language_budget(0)
+        assert "budget_lang" not in namegen._language_tokens.loaded()
+        assert "budget_lang" not in namegen._language_junctions
+        assert language_info().maxbytes == 0
+        namegen.cache_clear()
+        assert generate_batch("sv", 5, seed=1, language="budget_lang") == before
+    finally:
+        set_language_budget(None)
+
+
+def test_language_budget_covers_derived_data(tmp_path: Path) -> None:
+    """Test that junction tables and compiled patterns count in the budget."""
+    tokens = namegen._resolve_tokens("elvish")
+    try:
+        set_language_budget(200_000)
+        for index in range(10):
+            path = tmp_path / f"culture{index}.json"
+            path.write_text(json.dumps(tokens), encoding="utf-8")
+            assert load_language_from_json(f"culture{index}", str(path))
+            generate_batch(
+                "!svs", 5, seed=1, language=f"culture{index}", min_pronounceability=0.6
+            )
+        cultures = [
+            language
+            for language in namegen._language_junctions
+            if language.startswith("culture")
+        ]
+        assert cultures == ["culture9"]
+        assert [
+            key for key in namegen._pattern_cache._data if key[1].startswith("culture")
+        ] == [("!svs", "culture9", namegen._token_versions["culture9"])]
+    finally:
+        set_language_budget(None)
+
+
+def test_loading_a_language_keeps_other_patterns(tmp_path: Path) -> None:
+    """Test that loading a language only invalidates its own patterns."""
+    path = tmp_path / "isolated.json"
+    path.write_text(json.dumps({"s": ["ka"]}), encoding="utf-8")
+    generate("!sv", seed=1)
+    hits = namegen.cache_info().hits
+    assert load_language_from_json("isolated", str(path))
+    generate("!sv", seed=1)
+    assert namegen.cache_info().hits == hits + 1
+
+
+def test_language_budget_follows_generation(tmp_path: Path) -> None:
+    """Test that languages generated from are kept over idle ones."""
+    for index in range(3):
+        path = tmp_path / f"recency{index}.json"
+        path.write_text(json.dumps({"s": ["ka"], "v": ["ri"]}), encoding="utf-8")
+        assert load_language_from_json(f"recency{index}", str(path))
+    generate("!svs", seed=1, language="recency0")
+    generate("!svs", seed=1, language="recency1")
+    sizes = namegen._language_tokens.sizes()
+    try:
+        set_language_budget(
+            sizes["default"] + sizes["recency0"] + sizes["recency1"] + 100
+        )
+        for seed in range(100):
+            generate("!svs", seed=seed, language="recency0")
+        generate("!svs", seed=1, language="recency2")
+        loaded = namegen._language_tokens.loaded()
+        assert "recency0" in loaded
+        assert "recency1" not in loaded
+        assert "recency2" in loaded
+    finally:
+        set_language_budget(None)
+
+
+def test_language_budget_keeps_default() -> None:
+    """Test that the default token set and its patterns survive the budget."""
+    generate("!svs", seed=1)
+    try:
+        set_language_budget(0)
+        assert "default" in namegen._language_tokens.loaded()
+        hits = namegen.cache_info().hits
+        generate("!svs", seed=1)
+        assert namegen.cache_info().hits == hits + 1
+    finally:
+        set_language_budget(None)
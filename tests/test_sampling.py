@@ -0,0 +1,110 @@
+"""Tests for constrained sampling."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from onymancer import CompiledPattern, compile, generate_batch
+from onymancer.sampling import ConstrainedSampler
+
+
+def test_sampler_respects_length_bounds() -> None:
+    """Test that every sampled name satisfies the length bounds."""
+    sampler = ConstrainedSampler(compile("!s<v|c>s"), min_length=7, max_length=8)
+    rng = random.Random(1)
+    for _ in range(500):
+        assert 7 <= len(sampler.sample(rng)) <= 8
+
+
+def test_sampler_matches_rejection_distribution() -> None:
+    """Test that sampling is exact with respect to rejection sampling."""
+    compiled = CompiledPattern("q<q|(x)>", {"q": ["a", "bb", "ccc", "dddd"]})
+    sampler = ConstrainedSampler(compiled, min_length=4, max_length=5)
+    rng = random.Random(2)
+    accepted = Counter()
+    while sum(accepted.values()) < 20000:
+        name = compiled.generate(rng)
+        if 4 <= len(name) <= 5:
+            accepted[name] += 1
+    sampled = Counter(sampler.sample(rng) for _ in range(20000))
+    assert set(sampled) == set(accepted)
+    for name, count in accepted.items():
+        assert abs(sampled[name] - count) < 0.2 * count + 60
+
+
+def test_sampler_probability() -> None:
+    """Test the acceptance probability of length bounds."""
+    compiled = CompiledPattern("qq", {"q": ["a", "bb", "ccc"]})
+    assert ConstrainedSampler(compiled, 4, 4).probability == pytest.approx(3 / 9)
+    assert ConstrainedSampler(compiled, min_length=7).probability == 0.0
+    with pytest.raises(ValueError, match="No name of pattern 'qq'"):
+        ConstrainedSampler(compiled, min_length=7).sample()
+
+
+def test_generate_batch_tight_length_bounds() -> None:
+    """Test that tight but feasible bounds return the full count."""
+    names = generate_batch("!s!v!c", count=50, seed=3, min_length=6, max_length=6)
+    assert len(names) == 50
+    assert all(len(name) == 6 for name in names)
+
+
+def test_sampler_character_constraints() -> None:
+    """Test prefix, suffix and substring constraints spanning tokens."""
+    compiled = CompiledPattern("!qq", {"q": ["ab", "ba", "b", "aab"]})
+    sampler = ConstrainedSampler(
+        compiled, starts_with="Aa", ends_with="bab", contains="aba"
+    )
+    rng = random.Random(4)
+    for _ in range(200):
+        name = sampler.sample(rng)
+        assert name.startswith("Aa")
+        assert name.endswith("bab")
+        assert "aba" in name
+
+
+def test_sampler_suffix_overlapping_matches() -> None:
+    """Test the suffix automaton on self-overlapping strings."""
+    compiled = CompiledPattern("qqq", {"q": ["a", "aa", "b"]})
+    rng = random.Random(5)
+    accepted = set()
+    for _ in range(2000):
+        name = compiled.generate(rng)
+        if name.endswith("aab"):
+            accepted.add(name)
+    sampler = ConstrainedSampler(compiled, ends_with="aab")
+    sampled = {sampler.sample(rng) for _ in range(2000)}
+    assert sampled == accepted
+
+
+def test_generate_batch_rare_prefix() -> None:
+    """Test that a rare prefix still yields the full count."""
+    names = generate_batch(
+        "!svs", count=30, seed=6, language="elvish", starts_with="Th", ends_with="yr"
+    )
+    assert len(names) == 30
+    for name in names:
+        assert name.startswith("Th")
+        assert name.endswith("yr")
+
+
+def test_sampler_weighted_tokens() -> None:
+    """Test that constrained sampling follows token weights."""
+    compiled = CompiledPattern("q", {"q": [["a", 1], ["bb", 6], ["cc", 2], "ddd"]})
+    sampler = ConstrainedSampler(compiled, max_length=2)
+    assert sampler.probability == pytest.approx(9 / 10)
+    rng = random.Random(3)
+    counts = Counter(sampler.sample(rng) for _ in range(20000))
+    assert set(counts) == {"a", "bb", "cc"}
+    assert counts["bb"] / 20000 == pytest.approx(6 / 9, abs=0.02)
+
+
+def test_sampler_long_patterns() -> None:
+    """Test that constraints on long patterns do not exhaust the call stack."""
+    names = generate_batch("s" * 600, 1, seed=1, min_length=3)
+    assert len(names) == 1
+    names = generate_batch("<s|v>" * 200, 1, seed=1, contains="a")
+    assert len(names) == 1
+    assert "a" in names[0]
+    sampler = ConstrainedSampler(compile("v" * 2000), max_length=2000)
+    assert sampler.space_size == 6**2000
@@ -0,0 +1,248 @@
+"""Tests for the HTTP name generation service."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+
+from onymancer import generate, generate_batch, namegen
+from onymancer.server import NameService, start_server
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Thread pool counting the jobs submitted to it."""
+
+    def __init__(self) -> None:
+        """Start a pool of two threads."""
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        """Count the job, then submit it."""
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+async def _request(
+    port: int, method: str, path: str, payload: dict | None = None
+) -> tuple[int, dict]:
+    """Send a request to the local server and decode its response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+def _serve(scenario):
+    """Run a scenario against a server listening on a free local port."""
+
+    async def run():
+        service = NameService(offload_threshold=10)
+        server = await start_server("127.0.0.1", 0, service)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            async with server:
+                return await scenario(port)
+        finally:
+            service.close()
+
+    return asyncio.run(run())
+
+
+def test_generate_endpoint() -> None:
+    """Test a seeded name over HTTP."""
+
+    async def scenario(port):
+        return await _request(port, "POST", "/generate", {"pattern": "!sv", "seed": 4})
+
+    status, payload = _serve(scenario)
+    assert status == 200
+    assert payload == {"name": generate("!sv", seed=4)}
+
+
+def test_generate_batch_endpoint() -> None:
+    """Test seeded batches, offloaded or not, with constraints."""
+
+    async def scenario(port):
+        small = await _request(
+            port,
+            "POST",
+            "/generate_batch",
+            {"pattern": "!sv", "count": 5, "seed": 1, "language": "elvish"},
+        )
+        large = await _request(
+            port,
+            "POST",
+            "/generate_batch",
+            {"pattern": "!sv", "count": 50, "seed": 2, "min_length": 4},
+        )
+        unseeded = await _request(
+            port, "POST", "/generate_batch", {"pattern": "sv", "count": 3}
+        )
+        capped = await _request(
+            port,
+            "POST",
+            "/generate_batch",
+            {"pattern": "!sv", "count": 20, "seed": 3, "max_attempts": 7},
+        )
+        return small, large, unseeded, capped
+
+    small, large, unseeded, capped = _serve(scenario)
+    assert small == (
+        200,
+        {"names": generate_batch("!sv", 5, seed=1, language="elvish")},
+    )
+    assert large == (200, {"names": generate_batch("!sv", 50, seed=2, min_length=4)})
+    assert unseeded[0] == 200
+    assert len(unseeded[1]["names"]) == 3
+    assert capped == (200, {"names": generate_batch("!sv", 7, seed=3)})
+
+
+def test_errors() -> None:
+    """Test the responses to invalid requests."""
+
+    async def scenario(port):
+        return [
+            await _request(port, "GET", "/health"),
+            await _request(port, "GET", "/missing"),
+            await _request(port, "GET", "/generate"),
+            await _request(port, "POST", "/generate", {"seed": 1}),
+            await _request(port, "POST", "/generate", {"pattern": "s", "x": 1}),
+            await _request(port, "POST", "/generate_batch", {"pattern": "s"}),
+            await _request(
+                port,
+                "POST",
+                "/generate_batch",
+                {"pattern": "s", "count": 1, "seed": "one"},
+            ),
+            await _request(
+                port,
+                "POST",
+                "/generate_batch",
+                {"pattern": "s", "count": 10**9},
+            ),
+            await _request(
+                port,
+                "POST",
+                "/generate_batch",
+                {"pattern": "s", "count": 1, "timeout": -1},
+            ),
+            await _request(
+                port,
+                "POST",
+                "/generate_batch",
+                {"pattern": "s", "count": 1, "min_length": "4"},
+            ),
+            await _request(
+                port,
+                "POST",
+                "/generate_batch",
+                {"pattern": "s", "count": 1, "unique": 1},
+            ),
+            await _request(
+                port,
+                "POST",
+                "/generate_batch",
+                {"pattern": "<a|b>", "count": 3, "unique": True},
+            ),
+        ]
+
+    statuses = [status for status, _ in _serve(scenario)]
+    assert statuses == [200, 404, 405, 400, 400, 400, 400, 400, 400, 400, 400, 400]
+
+
+def test_identical_seeded_requests_are_coalesced() -> None:
+    """Test that concurrent identical requests share one computation."""
+    executor = CountingExecutor()
+    service = NameService(executor=executor, offload_threshold=1)
+    body = json.dumps({"pattern": "!sv", "count": 100, "seed": 9}).encode()
+    other = json.dumps({"pattern": "!sv", "count": 100, "seed": 10}).encode()
+
+    async def scenario():
+        return await asyncio.gather(
+            *[service.handle("POST", "/generate_batch", body) for _ in range(5)],
+            service.handle("POST", "/generate_batch", other),
+        )
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert executor.submitted == 2
+    assert service.coalesced == 4
+    assert all(result == results[0] for result in results[:5])
+    assert results[0] == (
+        HTTPStatus.OK,
+        {"names": generate_batch("!sv", 100, seed=9)},
+    )
+    assert results[5][1] != results[0][1]
+
+
+def test_unseeded_requests_are_not_coalesced() -> None:
+    """Test that requests without a seed get their own names."""
+    service = NameService()
+    body = json.dumps({"pattern": "!svsv", "count": 20}).encode()
+
+    async def scenario():
+        return await asyncio.gather(
+            *[service.handle("POST", "/generate_batch", body) for _ in range(2)]
+        )
+
+    first, second = asyncio.run(scenario())
+    assert service.coalesced == 0
+    assert first != second
+
+
+def test_constrained_batches_are_offloaded() -> None:
+    """Test that small constrained batches leave the event loop."""
+    executor = CountingExecutor()
+    service = NameService(executor=executor, offload_threshold=1000)
+    plain = json.dumps({"pattern": "!sv", "count": 5}).encode()
+    constrained = json.dumps(
+        {"pattern": "!sv", "count": 5, "min_pronounceability": 0.5}
+    ).encode()
+
+    async def scenario():
+        await service.handle("POST", "/generate_batch", plain)
+        return await service.handle("POST", "/generate_batch", constrained)
+
+    try:
+        status, payload = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert status == HTTPStatus.OK
+    assert len(payload["names"]) == 5
+    assert executor.submitted == 1
+
+
+@pytest.mark.parametrize("error", [RecursionError, TypeError, ValueError])
+def test_unexpected_errors_are_server_errors(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    error: type[Exception],
+) -> None:
+    """Test that a failure of a valid request is logged and answered with 500."""
+
+    def fail(*_args: object, **_kwargs: object) -> str:
+        raise error("library bug")
+
+    monkeypatch.setattr(namegen, "generate", fail)
+    service = NameService()
+    body = json.dumps({"pattern": "s", "seed": 1}).encode()
+    status, payload = asyncio.run(service.handle("POST", "/generate", body))
+    assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert payload == {"error": "Internal Server Error"}
+    assert "library bug" not in payload["error"]
+    (record,) = caplog.records
+    assert record.name == "onymancer.server"
+    assert record.exc_info is not None
+    assert record.exc_info[0] is error
@@ -0,0 +1,153 @@
+"""Tests for generation statistics."""
+
+import pytest
+
+from onymancer import GenerationStats, generate_batch, iter_names
+from onymancer.stats import REJECTION_REASONS
+
+
+def _check_totals(stats: GenerationStats) -> None:
+    """Check that every attempt is either accepted or rejected once."""
+    assert stats.attempts == stats.accepted + sum(stats.rejections.values())
+    assert sum(stats.lengths.values()) == stats.accepted
+    assert set(stats.rejections) <= set(REJECTION_REASONS)
+
+
+def test_stats_do_not_change_the_names() -> None:
+    """Test that collecting statistics draws the same names."""
+    for options in (
+        {},
+        {"min_length": 6},
+        {"starts_with": "B"},
+        {"min_pronounceability": 0.7},
+        {"min_pronounceability": 0.7, "prune_junctions": True},
+    ):
+        stats = GenerationStats()
+        assert generate_batch(
+            "!svs", 50, seed=3, stats=stats, **options
+        ) == generate_batch("!svs", 50, seed=3, **options)
+        assert stats.accepted == 50
+
+
+def test_stats_count_rejections() -> None:
+    """Test the pronounceability and duplicate rejection counters."""
+    stats = GenerationStats()
+    names = generate_batch(
+        "!sv", 300, seed=1, min_pronounceability=0.9, unique=True, stats=stats
+    )
+    _check_totals(stats)
+    assert stats.accepted == len(names)
+    assert stats.rejections["pronounceability"] > 0
+    assert stats.rejections["duplicate"] > 0
+    assert stats.rejections["length"] == 0
+    assert 0.0 < stats.acceptance_rate < 1.0
+    assert stats.generation_seconds > 0.0
+    assert stats.scoring_seconds > 0.0
+
+
+def test_stats_count_token_draws() -> None:
+    """Test the token draw counters on every Python drawing path."""
+    for options in ({}, {"starts_with": "a"}, {"min_pronounceability": 0.5}):
+        stats = GenerationStats()
+        generate_batch("sv", 100, seed=2, stats=stats, **options)
+        assert sum(stats.token_draws["s"].values()) == stats.attempts
+        assert sum(stats.token_draws["v"].values()) == stats.attempts
+
+
+def test_stats_count_tokens_as_written() -> None:
+    """Test that capitalized tokens are counted under their original spelling."""
+    for options in (
+        {},
+        {"starts_with": "B"},
+        {"min_pronounceability": 0.5, "prune_junctions": True},
+    ):
+        stats = GenerationStats()
+        generate_batch("!ss", 100, seed=4, stats=stats, **options)
+        assert sum(stats.token_draws["s"].values()) == 2 * stats.attempts
+        assert all(token == token.lower() for token in stats.token_draws["s"])
+
+
+def test_stats_accumulate_across_calls() -> None:
+    """Test passing the same statistics to several calls."""
+    stats = GenerationStats()
+    generate_batch("sv", 10, seed=1, stats=stats)
+    list(iter_names("sv", seed=1, limit=5, stats=stats))
+    assert stats.accepted == 15
+    _check_totals(stats)
+
+
+def test_numpy_stats_count_constraint_rejections() -> None:
+    """Test the per-constraint counters of the NumPy engine."""
+    pytest.importorskip("numpy")
+    stats = GenerationStats()
+    names = generate_batch(
+        "!svs",
+        100,
+        seed=4,
+        engine="numpy",
+        min_length=6,
+        contains="a",
+        min_pronounceability=0.6,
+        stats=stats,
+    )
+    assert stats.accepted == len(names)
+    assert stats.rejections["length"] > 0
+    assert stats.rejections["contains"] > 0
+    assert sum(stats.lengths.values()) == len(names)
+    assert stats.attempts >= stats.accepted + sum(stats.rejections.values())
+
+
+def test_prometheus_export() -> None:
+    """Test the text exposition format."""
+    stats = GenerationStats()
+    stats.attempts = 4
+    stats.accepted = 3
+    stats.rejections["pronounceability"] = 1
+    stats.token_draws["s"]['a"b'] += 2
+    stats.lengths.update([3, 3, 5])
+    text = stats.to_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE onymancer_attempts_total counter" in lines
+    assert "onymancer_attempts_total 4" in lines
+    assert 'onymancer_rejections_total{constraint="pronounceability"} 1' in lines
+    assert 'onymancer_rejections_total{constraint="length"} 0' in lines
+    assert 'onymancer_token_draws_total{key="s",token="a\\"b"} 2' in lines
+    assert 'onymancer_name_length_bucket{le="2"} 0' in lines
+    assert 'onymancer_name_length_bucket{le="3"} 2' in lines
+    assert 'onymancer_name_length_bucket{le="4"} 2' in lines
+    assert 'onymancer_name_length_bucket{le="32"} 3' in lines
+    assert 'onymancer_name_length_bucket{le="+Inf"} 3' in lines
+    assert "onymancer_name_length_sum 11" in lines
+    assert "onymancer_name_length_count 3" in lines
+    assert text.endswith("\n")
+
+
+def test_prometheus_buckets_are_fixed() -> None:
+    """Test that the histogram buckets do not depend on the lengths seen."""
+    first = GenerationStats()
+    first.lengths.update([4, 9])
+    second = GenerationStats()
+    second.lengths.update([5, 40])
+
+    def bounds(stats: GenerationStats) -> list[str]:
+        return [
+            line.split()[0]
+            for line in stats.to_prometheus().splitlines()
+            if line.startswith("onymancer_name_length_bucket")
+        ]
+
+    assert bounds(first) == bounds(second)
+
+
+def test_stats_merge() -> None:
+    """Test adding the counters of one statistics object to another."""
+    total = GenerationStats()
+    generate_batch("sv", 10, seed=1, min_pronounceability=0.5, stats=total)
+    part = GenerationStats()
+    generate_batch("sv", 5, seed=2, min_pronounceability=0.5, stats=part)
+    attempts = total.attempts + part.attempts
+    total.merge(part)
+    assert total.accepted == 15
+    assert total.attempts == attempts
+    assert sum(total.token_draws["s"].values()) == attempts
+    _check_totals(total)
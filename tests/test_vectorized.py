@@ -0,0 +1,86 @@
+"""Tests for the NumPy batch generation engine."""
+
+import pytest
+
+from onymancer import (
+    CompiledPattern,
+    generate_batch,
+    score_pronounceability,
+    vectorized,
+)
+
+
+def test_numpy_engine_falls_back_without_numpy(monkeypatch) -> None:
+    """Test that the NumPy engine falls back to Python when unavailable."""
+    monkeypatch.setattr(vectorized, "np", None)
+    names = generate_batch("!svs", count=5, seed=42, engine="numpy")
+    assert names == generate_batch("!svs", count=5, seed=42)
+
+
+def test_unknown_engine() -> None:
+    """Test that unknown engines are rejected."""
+    with pytest.raises(ValueError, match="Unknown engine 'gpu'"):
+        generate_batch("s", count=1, engine="gpu")
+
+
+def test_numpy_engine_generates_names() -> None:
+    """Test basic generation with the NumPy engine."""
+    pytest.importorskip("numpy")
+    names = generate_batch(
+        "!s<v|c><(ford)|(ham)|(ton)>", count=200, seed=1, engine="numpy"
+    )
+    assert len(names) == 200
+    assert all(name[0].isupper() for name in names)
+    assert all(name.endswith(("ford", "ham", "ton")) for name in names)
+
+
+def test_numpy_engine_reproducibility() -> None:
+    """Test that the NumPy engine is reproducible with a seed."""
+    pytest.importorskip("numpy")
+    first = generate_batch("!svs", count=50, seed=3, engine="numpy")
+    assert first == generate_batch("!svs", count=50, seed=3, engine="numpy")
+
+
+def test_numpy_engine_constraints() -> None:
+    """Test constraint filtering in the NumPy engine."""
+    pytest.importorskip("numpy")
+    names = generate_batch(
+        "!svs",
+        count=20,
+        seed=5,
+        language="elvish",
+        min_length=5,
+        max_length=8,
+        contains="a",
+        min_pronounceability=0.6,
+        engine="numpy",
+    )
+    assert len(names) == 20
+    for name in names:
+        assert 5 <= len(name) <= 8
+        assert "a" in name
+        assert score_pronounceability(name) >= 0.6
+
+
+def test_numpy_engine_impossible_constraints() -> None:
+    """Test that the NumPy engine respects the attempt budget."""
+    pytest.importorskip("numpy")
+    assert generate_batch("s", count=5, seed=1, starts_with="XQ", engine="numpy") == []
+
+
+def test_numpy_engine_unique() -> None:
+    """Test unique batches with the NumPy engine."""
+    pytest.importorskip("numpy")
+    names = generate_batch("!svs", count=300, seed=4, unique=True, engine="numpy")
+    assert len(names) == 300
+    assert len(set(names)) == 300
+
+
+def test_numpy_engine_weighted_tokens() -> None:
+    """Test that the NumPy engine follows token weights."""
+    pytest.importorskip("numpy")
+    compiled = CompiledPattern("q", {"q": [["a", 3], "b", ["c", 0.5]]})
+    names = vectorized.generate_batch(compiled, 20000, seed=4)
+    assert set(names) == {"a", "b", "c"}
+    assert names.count("a") / 20000 == pytest.approx(3 / 4.5, abs=0.02)
+    assert names.count("c") / 20000 == pytest.approx(0.5 / 4.5, abs=0.01)